@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark listing extraction on a saved Marketplace search page.
+
+Compares the embedded-JSON payload parser with the BeautifulSoup anchor scrape
+(full html.parser DOM + scan of every <a>). Reports wall time per page and peak
+Python memory allocated while parsing.
+
+A saved page holds the server-rendered document only; the listing anchors are added
+by Marketplace's JavaScript. The anchor cards are therefore rendered into the page
+from its own payload first, so both paths parse the same document, and the script
+exits non-zero if they do not return the same cards.
+
+Usage:
+  python scripts/bench_parsing.py [HTML_FILE] [--runs N]
+
+HTML_FILE defaults to fb_response.html in the repository root.
+"""
+
+import argparse
+import html as html_lib
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bs4 import BeautifulSoup
+
+from dealsnoop.marketplace_parsing import extract_cards_from_anchors, extract_cards_from_payload
+from dealsnoop.product import ListingCard
+
+_SJS_SCRIPT = re.compile(r"<script[^>]*\bdata-sjs\b[^>]*>(.*?)</script>", re.DOTALL)
+
+# One result card as Marketplace renders it: image, then price, title and location lines.
+_CARD_MARKUP = (
+    '<div class="x9f619 x78zum5 x1r8uery xdt5ytf x1iyjqo2 xs83m0k x1e558r4 x150jy0e">'
+    '<div class="x1n2onr6"><a class="x1i10hfl xjbqb8w x1ejq31n xd10rxx x1sy0etr x17r0tee" '
+    'href="/marketplace/item/{id}/" role="link" tabindex="0">'
+    '<div class="x1n2onr6 xh8yej3"><div class="x1n2onr6"><img alt="{alt}" class="xt7dq6l xl1xv1r" '
+    'src="{src}"></div></div>'
+    '<div class="x9f619 x78zum5 xdt5ytf x1iyjqo2"><div class="x1gslohp">'
+    '<span class="x193iq5w xeuugli x13faqbe x1vvkbs"><span>{price}</span></span></div>'
+    '<div class="x1iorvi4 x4uap5 xjkvuk6 xkhd6sd"><span class="x1lliihq x6ikm8r x10wlt62 x1n2onr6">'
+    '<span class="x1lliihq">{title}</span></span></div>'
+    '<div class="x1iorvi4 x4uap5 xjkvuk6 xkhd6sd"><span class="x1lliihq x6ikm8r">'
+    '<span class="x1lliihq">{location}</span></span></div></div></a></div></div>'
+)
+
+
+def _listing_nodes(data: object):
+    if isinstance(data, dict):
+        if "marketplace_listing_title" in data:
+            yield data
+            return
+        data = list(data.values())
+    if isinstance(data, list):
+        for item in data:
+            yield from _listing_nodes(item)
+
+
+def _render_anchors(html: str) -> str:
+    """Return the page as the browser's page_source would be once the result grid is rendered."""
+    cards = []
+    seen = set()
+    for match in _SJS_SCRIPT.finditer(html):
+        if "marketplace_listing_title" not in match.group(1):
+            continue
+        for node in _listing_nodes(json.loads(match.group(1))):
+            if node.get("id") in seen:
+                continue
+            seen.add(node.get("id"))
+            geocode = (node.get("location") or {}).get("reverse_geocode") or {}
+            location = f"{geocode.get('city')}, {geocode.get('state')}"
+            photo = (node.get("primary_listing_photo") or {}).get("image") or {}
+            title = node["marketplace_listing_title"]
+            cards.append(_CARD_MARKUP.format(
+                id=node["id"],
+                alt=html_lib.escape(f"{title} in {location}"),
+                src=html_lib.escape(photo.get("uri") or ""),
+                price=html_lib.escape((node.get("listing_price") or {}).get("formatted_amount") or ""),
+                title=html_lib.escape(title),
+                location=html_lib.escape(location),
+            ))
+    grid = f'<div role="main"><div class="x8gbvx8 x78zum5 x1q0g3np x1a02dak">{"".join(cards)}</div></div>'
+    return html.replace("</body>", grid + "</body>", 1)
+
+
+def _card_key(card: ListingCard) -> tuple:
+    return (card.listing_id, card.url, card.title, card.price, card.location, card.img)
+
+
+def _json_path(html: str) -> int:
+    return len(extract_cards_from_payload(html, "bench"))
+
+
+def _anchor_path(html: str) -> int:
+    soup = BeautifulSoup(html, "html.parser")
+    return len(extract_cards_from_anchors(soup, "bench"))
+
+
+def _measure(fn: Callable[[str], int], html: str, runs: int) -> tuple[int, float, float]:
+    """Return (cards found, median seconds, peak MiB)."""
+    timings = []
+    count = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        count = fn(html)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, statistics.median(timings), peak / (1024 * 1024)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Marketplace listing extraction")
+    parser.add_argument("html_file", nargs="?", default=str(ROOT / "fb_response.html"))
+    parser.add_argument("--runs", "-n", type=int, default=10, help="Timed runs per parser")
+    args = parser.parse_args()
+
+    html = Path(args.html_file).read_text(encoding="utf-8")
+    if "/marketplace/item/" not in html:
+        html = _render_anchors(html)
+        print("Page has no listing anchors; rendered them from its payload.")
+    json_cards = extract_cards_from_payload(html, "bench")
+    anchor_cards = extract_cards_from_anchors(BeautifulSoup(html, "html.parser"), "bench")
+    if [_card_key(c) for c in json_cards] != [_card_key(c) for c in anchor_cards]:
+        print(f"Paths disagree: json payload found {len(json_cards)} cards, bs4 anchors {len(anchor_cards)}")
+        return 1
+    print(f"Page: {args.html_file} ({len(html) / 1024:.0f} KiB), {args.runs} runs each")
+    print(f"Both paths return the same {len(json_cards)} cards\n")
+
+    results = {
+        "json payload": _measure(_json_path, html, args.runs),
+        "bs4 anchors": _measure(_anchor_path, html, args.runs),
+    }
+    for name, (count, seconds, peak_mib) in results.items():
+        print(f"{name:<14} cards={count:<4} median={seconds * 1000:8.1f} ms  peak={peak_mib:7.1f} MiB")
+
+    _, json_s, json_mib = results["json payload"]
+    _, bs4_s, bs4_mib = results["bs4 anchors"]
+    print(f"\nSpeedup: {bs4_s / json_s:.1f}x, memory saved per page: {bs4_mib - json_mib:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
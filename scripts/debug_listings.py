@@ -10,6 +10,7 @@ Usage:
   python scripts/debug_listings.py location [--city CODE] [--output-dir DIR]
   python scripts/debug_listings.py search <pattern> [--in FILE]
   python scripts/debug_listings.py compare <dir1> <dir2>
+  python scripts/debug_listings.py replay <dir> [--term TERM] [--limit N]
 """
 
 import argparse
@@ -25,7 +26,8 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from bs4 import BeautifulSoup
 from selenium import webdriver
 
-from dealsnoop.engines.base import get_browser
+from dealsnoop.engines.base import get_browser, quit_browser
+from dealsnoop.marketplace_parsing import cards_from_network_responses, load_recorded_responses
 
 
 def _relaxed_validate_listing(link) -> tuple[bool, str | None]:
@@ -139,7 +141,7 @@ def cmd_fetch(args: argparse.Namespace) -> int:
         print(f"\nSaved {len(listings_data)} listings to {dump_path}")
         return 0
     finally:
-        browser.quit()
+        quit_browser(browser)
 
 
 def cmd_location(args: argparse.Namespace) -> int:
@@ -211,7 +213,7 @@ def cmd_location(args: argparse.Namespace) -> int:
         print(f"page_has_marketplace: {'marketplace' in soup.get_text().lower()}")
         return 0
     finally:
-        browser.quit()
+        quit_browser(browser)
 
 
 def cmd_search(args: argparse.Namespace) -> int:
@@ -299,6 +301,21 @@ def cmd_compare(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_replay(args: argparse.Namespace) -> int:
+    """Build listing cards from recorded network responses (no browser, no network)."""
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"Error: {directory} is not a directory", file=sys.stderr)
+        return 1
+    bodies = load_recorded_responses(directory)
+    cards = cards_from_network_responses(bodies, args.term)
+    print(f"Replayed {len(bodies)} response(s) from {directory}: {len(cards)} listing(s)\n")
+    for card in cards[: args.limit]:
+        print(f"  id={card.listing_id} price={card.price:g} title={card.title[:50]!r} "
+              f"location={card.location!r}")
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Debug utility for Facebook Marketplace listing structure"
@@ -353,6 +370,15 @@ def main() -> int:
     p_compare.add_argument("dir2", help="Second output directory (e.g. debug_bikes)")
     p_compare.set_defaults(func=cmd_compare)
 
+    # replay
+    p_replay = subparsers.add_parser(
+        "replay", help="Build listings from responses saved via DEALSNOOP_DEBUG_SAVE_NETWORK"
+    )
+    p_replay.add_argument("directory", help="Directory of recorded *.json / *.html bodies")
+    p_replay.add_argument("--term", "-t", default="replay", help="Search term to tag listings with")
+    p_replay.add_argument("--limit", "-n", type=int, default=50, help="Max listings to print")
+    p_replay.set_defaults(func=cmd_replay)
+
     args = parser.parse_args()
     return args.func(args)
 
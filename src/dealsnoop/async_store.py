@@ -0,0 +1,656 @@
+"""Asyncio PostgreSQL store used by the bot and scripts; its SQL lives in store.py."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import AbstractAsyncContextManager, suppress
+from datetime import datetime
+from typing import Any, Callable, Hashable
+
+import psycopg
+from psycopg.rows import DictRow, dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from dealsnoop.config import (
+    CONFIG_CACHE,
+    CONFIG_LISTEN_RETRY_SECONDS,
+    DB_POOL_CHECK,
+    DB_POOL_MAX_IDLE,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_TIMEOUT,
+    LISTING_CACHE_PARTITIONS_AHEAD,
+    WRITE_BEHIND_MAX_DELAY,
+    WRITE_BEHIND_MAX_ROWS,
+)
+from dealsnoop.logger import logger
+from dealsnoop.search_config import SearchConfig
+from dealsnoop.store import (
+    CLAIM_LISTING_CACHE_MANY_SQL,
+    CLEANUP_AUTO_KEY,
+    DELETE_BOT_CONFIG_SQL,
+    DELETE_BOT_OWNED_CATEGORY_SQL,
+    DELETE_BOT_OWNED_CHANNEL_SQL,
+    DELETE_LISTING_CACHE_SQL,
+    DELETE_LOCATION_CACHE_SQL,
+    DROP_OLD_LISTING_CACHE_PARTITIONS_SQL,
+    ENSURE_LISTING_CACHE_PARTITIONS_SQL,
+    DELETE_SEARCH_SQL,
+    DELETE_USER_LOCATION_SQL,
+    FEED_CHANNEL_KEY,
+    INSERT_BOT_OWNED_CATEGORY_SQL,
+    INSERT_BOT_OWNED_CHANNEL_SQL,
+    INSERT_LLM_VERDICT_IF_ABSENT_SQL,
+    INSERT_SCHEMA_VERSION_SQL,
+    LISTEN_CONFIG_SQL,
+    LOCK_LISTING_CACHE_IDS_SQL,
+    MIGRATION_LOCK_SQL,
+    NOTIFY_CONFIG_SQL,
+    SCHEMA_VERSION_TABLE_SQL,
+    SELECT_ALL_BOT_CONFIG_SQL,
+    SELECT_BOT_OWNED_CATEGORIES_SQL,
+    SELECT_BOT_OWNED_CHANNELS_SQL,
+    SELECT_LISTING_BY_MESSAGE_SQL,
+    SELECT_LISTING_CACHE_MANY_SQL,
+    SELECT_LISTING_CACHE_ROWS_SQL,
+    SELECT_LISTING_CACHE_SQL,
+    SELECT_LISTING_METADATA_SQL,
+    SELECT_LISTING_SQL,
+    SELECT_LLM_VERDICT_SQL,
+    SELECT_LOCATION_NAME_SQL,
+    SELECT_SCHEMA_VERSION_SQL,
+    SELECT_SEARCH_SQL,
+    SELECT_SEARCHES_SQL,
+    SELECT_USER_LOCATION_SQL,
+    SELECT_VERDICT_WARM_ROWS_SQL,
+    SELECT_WATCH_CHANNELS_SQL,
+    TRUNCATE_SEARCHES_SQL,
+    UPSERT_BOT_CONFIG_SQL,
+    UPSERT_LISTING_CACHE_SQL,
+    UPSERT_LISTING_MESSAGE_SQL,
+    UPSERT_LISTING_METADATA_SQL,
+    UPSERT_LISTING_SQL,
+    UPSERT_LLM_VERDICT_SQL,
+    UPSERT_LOCATION_NAME_SQL,
+    UPSERT_SEARCH_SQL,
+    UPSERT_USER_LOCATION_SQL,
+    ListingRow,
+    channel_id_from_row,
+    flag_from_row,
+    metadata_from_row,
+    pending_migrations,
+    row_to_config,
+    search_params,
+    unique_ids,
+    user_location_from_row,
+)
+from dealsnoop.user_location import UserLocation
+
+# Statements the write-behind queue batches, in the order a flush writes them
+# (listing_messages references listings).
+WRITE_BEHIND_ORDER: tuple[str, ...] = (
+    UPSERT_LISTING_SQL,
+    UPSERT_LISTING_MESSAGE_SQL,
+    UPSERT_LISTING_METADATA_SQL,
+    UPSERT_LISTING_CACHE_SQL,
+)
+
+
+class AsyncSearchStore:
+    """
+    PostgreSQL-backed store for SearchConfig objects, listings and caches.
+    Connections come from an AsyncConnectionPool, which must be opened with `await open()`
+    from inside the running event loop (Client.setup_hook) and closed with `await close()`.
+
+    Listing, message, metadata and listing-cache upserts are write-behind: they return once
+    queued, and a background task writes everything pending in one transaction when
+    WRITE_BEHIND_MAX_ROWS rows are queued or WRITE_BEHIND_MAX_DELAY seconds have passed.
+    Reads of those tables flush first, so this process always sees its own writes. `close()`
+    flushes once more; rows queued at a crash (at most one batch) are lost, which for these
+    tables means a missing "Show AI reasoning" lookup or a listing notified again.
+
+    Searches and bot_config are served from memory while a LISTEN connection is up. Every
+    writer (in any process) sends a NOTIFY in its transaction, which drops the copy
+    in every listening process; each drop bumps a version so a load that raced with it is
+    not kept. Without the listener, reads go to the database.
+    """
+
+    def __init__(self, db_url: str | None = None) -> None:
+        db_url = db_url or os.getenv("DB_URL")
+        if not db_url:
+            raise SystemExit("DB_URL environment variable is required.")
+        self._db_url = db_url
+        self._pool = AsyncConnectionPool(
+            db_url,
+            connection_class=psycopg.AsyncConnection[DictRow],
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            timeout=DB_POOL_TIMEOUT,
+            max_idle=DB_POOL_MAX_IDLE,
+            kwargs={"row_factory": dict_row},
+            check=AsyncConnectionPool.check_connection if DB_POOL_CHECK else None,
+            name="dealsnoop-async",
+            open=False,
+        )
+        self._pending: dict[str, dict[Hashable, tuple[Any, ...]]] = {sql: {} for sql in WRITE_BEHIND_ORDER}
+        self._pending_rows = 0
+        self._flush_due = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+        self._searches: dict[str, SearchConfig] | None = None
+        self._bot_config: dict[str, dict] | None = None
+        self._config_version = 0
+        self._listening = False
+        self._listener: asyncio.Task[None] | None = None
+
+    async def open(self) -> None:
+        """Open the pool and create missing tables."""
+        await self._pool.open(wait=True, timeout=DB_POOL_TIMEOUT)
+        logger.info(f"Async database pool opened ({DB_POOL_MIN_SIZE}-{DB_POOL_MAX_SIZE} connections).")
+        await self._init_schema()
+        if WRITE_BEHIND_MAX_DELAY > 0:
+            self._flusher = asyncio.create_task(self._flush_loop(), name="dealsnoop-write-behind")
+        if CONFIG_CACHE:
+            self._listener = asyncio.create_task(self._listen_loop(), name="dealsnoop-config-listen")
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        await self.flush_writes()
+        await self._pool.close()
+
+    async def _write(self, sql: str, key: Hashable, params: tuple[Any, ...]) -> None:
+        """Queue an upsert (a later one for the same key replaces it), or run it now without a flusher."""
+        if self._flusher is None:
+            async with self._get_conn() as conn:
+                await conn.execute(sql, params)
+                await conn.commit()
+            return
+        pending = self._pending[sql]
+        if pending.pop(key, None) is None:
+            self._pending_rows += 1
+        pending[key] = params
+        if self._pending_rows >= WRITE_BEHIND_MAX_ROWS:
+            self._flush_due.set()
+
+    async def _listen_loop(self) -> None:
+        """Keep a LISTEN connection open and drop cached config on every notification."""
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self._db_url, autocommit=True) as conn:
+                    await conn.execute(LISTEN_CONFIG_SQL)
+                    self._listening = True
+                    # Anything cached before LISTEN may have missed a notification.
+                    self._invalidate_config()
+                    logger.info("Listening for config changes; searches and bot_config are cached.")
+                    async for notify in conn.notifies():
+                        self._invalidate_config(notify.payload)
+            except psycopg.Error as e:
+                logger.warning(f"Config listener disconnected ({e}); reading config from the database")
+            finally:
+                self._listening = False
+                self._invalidate_config()
+            await asyncio.sleep(CONFIG_LISTEN_RETRY_SECONDS)
+
+    def _invalidate_config(self, table: str | None = None) -> None:
+        """Drop cached searches and/or bot_config (None drops both)."""
+        self._config_version += 1
+        if table in (None, "searches"):
+            self._searches = None
+        if table in (None, "bot_config"):
+            self._bot_config = None
+
+    async def _cached_searches(self) -> dict[str, SearchConfig]:
+        if self._searches is not None:
+            return self._searches
+        version = self._config_version
+        async with self._get_conn() as conn:
+            rows = await (await conn.execute(SELECT_SEARCHES_SQL)).fetchall()
+        searches = {config.id: config for config in map(row_to_config, rows)}
+        if self._listening and version == self._config_version:
+            self._searches = searches
+        return searches
+
+    async def _cached_bot_config(self) -> dict[str, dict]:
+        if self._bot_config is not None:
+            return self._bot_config
+        version = self._config_version
+        async with self._get_conn() as conn:
+            rows = await (await conn.execute(SELECT_ALL_BOT_CONFIG_SQL)).fetchall()
+        bot_config = {row["key"]: row for row in rows}
+        if self._listening and version == self._config_version:
+            self._bot_config = bot_config
+        return bot_config
+
+    async def _flush_loop(self) -> None:
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._flush_due.wait(), timeout=WRITE_BEHIND_MAX_DELAY)
+            self._flush_due.clear()
+            try:
+                await self.flush_writes()
+            except Exception:
+                logger.exception("Write-behind flush failed")
+
+    async def flush_writes(self) -> None:
+        """Write every queued upsert: one transaction, one pipelined executemany per statement.
+
+        If the batch is rejected (e.g. a row violates a constraint), rows are retried one per
+        transaction and the failing ones are logged and dropped. If the database cannot be
+        reached, the batch is put back and retried on the next flush.
+        """
+        async with self._flush_lock:
+            if not self._pending_rows:
+                return
+            batch = self._pending
+            self._pending = {sql: {} for sql in WRITE_BEHIND_ORDER}
+            self._pending_rows = 0
+            try:
+                async with self._get_conn() as conn:
+                    async with conn.cursor() as cur:
+                        for sql in WRITE_BEHIND_ORDER:
+                            if batch[sql]:
+                                await cur.executemany(sql, list(batch[sql].values()))
+                    await conn.commit()
+            except psycopg.OperationalError as e:
+                logger.warning(f"Write-behind flush failed, will retry: {e}")
+                self._requeue(batch)
+                return
+            except psycopg.Error as e:
+                logger.warning(f"Write-behind batch rejected ({e}); writing rows one at a time")
+                await self._write_rows_individually(batch)
+                return
+        logger.debug(f"Write-behind flushed {sum(len(rows) for rows in batch.values())} row(s)")
+
+    def _requeue(self, batch: dict[str, dict[Hashable, tuple[Any, ...]]]) -> None:
+        """Put an unwritten batch back without overwriting rows queued since it was taken."""
+        for sql, rows in batch.items():
+            pending = self._pending[sql]
+            for key, params in rows.items():
+                if key not in pending:
+                    pending[key] = params
+                    self._pending_rows += 1
+
+    async def _write_rows_individually(self, batch: dict[str, dict[Hashable, tuple[Any, ...]]]) -> None:
+        async with self._get_conn() as conn:
+            for sql in WRITE_BEHIND_ORDER:
+                for key, params in batch[sql].items():
+                    try:
+                        await conn.execute(sql, params)
+                        await conn.commit()
+                    except psycopg.Error as e:
+                        await conn.rollback()
+                        logger.error(f"Write-behind dropped row {key!r}: {e}")
+
+    def _get_conn(self) -> AbstractAsyncContextManager[psycopg.AsyncConnection[DictRow]]:
+        """Borrow a pooled connection; it is returned to the pool when the async with-block exits."""
+        return self._pool.connection()
+
+    async def _init_schema(self) -> None:
+        """Apply pending migrations and create listing_cache partitions for the days ahead."""
+        async with self._get_conn() as conn:
+            await conn.execute(SCHEMA_VERSION_TABLE_SQL)
+            current = (await (await conn.execute(SELECT_SCHEMA_VERSION_SQL)).fetchone())["version"]
+            await conn.commit()
+            if pending_migrations(current):
+                await conn.execute(MIGRATION_LOCK_SQL)
+                # Re-read under the lock: another process may have migrated meanwhile.
+                current = (await (await conn.execute(SELECT_SCHEMA_VERSION_SQL)).fetchone())["version"]
+                for migration in pending_migrations(current):
+                    for statement in migration.statements:
+                        await conn.execute(statement)
+                    await conn.execute(INSERT_SCHEMA_VERSION_SQL, (migration.version, migration.name))
+                    logger.info(f"Applied schema migration {migration.version}: {migration.name}")
+                    current = migration.version
+                await conn.commit()
+            await conn.execute(ENSURE_LISTING_CACHE_PARTITIONS_SQL, (LISTING_CACHE_PARTITIONS_AHEAD,))
+            await conn.commit()
+        logger.info(f"Database schema at version {current}.")
+
+    async def add_object(self, obj: SearchConfig) -> None:
+        """Add a SearchConfig to the store."""
+        async with self._get_conn() as conn:
+            await conn.execute(UPSERT_SEARCH_SQL, search_params(obj))
+            await conn.execute(NOTIFY_CONFIG_SQL, ("searches",))
+            await conn.commit()
+        self._invalidate_config("searches")
+        logger.info(f"Search config '{obj.id}' saved to database.")
+
+    async def remove_object(self, obj: SearchConfig) -> None:
+        """Remove a SearchConfig from the store by id."""
+        await self.remove_by_id(obj.id)
+
+    async def remove_by_id(self, search_id: str) -> bool:
+        """Remove a search from the store by id. Returns True if a row was deleted."""
+        async with self._get_conn() as conn:
+            cur = await conn.execute(DELETE_SEARCH_SQL, (search_id,))
+            await conn.execute(NOTIFY_CONFIG_SQL, ("searches",))
+            await conn.commit()
+            self._invalidate_config("searches")
+            if cur.rowcount == 0:
+                logger.warning(f"Search config '{search_id}' not found in store.")
+                return False
+            logger.info(f"Search config '{search_id}' removed from store.")
+            return True
+
+    async def get_all_objects(self) -> set[SearchConfig]:
+        """Retrieve all SearchConfig objects from the store."""
+        return set((await self._cached_searches()).values())
+
+    async def get_config_by_id(self, search_id: str) -> SearchConfig | None:
+        """Return SearchConfig for given id, or None."""
+        if self._listening:
+            return (await self._cached_searches()).get(search_id)
+        async with self._get_conn() as conn:
+            row = await (await conn.execute(SELECT_SEARCH_SQL, (search_id,))).fetchone()
+        return row_to_config(row) if row else None
+
+    async def record_listing_metadata(
+        self,
+        message_id: int,
+        channel_id: int,
+        search_id: str,
+        thought_trace: str | None = None,
+    ) -> None:
+        """Store or update listing metadata for a Discord message."""
+        await self._write(
+            UPSERT_LISTING_METADATA_SQL, message_id, (message_id, channel_id, search_id, thought_trace)
+        )
+
+    async def get_listing_metadata(
+        self, message_id: int
+    ) -> dict[str, str | None] | None:
+        """Return listing metadata for a message, or None if not found."""
+        await self.flush_writes()
+        async with self._get_conn() as conn:
+            row = await (await conn.execute(SELECT_LISTING_METADATA_SQL, (message_id,))).fetchone()
+        return metadata_from_row(row)
+
+    async def insert_listing(
+        self,
+        listing_id: str,
+        search_id: str,
+        title: str,
+        description: str,
+        price: float,
+        location: str,
+        date: str,
+        url: str,
+        img: str,
+        thought_trace: str | None,
+        ai_strengths: str | None,
+        watch_command: str,
+    ) -> None:
+        """Insert or upsert a listing into the listings table."""
+        await self._write(
+            UPSERT_LISTING_SQL,
+            listing_id,
+            (
+                listing_id,
+                search_id,
+                title,
+                description,
+                price,
+                location,
+                date,
+                url,
+                img,
+                thought_trace,
+                ai_strengths,
+                watch_command,
+            ),
+        )
+
+    async def get_listing(self, listing_id: str) -> ListingRow | None:
+        """Return a listing by id, or None if not found."""
+        await self.flush_writes()
+        async with self._get_conn() as conn:
+            row = await (await conn.execute(SELECT_LISTING_SQL, (listing_id,))).fetchone()
+        return dict(row) if row else None
+
+    async def record_listing_message(
+        self,
+        message_id: int,
+        listing_id: str,
+        channel_id: int,
+    ) -> None:
+        """Store message_id -> listing_id mapping."""
+        await self._write(UPSERT_LISTING_MESSAGE_SQL, message_id, (message_id, listing_id, channel_id))
+
+    async def get_listing_by_message_id(
+        self, message_id: int
+    ) -> ListingRow | None:
+        """Return listing for a Discord message, or None if not found."""
+        await self.flush_writes()
+        async with self._get_conn() as conn:
+            row = await (await conn.execute(SELECT_LISTING_BY_MESSAGE_SQL, (message_id,))).fetchone()
+        return dict(row) if row else None
+
+    async def clear_store(self) -> None:
+        """Clear all SearchConfig objects from the store."""
+        async with self._get_conn() as conn:
+            await conn.execute(TRUNCATE_SEARCHES_SQL)
+            await conn.execute(NOTIFY_CONFIG_SQL, ("searches",))
+            await conn.commit()
+        self._invalidate_config("searches")
+        logger.info("Store cleared.")
+
+    async def get_feed_channel_id(self) -> int | None:
+        """Get the feed channel ID from bot_config, or None if not set."""
+        return channel_id_from_row((await self._cached_bot_config()).get(FEED_CHANNEL_KEY))
+
+    async def set_feed_channel_id(self, channel_id: int | None) -> None:
+        """Set or clear the feed channel ID in bot_config."""
+        async with self._get_conn() as conn:
+            if channel_id is None:
+                await conn.execute(DELETE_BOT_CONFIG_SQL, (FEED_CHANNEL_KEY,))
+            else:
+                await conn.execute(UPSERT_BOT_CONFIG_SQL, (FEED_CHANNEL_KEY, str(channel_id)))
+            await conn.execute(NOTIFY_CONFIG_SQL, ("bot_config",))
+            await conn.commit()
+        self._invalidate_config("bot_config")
+
+    async def get_cleanup_auto(self) -> bool:
+        """Return whether auto-cleanup is enabled (delete bot-owned channels when watches removed)."""
+        return flag_from_row((await self._cached_bot_config()).get(CLEANUP_AUTO_KEY))
+
+    async def set_cleanup_auto(self, enabled: bool) -> None:
+        """Enable or disable auto-cleanup."""
+        async with self._get_conn() as conn:
+            await conn.execute(UPSERT_BOT_CONFIG_SQL, (CLEANUP_AUTO_KEY, "true" if enabled else "false"))
+            await conn.execute(NOTIFY_CONFIG_SQL, ("bot_config",))
+            await conn.commit()
+        self._invalidate_config("bot_config")
+
+    async def record_bot_owned_channel(self, channel_id: int) -> None:
+        """Record a channel as bot-owned (created by the bot)."""
+        async with self._get_conn() as conn:
+            await conn.execute(INSERT_BOT_OWNED_CHANNEL_SQL, (channel_id,))
+            await conn.commit()
+
+    async def record_bot_owned_category(self, category_id: int) -> None:
+        """Record a category as bot-owned (created by the bot)."""
+        async with self._get_conn() as conn:
+            await conn.execute(INSERT_BOT_OWNED_CATEGORY_SQL, (category_id,))
+            await conn.commit()
+
+    async def get_bot_owned_channels(self) -> set[int]:
+        """Return all channel IDs that the bot created."""
+        async with self._get_conn() as conn:
+            rows = await (await conn.execute(SELECT_BOT_OWNED_CHANNELS_SQL)).fetchall()
+        return {row["channel_id"] for row in rows}
+
+    async def get_bot_owned_categories(self) -> set[int]:
+        """Return all category IDs that the bot created."""
+        async with self._get_conn() as conn:
+            rows = await (await conn.execute(SELECT_BOT_OWNED_CATEGORIES_SQL)).fetchall()
+        return {row["category_id"] for row in rows}
+
+    async def remove_bot_owned_channel(self, channel_id: int) -> None:
+        """Remove a channel from bot-owned tracking (e.g. after deletion)."""
+        async with self._get_conn() as conn:
+            await conn.execute(DELETE_BOT_OWNED_CHANNEL_SQL, (channel_id,))
+            await conn.commit()
+
+    async def remove_bot_owned_category(self, category_id: int) -> None:
+        """Remove a category from bot-owned tracking (e.g. after deletion)."""
+        async with self._get_conn() as conn:
+            await conn.execute(DELETE_BOT_OWNED_CATEGORY_SQL, (category_id,))
+            await conn.commit()
+
+    async def get_channels_with_active_watches(self) -> set[int]:
+        """Return channel IDs that have at least one active watch (SearchConfig)."""
+        async with self._get_conn() as conn:
+            rows = await (await conn.execute(SELECT_WATCH_CHANNELS_SQL)).fetchall()
+        return {row["channel"] for row in rows}
+
+    async def get_user_location(self, user_id: int) -> UserLocation | None:
+        """Get marketplace location settings for a user."""
+        async with self._get_conn() as conn:
+            row = await (await conn.execute(SELECT_USER_LOCATION_SQL, (user_id,))).fetchone()
+        return user_location_from_row(row)
+
+    async def set_user_location(self, user_id: int, city_code: str) -> None:
+        """Set or update a user's marketplace location settings."""
+        async with self._get_conn() as conn:
+            await conn.execute(UPSERT_USER_LOCATION_SQL, (user_id, city_code))
+            await conn.commit()
+
+    async def remove_user_location(self, user_id: int) -> bool:
+        """Remove marketplace location settings for a user."""
+        async with self._get_conn() as conn:
+            cur = await conn.execute(DELETE_USER_LOCATION_SQL, (user_id,))
+            await conn.commit()
+        return cur.rowcount > 0
+
+    async def get_location_name(self, city_code: str) -> str | None:
+        """Get cached human-readable location name for a city code."""
+        async with self._get_conn() as conn:
+            row = await (await conn.execute(SELECT_LOCATION_NAME_SQL, (city_code,))).fetchone()
+        return row.get("location_name") if row else None
+
+    async def set_location_name(self, city_code: str, location_name: str) -> None:
+        """Cache human-readable location name for a city code."""
+        async with self._get_conn() as conn:
+            await conn.execute(UPSERT_LOCATION_NAME_SQL, (city_code, location_name))
+            await conn.commit()
+
+    async def clear_location_cache(self) -> int:
+        """Clear all cached location names. Returns number of rows deleted."""
+        async with self._get_conn() as conn:
+            cur = await conn.execute(DELETE_LOCATION_CACHE_SQL)
+            await conn.commit()
+        return cur.rowcount
+
+    async def get_llm_verdict(self, key: str, ttl_days: int) -> dict | None:
+        """Return a cached quality verdict younger than ttl_days, or None."""
+        async with self._get_conn() as conn:
+            return await (await conn.execute(SELECT_LLM_VERDICT_SQL, (key, ttl_days))).fetchone()
+
+    async def put_llm_verdict(self, key: str, passed: bool, thought_trace: str, strengths_summary: str) -> None:
+        """Store (or refresh) a quality verdict."""
+        async with self._get_conn() as conn:
+            await conn.execute(UPSERT_LLM_VERDICT_SQL, (key, passed, thought_trace, strengths_summary))
+            await conn.commit()
+
+    async def get_verdict_warm_rows(self, ttl_days: int) -> list[dict]:
+        """Kept listings younger than ttl_days joined with their watch's criteria."""
+        await self.flush_writes()
+        async with self._get_conn() as conn:
+            return await (await conn.execute(SELECT_VERDICT_WARM_ROWS_SQL, (ttl_days,))).fetchall()
+
+    async def add_llm_verdicts(self, verdicts: list[tuple]) -> None:
+        """Insert (key, passed, thought_trace, strengths_summary, created_at) rows not cached yet."""
+        if not verdicts:
+            return
+        async with self._get_conn() as conn:
+            async with conn.cursor() as cur:
+                await cur.executemany(INSERT_LLM_VERDICT_IF_ABSENT_SQL, verdicts)
+            await conn.commit()
+
+    async def listing_cache_contains(self, engine: str, listing_id: str) -> bool:
+        """Check if a listing is in the cache for the given engine."""
+        await self.flush_writes()
+        async with self._get_conn() as conn:
+            cur = await conn.execute(SELECT_LISTING_CACHE_SQL, (engine, listing_id.strip()))
+            return await cur.fetchone() is not None
+
+    async def listing_cache_add(self, engine: str, listing_id: str) -> None:
+        """Add a listing to the cache, refreshing created_at if already present."""
+        listing_id = listing_id.strip()
+        await self._write(UPSERT_LISTING_CACHE_SQL, (engine, listing_id), (engine, listing_id))
+
+    async def listing_cache_contains_many(self, engine: str, listing_ids: list[str]) -> set[str]:
+        """Return which of listing_ids are in the cache for the given engine (one query)."""
+        await self.flush_writes()
+        ids = unique_ids(listing_ids)
+        if not ids:
+            return set()
+        async with self._get_conn() as conn:
+            rows = await (await conn.execute(SELECT_LISTING_CACHE_MANY_SQL, (engine, ids))).fetchall()
+        return {row["listing_id"] for row in rows}
+
+    async def listing_cache_rows(self, engine: str) -> list[tuple[str, datetime]]:
+        """Return (listing_id, created_at) of every cache entry for the engine, oldest first."""
+        await self.flush_writes()
+        async with self._get_conn() as conn:
+            rows = await (await conn.execute(SELECT_LISTING_CACHE_ROWS_SQL, (engine,))).fetchall()
+        return [(row["listing_id"], row["created_at"]) for row in rows]
+
+    async def listing_cache_claim_many(self, engine: str, listing_ids: list[str]) -> set[str]:
+        """Atomically insert listing_ids for the engine; return only the ids this call won."""
+        await self.flush_writes()
+        ids = unique_ids(listing_ids)
+        if not ids:
+            return set()
+        async with self._get_conn() as conn:
+            await conn.execute(LOCK_LISTING_CACHE_IDS_SQL, (engine, ids))
+            rows = await (await conn.execute(CLAIM_LISTING_CACHE_MANY_SQL, (engine, ids, engine))).fetchall()
+            await conn.commit()
+        return {row["listing_id"] for row in rows}
+
+    async def delete_expired_batch(
+        self,
+        sql: str,
+        days: int,
+        limit: int,
+        archive: Callable[[list[dict]], None] | None = None,
+    ) -> int:
+        """Run one retention DELETE ... RETURNING; `archive` gets the rows (in a worker thread)
+        before the commit, so a failed archive write keeps the rows in the database.
+        """
+        async with self._get_conn() as conn:
+            rows = await (await conn.execute(sql, (days, limit))).fetchall()
+            if rows and archive is not None:
+                await asyncio.to_thread(archive, rows)
+            await conn.commit()
+        return len(rows)
+
+    async def listing_cache_clear(self, engine: str) -> int:
+        """Clear all listings from the cache for the given engine."""
+        await self.flush_writes()
+        async with self._get_conn() as conn:
+            cur = await conn.execute(DELETE_LISTING_CACHE_SQL, (engine,))
+            await conn.commit()
+        return cur.rowcount
+
+    async def listing_cache_flush_older_than_days(self, days: int = 2) -> int:
+        """Drop the listing_cache day partitions older than `days` and create the ones for the
+        days ahead. Partitions hold every engine's entries, so this expires all engines at once.
+        Returns the number of partitions dropped.
+        """
+        await self.flush_writes()
+        async with self._get_conn() as conn:
+            row = (await (await conn.execute(DROP_OLD_LISTING_CACHE_PARTITIONS_SQL, (days,))).fetchone())
+            await conn.execute(ENSURE_LISTING_CACHE_PARTITIONS_SQL, (LISTING_CACHE_PARTITIONS_AHEAD,))
+            await conn.commit()
+        return row["dropped"]
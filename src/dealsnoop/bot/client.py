@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 
-import asyncio
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Awaitable, Callable
 
 import discord  # type: ignore[import-untyped]
 from discord.ext import commands  # type: ignore[import-untyped]
@@ -19,7 +18,7 @@ from dealsnoop.config import GUILD_ID
 from dealsnoop.logger import logger
 from dealsnoop.product import Product
 from dealsnoop.search_config import SearchConfig
-from dealsnoop.store import SearchStore
+from dealsnoop.async_store import AsyncSearchStore
 
 if TYPE_CHECKING:
     from dealsnoop.snoop import Snoop
@@ -43,7 +42,7 @@ class UpdateWatchModal(discord.ui.Modal, title="Update watch"):
 
     def __init__(
         self,
-        searches: SearchStore,
+        searches: AsyncSearchStore,
         config: SearchConfig,
         snoop: Snoop | None,
     ) -> None:
@@ -138,8 +137,10 @@ class UpdateWatchModal(discord.ui.Modal, title="Update watch"):
                 days_listed=self._config.days_listed,
                 radius=radius,
                 context=context,
+                exclude_terms=self._config.exclude_terms,
+                max_price_ratio=self._config.max_price_ratio,
             )
-            await asyncio.to_thread(self._searches.add_object, updated)
+            await self._searches.add_object(updated)
             embed = search_config_embed(updated)
             await interaction.followup.send(
                 "Watch updated.",
@@ -158,7 +159,7 @@ class UpdateContextModal(discord.ui.Modal, title="Update context"):
 
     def __init__(
         self,
-        searches: SearchStore,
+        searches: AsyncSearchStore,
         config: SearchConfig,
         *,
         initial_context: str | None = None,
@@ -189,8 +190,10 @@ class UpdateContextModal(discord.ui.Modal, title="Update context"):
             days_listed=self._config.days_listed,
             radius=self._config.radius,
             context=context,
+            exclude_terms=self._config.exclude_terms,
+            max_price_ratio=self._config.max_price_ratio,
         )
-        await asyncio.to_thread(self._searches.add_object, updated)
+        await self._searches.add_object(updated)
         await interaction.response.send_message(
             "Context updated.",
             ephemeral=True,
@@ -200,7 +203,7 @@ class UpdateContextModal(discord.ui.Modal, title="Update context"):
 class ThumbsDownModal(discord.ui.Modal, title="What don't you like about this listing?"):
     """Modal for thumbs-down feedback. User's text is appended to watch context."""
 
-    def __init__(self, searches: SearchStore, config: SearchConfig) -> None:
+    def __init__(self, searches: AsyncSearchStore, config: SearchConfig) -> None:
         super().__init__()
         self._searches = searches
         self._config = config
@@ -232,8 +235,10 @@ class ThumbsDownModal(discord.ui.Modal, title="What don't you like about this li
             days_listed=self._config.days_listed,
             radius=self._config.radius,
             context=new_context.strip() or None,
+            exclude_terms=self._config.exclude_terms,
+            max_price_ratio=self._config.max_price_ratio,
         )
-        await asyncio.to_thread(self._searches.add_object, updated)
+        await self._searches.add_object(updated)
         await interaction.response.send_message(
             "Context updated.",
             ephemeral=True,
@@ -243,16 +248,21 @@ class ThumbsDownModal(discord.ui.Modal, title="What don't you like about this li
 class Client(commands.Bot):
     _unregistered_cogs: list[commands.Cog]
 
-    def __init__(self, searches: SearchStore):
+    def __init__(self, searches: AsyncSearchStore):
         super().__init__(command_prefix="!@#", intents=intents)
         self._unregistered_cogs = []
         self._searches = searches
+        self._shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
     
 
     def register_cog(self, cog: commands.Cog) -> None:
         self._unregistered_cogs.append(cog)
 
-    def record_listing_metadata(
+    def register_shutdown_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Run `hook` on close, before the store is closed."""
+        self._shutdown_hooks.append(hook)
+
+    async def record_listing_metadata(
         self,
         message_id: int,
         channel_id: int,
@@ -260,7 +270,7 @@ class Client(commands.Bot):
         thought_trace: str | None = None,
     ) -> None:
         """Store listing metadata for a Discord message."""
-        self._searches.record_listing_metadata(
+        await self._searches.record_listing_metadata(
             message_id, channel_id, search_id, thought_trace
         )
 
@@ -272,20 +282,18 @@ class Client(commands.Bot):
             logger.info(f"Added command '{command.name}'")
 
     async def setup_hook(self) -> None:
+        await self._searches.open()
+
         @self.tree.context_menu(name="Show AI reasoning")
         async def show_ai_reasoning(
             interaction: discord.Interaction, message: discord.Message
         ) -> None:
             await interaction.response.defer(ephemeral=True)
-            listing = await asyncio.to_thread(
-                self._searches.get_listing_by_message_id, message.id
-            )
+            listing = await self._searches.get_listing_by_message_id(message.id)
             if listing:
                 thought_trace = listing.get("thought_trace")
             else:
-                meta = await asyncio.to_thread(
-                    self._searches.get_listing_metadata, message.id
-                )
+                meta = await self._searches.get_listing_metadata(message.id)
                 thought_trace = meta.get("thought_trace") if meta else None
             if not thought_trace:
                 await interaction.followup.send(
@@ -304,12 +312,12 @@ class Client(commands.Bot):
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
 
-        def _get_search_id_for_message(message_id: int) -> str | None:
+        async def _get_search_id_for_message(message_id: int) -> str | None:
             """Return search_id for a message (listing, metadata, etc.) or None."""
-            listing = self._searches.get_listing_by_message_id(message_id)
+            listing = await self._searches.get_listing_by_message_id(message_id)
             if listing:
                 return listing["search_id"]
-            meta = self._searches.get_listing_metadata(message_id)
+            meta = await self._searches.get_listing_metadata(message_id)
             return meta["search_id"] if meta else None
 
         @self.tree.context_menu(name="Get watch command")
@@ -317,18 +325,14 @@ class Client(commands.Bot):
             interaction: discord.Interaction, message: discord.Message
         ) -> None:
             await interaction.response.defer(ephemeral=True)
-            search_id = await asyncio.to_thread(
-                _get_search_id_for_message, message.id
-            )
+            search_id = await _get_search_id_for_message(message.id)
             if search_id is None:
                 await interaction.followup.send(
                     "No watch found for this message.",
                     ephemeral=True,
                 )
                 return
-            config = await asyncio.to_thread(
-                self._searches.get_config_by_id, search_id
-            )
+            config = await self._searches.get_config_by_id(search_id)
             if config is None:
                 await interaction.followup.send(
                     "Watch already removed.",
@@ -354,18 +358,14 @@ class Client(commands.Bot):
             interaction: discord.Interaction, message: discord.Message
         ) -> None:
             await interaction.response.defer(ephemeral=True)
-            search_id = await asyncio.to_thread(
-                _get_search_id_for_message, message.id
-            )
+            search_id = await _get_search_id_for_message(message.id)
             if search_id is None:
                 await interaction.followup.send(
                     "No watch found for this message.",
                     ephemeral=True,
                 )
                 return
-            config = await asyncio.to_thread(
-                self._searches.get_config_by_id, search_id
-            )
+            config = await self._searches.get_config_by_id(search_id)
             if config is None:
                 await interaction.followup.send(
                     "Watch already removed.",
@@ -378,9 +378,7 @@ class Client(commands.Bot):
                     ephemeral=True,
                 )
                 return
-            removed = await asyncio.to_thread(
-                self._searches.remove_by_id, search_id
-            )
+            removed = await self._searches.remove_by_id(search_id)
             if not removed:
                 await interaction.followup.send(
                     "Watch could not be removed (may have been deleted already).",
@@ -391,7 +389,7 @@ class Client(commands.Bot):
                 f"Removed watch {search_id}.",
                 ephemeral=True,
             )
-            if self._searches.get_cleanup_auto():
+            if await self._searches.get_cleanup_auto():
                 snoop = getattr(self, "_snoop", None)
                 if snoop and interaction.guild_id:
                     guild = interaction.guild or self.get_guild(interaction.guild_id)
@@ -402,18 +400,14 @@ class Client(commands.Bot):
         async def update_watch(
             interaction: discord.Interaction, message: discord.Message
         ) -> None:
-            search_id = await asyncio.to_thread(
-                _get_search_id_for_message, message.id
-            )
+            search_id = await _get_search_id_for_message(message.id)
             if search_id is None:
                 await interaction.response.send_message(
                     "No watch found for this message.",
                     ephemeral=True,
                 )
                 return
-            config = await asyncio.to_thread(
-                self._searches.get_config_by_id, search_id
-            )
+            config = await self._searches.get_config_by_id(search_id)
             if config is None:
                 await interaction.response.send_message(
                     "Watch already removed.",
@@ -434,18 +428,14 @@ class Client(commands.Bot):
         async def update_context(
             interaction: discord.Interaction, message: discord.Message
         ) -> None:
-            search_id = await asyncio.to_thread(
-                _get_search_id_for_message, message.id
-            )
+            search_id = await _get_search_id_for_message(message.id)
             if search_id is None:
                 await interaction.response.send_message(
                     "No watch found for this message.",
                     ephemeral=True,
                 )
                 return
-            config = await asyncio.to_thread(
-                self._searches.get_config_by_id, search_id
-            )
+            config = await self._searches.get_config_by_id(search_id)
             if config is None:
                 await interaction.response.send_message(
                     "Watch already removed.",
@@ -475,6 +465,15 @@ class Client(commands.Bot):
     async def on_ready(self) -> None:
         ...
 
+    async def close(self) -> None:
+        await super().close()
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception:
+                logger.exception("Shutdown hook failed")
+        await self._searches.close()
+
     async def on_interaction(self, interaction: discord.Interaction) -> None:
         custom_id = (
             interaction.data.get("custom_id", "")
@@ -512,9 +511,7 @@ class Client(commands.Bot):
                 ephemeral=True,
             )
             return
-        listing = await asyncio.to_thread(
-            self._searches.get_listing, listing_id_str
-        )
+        listing = await self._searches.get_listing(listing_id_str)
         if not listing:
             await interaction.followup.send(
                 "Listing no longer available.",
@@ -551,9 +548,7 @@ class Client(commands.Bot):
         self, interaction: discord.Interaction, listing_id: str
     ) -> None:
         """Handle thumbs-down button: open modal for user feedback."""
-        listing = await asyncio.to_thread(
-            self._searches.get_listing, listing_id
-        )
+        listing = await self._searches.get_listing(listing_id)
         if not listing:
             await interaction.response.send_message(
                 "Listing or watch no longer available.",
@@ -561,9 +556,7 @@ class Client(commands.Bot):
             )
             return
 
-        config = await asyncio.to_thread(
-            self._searches.get_config_by_id, listing["search_id"]
-        )
+        config = await self._searches.get_config_by_id(listing["search_id"])
         if not config:
             await interaction.response.send_message(
                 "Listing or watch no longer available.",
@@ -600,10 +593,10 @@ class Client(commands.Bot):
             return
         msg = await channel.send(embed=embed, view=view)
         if listing_id:
-            self._searches.record_listing_message(msg.id, listing_id, channel_id)
+            await self._searches.record_listing_message(msg.id, listing_id, channel_id)
         elif search_id:
             trace = (thought_trace or "").strip() or None
-            self.record_listing_metadata(msg.id, channel_id, search_id, trace)
+            await self.record_listing_metadata(msg.id, channel_id, search_id, trace)
 
     async def send_layout(
         self,
@@ -619,10 +612,10 @@ class Client(commands.Bot):
             return
         msg = await channel.send(view=view)
         if listing_id:
-            self._searches.record_listing_message(msg.id, listing_id, channel_id)
+            await self._searches.record_listing_message(msg.id, listing_id, channel_id)
         elif search_id:
             trace = (thought_trace or "").strip() or None
-            self.record_listing_metadata(msg.id, channel_id, search_id, trace)
+            await self.record_listing_metadata(msg.id, channel_id, search_id, trace)
 
 
 
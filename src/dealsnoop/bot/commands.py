@@ -111,7 +111,7 @@ class Commands(commands.Cog):
         if existing is not None:
             return existing
         category = await guild.create_category(category_name)
-        self.snoop.searches.record_bot_owned_category(category.id)
+        await self.snoop.searches.record_bot_owned_category(category.id)
         return category
 
     async def _create_watch_channel(
@@ -137,7 +137,7 @@ class Commands(commands.Cog):
         if existing is not None:
             return (existing.id, location_name)
         channel = await guild.create_text_channel(channel_name, category=category)
-        self.snoop.searches.record_bot_owned_channel(channel.id)
+        await self.snoop.searches.record_bot_owned_channel(channel.id)
         return (channel.id, location_name)
 
     @discord.app_commands.command(name="watch", description="Watch for a specific item on various marketplaces.")
@@ -151,13 +151,16 @@ class Commands(commands.Cog):
         days_listed: int = 1,
         radius: int = 30,
         channel_id: str | None = None,
+        exclude_terms: str = "",
+        max_price_ratio: float | None = None,
     ) -> None:
         try:
             formatted_terms = tuple(term.strip() for term in terms.split(","))
-            existing_ids = {search.id for search in self.snoop.searches.get_all_objects()}
+            formatted_exclude = tuple(term.strip() for term in exclude_terms.split(",") if term.strip())
+            existing_ids = {search.id for search in await self.snoop.searches.get_all_objects()}
             search_id = _make_search_id(formatted_terms, existing_ids)
 
-            user_loc = self.snoop.searches.get_user_location(interaction.user.id)
+            user_loc = await self.snoop.searches.get_user_location(interaction.user.id)
             resolved_city_code = _parse_city_code(city_code) if city_code else (
                 user_loc.city_code if user_loc else "107976589222439"
             )
@@ -190,11 +193,13 @@ class Commands(commands.Cog):
                 days_listed=days_listed,
                 radius=radius,
                 owner_id=interaction.user.id,
+                exclude_terms=formatted_exclude,
+                max_price_ratio=max_price_ratio,
             )
-            self.snoop.searches.add_object(config)
+            await self.snoop.searches.add_object(config)
             embed = search_config_embed(config)
             msg = await interaction.followup.send(embed=embed)
-            self.snoop.bot.record_listing_metadata(msg.id, msg.channel_id, config.id)
+            await self.snoop.bot.record_listing_metadata(msg.id, msg.channel_id, config.id)
         except ValueError as e:
             await self._respond(interaction, content=f"ERROR: {e}")
         except discord.Forbidden:
@@ -209,7 +214,7 @@ class Commands(commands.Cog):
 
     @discord.app_commands.command(name="list", description="List searches currently being watched.")
     async def list_searches(self, interaction: discord.Interaction) -> None:
-        searches = sorted(self.snoop.searches.get_all_objects(), key=lambda s: s.id)
+        searches = sorted(await self.snoop.searches.get_all_objects(), key=lambda s: s.id)
         guild: discord.Guild | None = interaction.guild
         if guild is None and interaction.guild_id is not None:
             guild = self.snoop.bot.get_guild(interaction.guild_id)
@@ -223,7 +228,7 @@ class Commands(commands.Cog):
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
         """Autocomplete search IDs for the unwatch command."""
-        searches = self.snoop.searches.get_all_objects()
+        searches = await self.snoop.searches.get_all_objects()
         current_lower = current.lower()
         choices = [
             discord.app_commands.Choice(name=s.id, value=s.id)
@@ -235,7 +240,7 @@ class Commands(commands.Cog):
     @discord.app_commands.command(name="unwatch", description="Remove watched listing.")
     @discord.app_commands.autocomplete(id=_unwatch_id_autocomplete)
     async def unwatch(self, interaction: discord.Interaction, id: str) -> None:
-        for search in self.snoop.searches.get_all_objects():
+        for search in await self.snoop.searches.get_all_objects():
             if search.id == id:
                 if not _is_admin(interaction) and search.owner_id != interaction.user.id:
                     await interaction.response.send_message(
@@ -243,9 +248,9 @@ class Commands(commands.Cog):
                         ephemeral=True,
                     )
                     return
-                self.snoop.searches.remove_object(search)
+                await self.snoop.searches.remove_object(search)
                 await interaction.response.send_message(f"Removed {search.terms} from watchlist")
-                if self.snoop.searches.get_cleanup_auto():
+                if await self.snoop.searches.get_cleanup_auto():
                     guild = interaction.guild or (
                         self.snoop.bot.get_guild(interaction.guild_id) if interaction.guild_id else None
                     )
@@ -293,7 +298,7 @@ class Commands(commands.Cog):
         mode: Literal["on", "off"],
     ) -> None:
         enabled = mode == "on"
-        self.snoop.searches.set_cleanup_auto(enabled)
+        await self.snoop.searches.set_cleanup_auto(enabled)
         status = "enabled" if enabled else "disabled"
         await interaction.response.send_message(f"Auto-cleanup {status}.")
 
@@ -309,10 +314,10 @@ class Commands(commands.Cog):
         try:
             target_id = _parse_id(id)
             if type == "channel":
-                self.snoop.searches.record_bot_owned_channel(target_id)
+                await self.snoop.searches.record_bot_owned_channel(target_id)
                 await interaction.response.send_message(f"Marked channel <#{target_id}> as bot-owned.")
             else:
-                self.snoop.searches.record_bot_owned_category(target_id)
+                await self.snoop.searches.record_bot_owned_category(target_id)
                 guild = interaction.guild or (
                     self.snoop.bot.get_guild(interaction.guild_id) if interaction.guild_id else None
                 )
@@ -321,7 +326,7 @@ class Commands(commands.Cog):
                     category = guild.get_channel(target_id)
                     if isinstance(category, discord.CategoryChannel):
                         for ch in category.channels:
-                            self.snoop.searches.record_bot_owned_channel(ch.id)
+                            await self.snoop.searches.record_bot_owned_channel(ch.id)
                             channel_count += 1
                 if channel_count:
                     await interaction.response.send_message(
@@ -337,7 +342,7 @@ class Commands(commands.Cog):
         description="Clear the cached location names so they will be re-resolved from Marketplace.",
     )
     async def admin_clearlocationcache(self, interaction: discord.Interaction) -> None:
-        count = self.snoop.searches.clear_location_cache()
+        count = await self.snoop.searches.clear_location_cache()
         await interaction.response.send_message(f"Cleared {count} cached location name(s).")
 
     @admin.command(name="clearcache", description="Clear the listing cache so previously seen listings can be notified again.")
@@ -345,7 +350,7 @@ class Commands(commands.Cog):
         cleared = 0
         for engine in self.snoop.engines:
             if hasattr(engine, "cache"):
-                engine.cache.clear()
+                await engine.cache.clear()
                 cleared += 1
         if cleared:
             await interaction.response.send_message(f"Cleared cache for {cleared} engine(s).")
@@ -366,9 +371,9 @@ class Commands(commands.Cog):
             ephemeral=True,
         )
 
-    @admin.command(name="forcesearch", description="Start a search now and reset the 5-minute loop timer.")
+    @admin.command(name="forcesearch", description="Search every watch now, regardless of its schedule.")
     async def admin_forcesearch(self, interaction: discord.Interaction) -> None:
-        if not self.snoop.searches.get_all_objects():
+        if not await self.snoop.searches.get_all_objects():
             await interaction.response.send_message("No watched searches. Add one with `/watch` first.")
             return
         self.snoop.trigger_search_and_reset_timer()
@@ -387,11 +392,11 @@ class Commands(commands.Cog):
     ) -> None:
         try:
             if channel.strip().lower() == "none":
-                self.snoop.searches.set_feed_channel_id(None)
+                await self.snoop.searches.set_feed_channel_id(None)
                 await interaction.response.send_message("Feed channel cleared.")
                 return
             channel_id = _parse_channel_id(channel)
-            self.snoop.searches.set_feed_channel_id(channel_id)
+            await self.snoop.searches.set_feed_channel_id(channel_id)
             await interaction.response.send_message(f"Feed channel set to <#{channel_id}>.")
         except ValueError as e:
             await interaction.response.send_message(f"ERROR: {e}")
@@ -411,7 +416,7 @@ class Commands(commands.Cog):
         await interaction.response.defer()
         try:
             location_name = await self.snoop.get_location_for_city_code(parsed_city_code)
-            self.snoop.searches.set_user_location(interaction.user.id, parsed_city_code)
+            await self.snoop.searches.set_user_location(interaction.user.id, parsed_city_code)
             await interaction.followup.send(
                 f"Default Marketplace location set to **{location_name}** (`{parsed_city_code}`)."
             )
@@ -420,7 +425,7 @@ class Commands(commands.Cog):
 
     @location.command(name="remove", description="Remove your default Marketplace location code.")
     async def location_remove(self, interaction: discord.Interaction) -> None:
-        removed = self.snoop.searches.remove_user_location(interaction.user.id)
+        removed = await self.snoop.searches.remove_user_location(interaction.user.id)
         if removed:
             await interaction.response.send_message("Location removed.")
         else:
@@ -166,6 +166,10 @@ def search_config_embed(config: SearchConfig) -> discord.Embed:
     embed.add_field(name="Target Price", value=f"${config.target_price}" if config.target_price else "—")
     embed.add_field(name="Radius", value=f"{config.radius} mi")
     embed.add_field(name="Context", value=config.context or "—")
+    embed.add_field(name="Excluded Terms", value=", ".join(config.exclude_terms) or "—")
+    embed.add_field(
+        name="Max Price Ratio", value=f"{config.max_price_ratio:g}x" if config.max_price_ratio else "Default"
+    )
 
     return embed
 
@@ -0,0 +1,100 @@
+"""Two-tier quality evaluation: a cheap screening verdict, escalated only when it is unsure."""
+
+from __future__ import annotations
+
+import random
+import re
+from dataclasses import dataclass, field
+
+ACCEPT = "accept"
+REJECT = "reject"
+UNSURE = "unsure"
+
+
+@dataclass(frozen=True)
+class Screening:
+    """The screening model's answer for one listing."""
+
+    passed: bool
+    thought_trace: str
+    strengths_summary: str
+    confidence: int
+
+
+def parse_screening(raw_output: str) -> Screening | None:
+    """Parse `reasoning || highlights || true/false || confidence`; None if malformed."""
+    parts = [part.strip() for part in (raw_output or "").strip().split("||")]
+    if len(parts) != 4 or not parts[0]:
+        return None
+    verdict = re.search(r"\b(true|false)\b", parts[2], re.IGNORECASE)
+    confidence = re.search(r"\d{1,3}", parts[3])
+    if not verdict or not confidence:
+        return None
+    return Screening(
+        passed=verdict.group(1).lower() == "true",
+        thought_trace=parts[0],
+        strengths_summary=parts[1] or "NA",
+        confidence=min(100, int(confidence.group(0))),
+    )
+
+
+@dataclass
+class CascadeStats:
+    """Per-tier counts, and how often the quality model agreed with the screening verdict."""
+
+    accepted: int = 0
+    rejected: int = 0
+    unsure: int = 0
+    failed: int = 0
+    compared: dict[str, int] = field(default_factory=lambda: {ACCEPT: 0, REJECT: 0, UNSURE: 0})
+    agreed: dict[str, int] = field(default_factory=lambda: {ACCEPT: 0, REJECT: 0, UNSURE: 0})
+
+    def summary(self) -> str:
+        def rate(decision: str) -> str:
+            n = self.compared[decision]
+            return f"{self.agreed[decision] / n:.0%} of {n}" if n else "n/a"
+
+        return (
+            f"accepted={self.accepted} rejected={self.rejected} unsure={self.unsure} "
+            f"screen_failed={self.failed} agreement: accept={rate(ACCEPT)} "
+            f"reject={rate(REJECT)} unsure={rate(UNSURE)}"
+        )
+
+
+class Cascade:
+    """Turns a screening verdict into accept, reject or unsure, and tracks how that went.
+
+    Confident verdicts are final, except for an `audit_rate` sample that is also sent to the
+    quality model so agreement can be measured for the confident tiers too.
+    """
+
+    def __init__(self, accept_confidence: int, reject_confidence: int, audit_rate: float = 0.0) -> None:
+        self.accept_confidence = accept_confidence
+        self.reject_confidence = reject_confidence
+        self.audit_rate = audit_rate
+        self.stats = CascadeStats()
+
+    def decide(self, screening: Screening | None) -> str:
+        if screening is None:
+            self.stats.failed += 1
+            return UNSURE
+        if screening.passed and screening.confidence >= self.accept_confidence:
+            self.stats.accepted += 1
+            return ACCEPT
+        if not screening.passed and screening.confidence >= self.reject_confidence:
+            self.stats.rejected += 1
+            return REJECT
+        self.stats.unsure += 1
+        return UNSURE
+
+    def escalate(self, decision: str) -> bool:
+        """Whether the quality model must see this listing."""
+        return decision == UNSURE or random.random() < self.audit_rate
+
+    def record(self, decision: str, screening: Screening | None, final_passed: bool) -> None:
+        """Compare the screening verdict with the quality model's for an escalated listing."""
+        if screening is None:
+            return
+        self.stats.compared[decision] += 1
+        if screening.passed == final_passed:
+            self.stats.agreed[decision] += 1
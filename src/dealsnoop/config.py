@@ -8,11 +8,150 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-# Path prefix for data files (searches, caches). Empty string = current directory.
-FILE_PATH: str = os.getenv("FILE_PATH") or ""
-
 # Discord guild ID for slash command registration.
 GUILD_ID: int = 1411757356894650381
 
 # Default channel ID when none provided in /watch command.
 DEFAULT_CHANNEL_ID: int = 1412121636815241397
+
+# Number of headless Chrome instances kept in the engine's browser pool.
+BROWSER_POOL_SIZE: int = max(1, int(os.getenv("BROWSER_POOL_SIZE") or 3))
+
+# Maximum number of watches searched concurrently (defaults to the browser pool size).
+SEARCH_CONCURRENCY: int = max(1, int(os.getenv("SEARCH_CONCURRENCY") or BROWSER_POOL_SIZE))
+
+# How search and detail pages are read from the browser:
+#   "payload" - transfer page_source and parse the embedded JSON payload (anchor scrape fallback)
+#   "script"  - run an in-page script that returns only listing anchors / date + description
+#   "network" - build cards from the document and GraphQL responses captured via CDP (no render wait)
+FB_EXTRACT_MODE: str = (os.getenv("FB_EXTRACT_MODE") or "payload").strip().lower()
+
+# Seconds to wait for search results / location text / a listing's description to render
+# before reading the page anyway, and how often readiness is polled.
+PAGE_READY_TIMEOUT: float = float(os.getenv("PAGE_READY_TIMEOUT") or 10)
+DETAIL_READY_TIMEOUT: float = float(os.getenv("DETAIL_READY_TIMEOUT") or 8)
+READY_POLL_SECONDS: float = float(os.getenv("READY_POLL_SECONDS") or 0.2)
+
+# Per-search listing pipeline (filter -> detail -> evaluate -> notify): workers per stage and
+# how many listings may wait between two stages before the earlier stage blocks.
+PIPELINE_QUEUE_SIZE: int = max(1, int(os.getenv("PIPELINE_QUEUE_SIZE") or 8))
+PIPELINE_FILTER_CONCURRENCY: int = max(1, int(os.getenv("PIPELINE_FILTER_CONCURRENCY") or 4))
+PIPELINE_DETAIL_CONCURRENCY: int = max(1, int(os.getenv("PIPELINE_DETAIL_CONCURRENCY") or BROWSER_POOL_SIZE))
+PIPELINE_LLM_CONCURRENCY: int = max(1, int(os.getenv("PIPELINE_LLM_CONCURRENCY") or 4))
+PIPELINE_NOTIFY_CONCURRENCY: int = max(1, int(os.getenv("PIPELINE_NOTIFY_CONCURRENCY") or 1))
+
+# Incremental scanning for creation_time_descend: stop reading a term's results once this many
+# consecutive listings are already in the listing cache (everything below them is older).
+INCREMENTAL_SCAN: bool = (os.getenv("INCREMENTAL_SCAN") or "on").strip().lower() not in ("0", "false", "no", "off")
+INCREMENTAL_STOP_AFTER_HITS: int = max(1, int(os.getenv("INCREMENTAL_STOP_AFTER_HITS") or 1))
+
+# Adaptive watch scheduling: how often due watches are checked, the bounds on each watch's
+# polling interval (minutes), the interval new watches start at, and how many new listings
+# a run should find on average (a faster-moving watch gets a shorter interval). When a watch is
+# due, idle watches sharing a results page with it run early if their remaining wait is at most
+# WATCH_ALIGN_FRACTION of their interval (0 disables), so they can share that page.
+SCHEDULER_TICK_SECONDS: float = float(os.getenv("SCHEDULER_TICK_SECONDS") or 30)
+WATCH_MIN_INTERVAL_MINUTES: float = float(os.getenv("WATCH_MIN_INTERVAL_MINUTES") or 2)
+WATCH_MAX_INTERVAL_MINUTES: float = float(os.getenv("WATCH_MAX_INTERVAL_MINUTES") or 30)
+WATCH_BASE_INTERVAL_MINUTES: float = float(os.getenv("WATCH_BASE_INTERVAL_MINUTES") or 5)
+WATCH_TARGET_NEW_LISTINGS: float = float(os.getenv("WATCH_TARGET_NEW_LISTINGS") or 2)
+WATCH_ALIGN_FRACTION: float = min(1.0, max(0.0, float(os.getenv("WATCH_ALIGN_FRACTION") or 0.25)))
+
+# Minutes between logged cache, cascade and page-latency reports; latency histograms cover
+# exactly this window and start fresh after each report.
+METRICS_REPORT_MINUTES: float = max(1.0, float(os.getenv("METRICS_REPORT_MINUTES") or 15))
+
+# PostgreSQL connection pool of each AsyncSearchStore (one per process): connections kept open,
+# upper bound, seconds to wait for a free connection, seconds before an idle extra connection
+# is closed, and whether a connection is checked (empty query) before being handed out.
+DB_POOL_MIN_SIZE: int = max(1, int(os.getenv("DB_POOL_MIN_SIZE") or 2))
+DB_POOL_MAX_SIZE: int = max(DB_POOL_MIN_SIZE, int(os.getenv("DB_POOL_MAX_SIZE") or 10))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT") or 30)
+DB_POOL_MAX_IDLE: float = float(os.getenv("DB_POOL_MAX_IDLE") or 600)
+DB_POOL_CHECK: bool = (os.getenv("DB_POOL_CHECK") or "on").strip().lower() not in ("0", "false", "no", "off")
+
+# listing_cache is partitioned by UTC day; expired days are dropped every LISTING_CACHE_FLUSH_HOURS,
+# and partitions are created this many days ahead at startup and after every flush.
+LISTING_CACHE_FLUSH_HOURS: float = float(os.getenv("LISTING_CACHE_FLUSH_HOURS") or 1)
+LISTING_CACHE_PARTITIONS_AHEAD: int = max(1, int(os.getenv("LISTING_CACHE_PARTITIONS_AHEAD") or 7))
+
+# In-process front cache for listing_cache lookups: a Bloom filter sized for this many ids
+# (grown to fit the table when it is loaded) and an LRU of this many confirmed hits.
+LISTING_FRONT_CACHE: bool = (os.getenv("LISTING_FRONT_CACHE") or "on").strip().lower() not in ("0", "false", "no", "off")
+LISTING_BLOOM_CAPACITY: int = max(1, int(os.getenv("LISTING_BLOOM_CAPACITY") or 200_000))
+LISTING_LRU_SIZE: int = max(1, int(os.getenv("LISTING_LRU_SIZE") or 20_000))
+
+# Write-behind for listings, listing_messages, listing_metadata and listing_cache upserts in the
+# bot's store: queued rows are written in one transaction once this many are pending or the
+# oldest has waited this many seconds (0 writes each row immediately, as before).
+WRITE_BEHIND_MAX_ROWS: int = max(1, int(os.getenv("WRITE_BEHIND_MAX_ROWS") or 200))
+WRITE_BEHIND_MAX_DELAY: float = max(0.0, float(os.getenv("WRITE_BEHIND_MAX_DELAY") or 2))
+
+# Serve searches and bot_config from memory in the bot, invalidated by Postgres LISTEN/NOTIFY,
+# and how long to wait before reconnecting a dropped LISTEN connection (reads hit the database
+# meanwhile).
+CONFIG_CACHE: bool = (os.getenv("CONFIG_CACHE") or "on").strip().lower() not in ("0", "false", "no", "off")
+CONFIG_LISTEN_RETRY_SECONDS: float = float(os.getenv("CONFIG_LISTEN_RETRY_SECONDS") or 5)
+
+# Retention for listings, listing_messages and listing_metadata: rows older than the given days
+# are deleted (0 keeps them forever) every RETENTION_INTERVAL_HOURS, at most RETENTION_BATCH_SIZE
+# rows per transaction with RETENTION_BATCH_PAUSE seconds between batches. With
+# RETENTION_ARCHIVE_DIR set, deleted rows are first appended to gzipped JSONL files there.
+RETENTION_LISTINGS_DAYS: int = max(0, int(os.getenv("RETENTION_LISTINGS_DAYS") or 90))
+RETENTION_LISTING_MESSAGES_DAYS: int = max(0, int(os.getenv("RETENTION_LISTING_MESSAGES_DAYS") or 90))
+RETENTION_LISTING_METADATA_DAYS: int = max(0, int(os.getenv("RETENTION_LISTING_METADATA_DAYS") or 30))
+RETENTION_INTERVAL_HOURS: float = float(os.getenv("RETENTION_INTERVAL_HOURS") or 6)
+RETENTION_BATCH_SIZE: int = max(1, int(os.getenv("RETENTION_BATCH_SIZE") or 500))
+RETENTION_BATCH_PAUSE: float = float(os.getenv("RETENTION_BATCH_PAUSE") or 0.1)
+RETENTION_ARCHIVE_DIR: str = os.getenv("RETENTION_ARCHIVE_DIR") or ""
+
+# Persistent cache of listing quality verdicts (llm_verdicts), keyed on the listing text, price,
+# watch criteria, model and prompt version: entries older than LLM_CACHE_TTL_DAYS are ignored
+# and removed by the retention job. LLM_CACHE_WARM seeds it from kept listings on first use.
+LLM_CACHE: bool = (os.getenv("LLM_CACHE") or "on").strip().lower() not in ("0", "false", "no", "off")
+LLM_CACHE_TTL_DAYS: int = max(1, int(os.getenv("LLM_CACHE_TTL_DAYS") or 14))
+LLM_CACHE_WARM: bool = (os.getenv("LLM_CACHE_WARM") or "off").strip().lower() not in ("0", "false", "no", "off")
+
+# Quality checks for one watch are sent to the LLM in batches of up to LLM_BATCH_SIZE listings
+# (1 sends each listing on its own); a partial batch is sent LLM_BATCH_WAIT seconds after its
+# first listing arrived. PIPELINE_LLM_CONCURRENCY then counts batched requests.
+LLM_BATCH_SIZE: int = max(1, int(os.getenv("LLM_BATCH_SIZE") or 5))
+LLM_BATCH_WAIT: float = float(os.getenv("LLM_BATCH_WAIT") or 1.5)
+
+# OpenAI requests from every watch share one limiter: at most LLM_MAX_IN_FLIGHT requests at
+# once and LLM_REQUESTS_PER_MINUTE started per rolling minute (0 = no rate limit). Each request
+# times out after LLM_TIMEOUT seconds; timeouts, 429s and 5xx responses are retried up to
+# LLM_MAX_RETRIES times with backoff by the client.
+LLM_MAX_IN_FLIGHT: int = max(1, int(os.getenv("LLM_MAX_IN_FLIGHT") or 8))
+LLM_REQUESTS_PER_MINUTE: int = max(0, int(os.getenv("LLM_REQUESTS_PER_MINUTE") or 0))
+LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT") or 60)
+LLM_MAX_RETRIES: int = max(0, int(os.getenv("LLM_MAX_RETRIES") or 3))
+
+# Model cascade for quality checks: LLM_CASCADE_MODEL screens each listing first and reports a
+# verdict with a 0-100 confidence. Accepts at or above LLM_CASCADE_ACCEPT_CONFIDENCE and rejects
+# at or above LLM_CASCADE_REJECT_CONFIDENCE are final; everything else goes to the quality model.
+# LLM_CASCADE_AUDIT_RATE of the confident verdicts are checked by the quality model anyway, so
+# the logged agreement rates show whether the thresholds can be loosened or must be tightened.
+LLM_CASCADE: bool = (os.getenv("LLM_CASCADE") or "on").strip().lower() not in ("0", "false", "no", "off")
+LLM_CASCADE_MODEL: str = os.getenv("LLM_CASCADE_MODEL") or "gpt-4o-mini"
+LLM_CASCADE_ACCEPT_CONFIDENCE: int = int(os.getenv("LLM_CASCADE_ACCEPT_CONFIDENCE") or 95)
+LLM_CASCADE_REJECT_CONFIDENCE: int = int(os.getenv("LLM_CASCADE_REJECT_CONFIDENCE") or 85)
+LLM_CASCADE_AUDIT_RATE: float = min(1.0, max(0.0, float(os.getenv("LLM_CASCADE_AUDIT_RATE") or 0.05)))
+
+# Rule-based pre-filter, applied to each new listing card before its detail page is loaded or
+# the LLM sees it. PREFILTER_EXCLUDE_TERMS are comma-separated title keywords that reject a
+# listing for every watch (set it empty to disable them; watches add their own exclude_terms).
+# A price above PREFILTER_MAX_PRICE_RATIO x target_price is rejected (0 disables; a watch's
+# max_price_ratio overrides it). PREFILTER_TERM_OVERLAP rejects titles sharing no word with
+# any of the watch's terms; it is off by default because brand or model titles ("Steelcase
+# Leap v2" for "office chair") rarely repeat the search words.
+PREFILTER: bool = (os.getenv("PREFILTER") or "on").strip().lower() not in ("0", "false", "no", "off")
+PREFILTER_EXCLUDE_TERMS: tuple[str, ...] = tuple(
+    term.strip()
+    for term in os.getenv(
+        "PREFILTER_EXCLUDE_TERMS", "ISO,WTB,in search of,want to buy,parts only,for parts,broken"
+    ).split(",")
+    if term.strip()
+)
+PREFILTER_MAX_PRICE_RATIO: float = max(0.0, float(os.getenv("PREFILTER_MAX_PRICE_RATIO") or 3))
+PREFILTER_TERM_OVERLAP: bool = (os.getenv("PREFILTER_TERM_OVERLAP") or "off").strip().lower() not in ("0", "false", "no", "off")
@@ -1,28 +1,54 @@
 """Browser, cache, and OpenAI client setup."""
 
+import asyncio
+import base64
+import json
 import os
+import re
+import shutil
 import subprocess
 import sys
 import tempfile
-from typing import TYPE_CHECKING
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator
 
 import chromedriver_autoinstaller
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
 
-from dealsnoop.config import FILE_PATH
-from dealsnoop.listing_cache import Cache, DbCache
+from dealsnoop.config import (
+    LISTING_BLOOM_CAPACITY,
+    LISTING_FRONT_CACHE,
+    LISTING_LRU_SIZE,
+    LLM_MAX_IN_FLIGHT,
+    LLM_MAX_RETRIES,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TIMEOUT,
+)
+from dealsnoop.front_cache import FrontCache
+from dealsnoop.listing_cache import DbCache
+from dealsnoop.logger import logger
 
 if TYPE_CHECKING:
-    from dealsnoop.store import SearchStore
+    from dealsnoop.async_store import AsyncSearchStore
 
-options = Options()
-options.add_argument("--headless=new")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-options.add_argument("--disable-gpu")
-options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
+
+def _chrome_options(profile_dir: str, capture_network: bool = False) -> Options:
+    """Build Chrome options. Each browser gets its own profile dir so instances can run side by side."""
+    options = Options()
+    if capture_network:
+        # Network.* CDP events are delivered through the performance log.
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    return options
 
 
 def install_chromedriver():
@@ -39,17 +65,121 @@ install_chromedriver()
 
 API_KEY = os.getenv("OPENAI_KEY")
 _chatgpt: OpenAI | None = None
-
-
-def get_browser() -> webdriver.Chrome:
-    return webdriver.Chrome(options=options)
-
-
-def get_cache(name: str, store: "SearchStore | None" = None) -> Cache | DbCache:
-    """Return a cache. If store is provided, returns DB-backed DbCache; else file-based Cache."""
-    if store is not None:
-        return DbCache(store, name)
-    return Cache(f"{FILE_PATH}{name}_cache.txt")
+_async_chatgpt: AsyncOpenAI | None = None
+_llm_limiter: "RequestLimiter | None" = None
+_profile_dirs: dict[webdriver.Chrome, str] = {}
+
+
+def get_browser(capture_network: bool = False) -> webdriver.Chrome:
+    """Start Chrome in a fresh profile dir. Stop it with quit_browser so the dir is removed."""
+    profile_dir = tempfile.mkdtemp(prefix="dealsnoop-chrome-")
+    try:
+        browser = webdriver.Chrome(options=_chrome_options(profile_dir, capture_network))
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    _profile_dirs[browser] = profile_dir
+    if capture_network:
+        browser.execute_cdp_cmd("Network.enable", {})
+    return browser
+
+
+def quit_browser(browser: webdriver.Chrome) -> None:
+    """Quit a browser from get_browser and delete its profile dir, even if quitting fails."""
+    try:
+        browser.quit()
+    except Exception:
+        pass
+    finally:
+        profile_dir = _profile_dirs.pop(browser, None)
+        if profile_dir is not None:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def collect_network_responses(browser: webdriver.Chrome, url_pattern: re.Pattern[str]) -> list[str]:
+    """Drain the performance log and return bodies of responses received since the last drain.
+
+    Only the top-level document and responses whose URL matches `url_pattern` are fetched
+    (via CDP Network.getResponseBody). Requires a browser started with capture_network=True.
+    """
+    bodies: list[str] = []
+    for entry in browser.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, json.JSONDecodeError):
+            continue
+        if message.get("method") != "Network.responseReceived":
+            continue
+        params = message.get("params") or {}
+        response_url = (params.get("response") or {}).get("url", "")
+        if params.get("type") != "Document" and not url_pattern.search(response_url):
+            continue
+        try:
+            result = browser.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": params["requestId"]}
+            )
+        except (KeyError, WebDriverException):
+            continue
+        body = result.get("body") or ""
+        if result.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", errors="replace")
+        bodies.append(body)
+    return bodies
+
+
+class BrowserPool:
+    """Bounded pool of headless Chrome instances with lease/return semantics.
+
+    Browsers are started lazily, at most `size` at a time; callers beyond that wait for
+    a lease to be returned. A browser whose lease ended in any exception, cancellation included,
+    is discarded and replaced on demand. `close` quits them all.
+    """
+
+    def __init__(self, size: int, capture_network: bool = False) -> None:
+        self.size = max(1, size)
+        self._capture_network = capture_network
+        self._slots = asyncio.Semaphore(self.size)
+        self._idle: list[webdriver.Chrome] = []
+        self._closed = False
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[webdriver.Chrome]:
+        """Lease a browser for the duration of the block, returning it to the pool afterwards."""
+        async with self._slots:
+            if self._idle:
+                browser = self._idle.pop()
+            else:
+                browser = await asyncio.to_thread(get_browser, self._capture_network)
+                logger.info(f"Started pooled browser (pool size {self.size})")
+            failure: BaseException | None = None
+            try:
+                yield browser
+            except BaseException as e:
+                # The session may be dead, or a worker thread may still be driving it (e.g. a
+                # cancelled to_thread(browser.get)); never hand it to the next caller.
+                failure = e
+                raise
+            finally:
+                if failure is None and not self._closed:
+                    self._idle.append(browser)
+                else:
+                    await asyncio.to_thread(quit_browser, browser)
+                    if failure is not None:
+                        logger.warning(
+                            f"Discarded browser after {type(failure).__name__}; a new one will be started on demand"
+                        )
+
+    async def close(self) -> None:
+        """Quit every idle browser; browsers still leased are quit when they are returned."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(asyncio.to_thread(quit_browser, browser) for browser in idle))
+
+
+def get_cache(name: str, store: "AsyncSearchStore") -> DbCache:
+    """Return the DB-backed listing cache for an engine, fronted by a FrontCache if enabled."""
+    front = FrontCache(LISTING_BLOOM_CAPACITY, LISTING_LRU_SIZE) if LISTING_FRONT_CACHE else None
+    return DbCache(store, name, front=front)
 
 
 def get_chatgpt() -> OpenAI:
@@ -58,4 +188,61 @@ def get_chatgpt() -> OpenAI:
         if not API_KEY:
             raise ValueError("OPENAI_KEY environment variable is required.")
         _chatgpt = OpenAI(api_key=API_KEY)
-    return _chatgpt
\ No newline at end of file
+    return _chatgpt
+
+
+def get_async_chatgpt() -> AsyncOpenAI:
+    """Shared async client; retries timeouts, 429s and 5xx responses with backoff."""
+    global _async_chatgpt
+    if _async_chatgpt is None:
+        if not API_KEY:
+            raise ValueError("OPENAI_KEY environment variable is required.")
+        _async_chatgpt = AsyncOpenAI(api_key=API_KEY, timeout=LLM_TIMEOUT, max_retries=LLM_MAX_RETRIES)
+    return _async_chatgpt
+
+
+class RequestLimiter:
+    """Caps concurrent requests and, if `per_minute` > 0, requests started per rolling minute.
+
+    Use as `async with limiter:` around each request. Callers over either limit wait their turn.
+    """
+
+    def __init__(self, concurrency: int, per_minute: int = 0) -> None:
+        self.concurrency = max(1, concurrency)
+        self.per_minute = max(0, per_minute)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._started: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def _wait_for_rate(self) -> None:
+        if not self.per_minute:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._started and now - self._started[0] >= 60:
+                    self._started.popleft()
+                if len(self._started) < self.per_minute:
+                    self._started.append(now)
+                    return
+                await asyncio.sleep(60 - (now - self._started[0]))
+
+    async def __aenter__(self) -> "RequestLimiter":
+        await self._slots.acquire()
+        try:
+            await self._wait_for_rate()
+        except BaseException:
+            self._slots.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._slots.release()
+
+
+def get_llm_limiter() -> RequestLimiter:
+    """The process-wide limiter every OpenAI request goes through."""
+    global _llm_limiter
+    if _llm_limiter is None:
+        _llm_limiter = RequestLimiter(LLM_MAX_IN_FLIGHT, LLM_REQUESTS_PER_MINUTE)
+    return _llm_limiter
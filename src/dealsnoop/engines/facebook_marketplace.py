@@ -1,28 +1,180 @@
 """Facebook Marketplace search engine using Selenium and BeautifulSoup."""
 
 import asyncio
-from dataclasses import replace
+from dataclasses import dataclass, replace
 import os
-import random
 import re
+import time
 from datetime import datetime
 from pathlib import Path
 
-from bs4 import BeautifulSoup, Tag  # type: ignore[import-untyped]
+from bs4 import BeautifulSoup  # type: ignore[import-untyped]
+from openai import OpenAIError
 from discord.ext import tasks  # type: ignore[import-untyped]
-from selenium.common.exceptions import NoSuchElementException  # type: ignore[import-untyped]
+from selenium.common.exceptions import TimeoutException, WebDriverException  # type: ignore[import-untyped]
 from selenium.webdriver.common.by import By  # type: ignore[import-untyped]
+from selenium.webdriver.remote.webdriver import WebDriver  # type: ignore[import-untyped]
+from selenium.webdriver.support.ui import WebDriverWait  # type: ignore[import-untyped]
 
 from dealsnoop.bot.embeds import product_embed, _format_highlights
-from dealsnoop.engines.base import get_browser, get_cache, get_chatgpt
+from dealsnoop.cascade import Cascade, Screening, parse_screening
+from dealsnoop.config import (
+    BROWSER_POOL_SIZE,
+    DETAIL_READY_TIMEOUT,
+    FB_EXTRACT_MODE,
+    INCREMENTAL_SCAN,
+    INCREMENTAL_STOP_AFTER_HITS,
+    LLM_BATCH_SIZE,
+    LLM_BATCH_WAIT,
+    LLM_CACHE,
+    LLM_CACHE_TTL_DAYS,
+    LLM_CACHE_WARM,
+    LLM_CASCADE,
+    LLM_CASCADE_ACCEPT_CONFIDENCE,
+    LLM_CASCADE_AUDIT_RATE,
+    LLM_CASCADE_MODEL,
+    LLM_CASCADE_REJECT_CONFIDENCE,
+    METRICS_REPORT_MINUTES,
+    PAGE_READY_TIMEOUT,
+    PIPELINE_DETAIL_CONCURRENCY,
+    PIPELINE_FILTER_CONCURRENCY,
+    PIPELINE_LLM_CONCURRENCY,
+    PIPELINE_NOTIFY_CONCURRENCY,
+    PIPELINE_QUEUE_SIZE,
+    PREFILTER,
+    PREFILTER_EXCLUDE_TERMS,
+    PREFILTER_MAX_PRICE_RATIO,
+    PREFILTER_TERM_OVERLAP,
+    READY_POLL_SECONDS,
+    SCHEDULER_TICK_SECONDS,
+    SEARCH_CONCURRENCY,
+    WATCH_ALIGN_FRACTION,
+    WATCH_BASE_INTERVAL_MINUTES,
+    WATCH_MAX_INTERVAL_MINUTES,
+    WATCH_MIN_INTERVAL_MINUTES,
+    WATCH_TARGET_NEW_LISTINGS,
+)
+from dealsnoop.engines.base import (
+    BrowserPool,
+    collect_network_responses,
+    get_async_chatgpt,
+    get_cache,
+    get_llm_limiter,
+)
+from dealsnoop.marketplace_parsing import (
+    cards_from_network_responses,
+    cards_from_script_result,
+    extract_cards_from_anchors,
+    extract_cards_from_payload,
+    parse_detail_script_result,
+    save_recorded_responses,
+)
 from dealsnoop.exceptions import LocationResolutionError
 from dealsnoop.search_config import build_watch_command
 from dealsnoop.listing_log import SearchLogCollector
 from dealsnoop.logger import logger
 from dealsnoop.maps import get_distance_and_duration
-from dealsnoop.product import Product
+from dealsnoop.metrics import latency_report, observe_latency
+from dealsnoop.pipeline import MicroBatcher, Stage, run_pipeline
+from dealsnoop.prefilter import PreFilter, compile_prefilter
+from dealsnoop.query_plan import PageMemo, PageQuery, page_query, plan_queries
+from dealsnoop.scheduler import WatchScheduler
+from dealsnoop.product import ListingCard, Product
 from dealsnoop.search_config import SearchConfig
 from dealsnoop.snoop import Snoop
+from dealsnoop.verdict_cache import Verdict, VerdictCache
+
+# Model used by validate_quality. Bump QUALITY_PROMPT_VERSION whenever its prompt changes so
+# cached verdicts from the old prompt are no longer used.
+QUALITY_MODEL = "gpt-5.1"
+QUALITY_PROMPT_VERSION = 1
+
+# Marketplace search results are fetched through this endpoint after the initial document.
+_GRAPHQL_URL_PATTERN = re.compile(r"/api/graphql/?")
+
+# Sort orders searched for every watch; newest-first goes first so its listings win the merge.
+SEARCH_SORTS: tuple[str, ...] = ("creation_time_descend", "best_match")
+
+# Class list of the detail-page container that holds the seller's description.
+DESCRIPTION_CLASSES = "xz9dl7a xyri2b xsag5q8 x1c1uobl x126k92a"
+
+# In-page collectors for FB_EXTRACT_MODE=script. Text lines are gathered per text node,
+# matching BeautifulSoup's stripped_strings, so the anchor heuristics stay the same.
+_LISTING_CARDS_SCRIPT = """
+const out = [];
+for (const a of document.querySelectorAll('a[href^="/marketplace/item/"]')) {
+    const img = a.querySelector('img');
+    if (!img || !img.hasAttribute('alt')) continue;
+    const lines = [];
+    const walker = document.createTreeWalker(a, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        const text = node.nodeValue.trim();
+        if (text) lines.push(text);
+    }
+    out.push([a.getAttribute('href'), img.getAttribute('src'), img.getAttribute('alt'), lines]);
+}
+return JSON.stringify(out);
+"""
+
+# Readiness probes polled by _wait_until instead of fixed sleeps. Search results count as ready
+# once listing anchors are rendered or the preloaded search payload is in the document.
+_ANCHORS_READY_SCRIPT = """
+return !!document.querySelector('a[href^="/marketplace/item/"]');
+"""
+
+_RESULTS_READY_SCRIPT = """
+return !!document.querySelector('a[href^="/marketplace/item/"]')
+    || Array.from(document.querySelectorAll('script[data-sjs]'))
+        .some(s => s.textContent.includes('marketplace_search'));
+"""
+
+_LOCATION_READY_SCRIPT = """
+return Array.from(document.querySelectorAll('span[dir="auto"]'))
+    .some(s => /Within|miles of|km of/i.test(s.textContent));
+"""
+
+_DETAIL_READY_SCRIPT = """
+return !!document.querySelector("div.xz9dl7a.xyri2b.xsag5q8.x1c1uobl.x126k92a span[dir='auto']")
+    || !!document.querySelector('abbr');
+"""
+
+_DETAIL_SCRIPT = """
+const abbr = document.querySelector('abbr');
+const desc = document.querySelector("div.xz9dl7a.xyri2b.xsag5q8.x1c1uobl.x126k92a span[dir='auto']");
+return JSON.stringify([abbr ? abbr.textContent : null, desc ? desc.textContent : null]);
+"""
+
+
+def _quality_criteria(terms: tuple[str, ...], target_price: str, context: str | None) -> str:
+    """Evaluation criteria shared by the single-listing and batched quality prompts."""
+    return f"""Criteria:
+- The listing must actually be selling '{terms}', not an ISO/WTB post, parts-only, or unrelated item.
+- The listing must appear to be a real, usable item — not a scam or broken/for-parts (unless '{context}' says otherwise).
+- Price must be at or below ${target_price}. Only allow higher if the item is a genuinely strong deal. 
+
+The user defined this context, please use it in your evaluation: '{context}'"""
+
+
+@dataclass
+class _Candidate:
+    """A listing moving through the perform_search pipeline, filled in stage by stage."""
+
+    card: ListingCard
+    distance: float
+    duration: str
+    date: str = ""
+    description: str = ""
+    thought_trace: str = ""
+    strengths_summary: str = ""
+    format_warning: str | None = None
+
+
+@dataclass
+class _ResultsPage:
+    """One fetched results page, shared by every watch that asked for it."""
+
+    cards: list[ListingCard]
+    html: str | None
 
 
 class FacebookEngine:
@@ -30,50 +182,99 @@ class FacebookEngine:
 
     def __init__(self, snoop):
         self.snoop = snoop
-        self.browser = get_browser()
+        self.browsers = BrowserPool(
+            BROWSER_POOL_SIZE, capture_network=FB_EXTRACT_MODE == "network"
+        )
         self.cache = get_cache("facebook", snoop.searches)
-        self.chatgpt = get_chatgpt()
-
+        self.chatgpt = get_async_chatgpt()
+        self.llm_limit = get_llm_limiter()
+        self.cascade = (
+            Cascade(LLM_CASCADE_ACCEPT_CONFIDENCE, LLM_CASCADE_REJECT_CONFIDENCE, LLM_CASCADE_AUDIT_RATE)
+            if LLM_CASCADE
+            else None
+        )
+        # Cascade verdicts are cached apart from the quality model's own.
+        verdict_model = f"{LLM_CASCADE_MODEL}>{QUALITY_MODEL}" if LLM_CASCADE else QUALITY_MODEL
+        self.verdicts = (
+            VerdictCache(
+                snoop.searches, LLM_CACHE_TTL_DAYS, verdict_model, QUALITY_PROMPT_VERSION, warm=LLM_CACHE_WARM
+            )
+            if LLM_CACHE
+            else None
+        )
+        self.scheduler = WatchScheduler(
+            min_interval=WATCH_MIN_INTERVAL_MINUTES * 60,
+            max_interval=WATCH_MAX_INTERVAL_MINUTES * 60,
+            base_interval=WATCH_BASE_INTERVAL_MINUTES * 60,
+            target_new=WATCH_TARGET_NEW_LISTINGS,
+            align_fraction=WATCH_ALIGN_FRACTION,
+        )
+        self._search_limit = asyncio.Semaphore(SEARCH_CONCURRENCY)
+        self._watch_tasks: set[asyncio.Task[None]] = set()
+        self._last_report = time.monotonic()
 
-    async def get_product_info(self, url: str) -> tuple[str, str]:
-        await asyncio.to_thread(self.browser.get, url)
 
-        await asyncio.sleep(1)
+    async def _wait_until(self, browser: WebDriver, script: str, timeout: float) -> bool:
+        """Poll `script` in the page until it returns truthy. Returns False on timeout."""
+        wait = WebDriverWait(browser, timeout, poll_frequency=READY_POLL_SECONDS)
         try:
-            close_button = await asyncio.to_thread(self.browser.find_element, By.XPATH, '//div[@aria-label="Close" and @role="button"]')
-            await asyncio.to_thread(close_button.click)
-            logger.info("Close button clicked")
-        
-        except Exception:
-            logger.warning("Could not find or click the close button")
+            await asyncio.to_thread(wait.until, lambda driver: driver.execute_script(script))
+            return True
+        except TimeoutException:
+            return False
 
-        try:
-            await asyncio.sleep(2)
-            see_more = await asyncio.to_thread(self.browser.find_element, By.CSS_SELECTOR, "div[role='button'].x1i10hfl.xjbqb8w.x1ejq31n.x18oe1m7.x1sy0etr")
-            await asyncio.to_thread(see_more.click)
-        except NoSuchElementException:
-            logger.warning("No 'See More' button found, skipping..")
+    async def get_product_info(self, url: str) -> tuple[str, str]:
+        raw: object = None
+        html = ""
+        async with self.browsers.lease() as browser:
+            started = time.monotonic()
+            await asyncio.to_thread(browser.get, url)
+            if not await self._wait_until(browser, _DETAIL_READY_SCRIPT, DETAIL_READY_TIMEOUT):
+                logger.warning(f"Detail page not ready after {DETAIL_READY_TIMEOUT:g}s: {url}")
+            observe_latency("detail", time.monotonic() - started)
 
-        html = self.browser.page_source
+            close_buttons = await asyncio.to_thread(browser.find_elements, By.XPATH, '//div[@aria-label="Close" and @role="button"]')
+            if close_buttons:
+                try:
+                    await asyncio.to_thread(close_buttons[0].click)
+                    logger.info("Close button clicked")
+                except WebDriverException:
+                    logger.warning("Could not click the close button")
 
-        soup = await asyncio.to_thread(BeautifulSoup, html, "html.parser")
+            see_more = await asyncio.to_thread(browser.find_elements, By.CSS_SELECTOR, "div[role='button'].x1i10hfl.xjbqb8w.x1ejq31n.x18oe1m7.x1sy0etr")
+            if see_more:
+                try:
+                    await asyncio.to_thread(see_more[0].click)
+                except WebDriverException:
+                    logger.warning("Could not click the 'See More' button")
+            else:
+                logger.warning("No 'See More' button found, skipping..")
+
+            if FB_EXTRACT_MODE == "script":
+                raw = await asyncio.to_thread(browser.execute_script, _DETAIL_SCRIPT)
+            else:
+                html = await asyncio.to_thread(lambda: browser.page_source)
+            if FB_EXTRACT_MODE == "network":
+                # Keep the performance log from growing between search page captures.
+                await asyncio.to_thread(browser.get_log, "performance")
 
-        date = soup.find("abbr")
-        if date:
-            date = date.text
+        if FB_EXTRACT_MODE == "script":
+            date, description = parse_detail_script_result(raw)
         else:
-            date = "Last 24h"
+            soup = await asyncio.to_thread(BeautifulSoup, html, "html.parser")
+            abbr = soup.find("abbr")
+            date = abbr.text if abbr else None
+            try:
+                description = soup.find('div', class_=DESCRIPTION_CLASSES).find('span', attrs={"dir": "auto"}).text # type: ignore
+            except AttributeError:
+                description = None
+
+        date = date or "Last 24h"
         logger.info(f"Date set to '{date}'")
 
-        
-        await asyncio.sleep(2)
-        try:
-            description = soup.find('div', class_='xz9dl7a xyri2b xsag5q8 x1c1uobl x126k92a').find('span', attrs={"dir": "auto"}).text # type: ignore
-        except AttributeError as e:
+        if not description:
             description = "No Description."
             logger.warning("No description found.")
-            logger.error(e)
-
 
         return (date, description)
 
@@ -122,14 +323,14 @@ Now extract the location from this text (return only the location, nothing else)
 
 """
         for s in candidate_strings[:5]:
-            response = await asyncio.to_thread(
-                self.chatgpt.chat.completions.create,
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "user", "content": prompt + s},
-                ],
-                max_tokens=50,
-            )
+            async with self.llm_limit:
+                response = await self.chatgpt.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "user", "content": prompt + s},
+                    ],
+                    max_tokens=50,
+                )
             text = (response.choices[0].message.content or "").strip()
             if text and self._is_plausible_location(text):
                 return text
@@ -226,35 +427,104 @@ Now extract the location from this text (return only the location, nothing else)
         )
 
     async def gather_listings(
-        self, search: SearchConfig, sort: str
-    ) -> tuple[list[tuple[Tag, str]], str]:
-        """Return (list of (link, search_term), origin). Each link is tagged with the exact term searched."""
-        listings: list[tuple[Tag, str]] = []
+        self,
+        search: SearchConfig,
+        sort: str,
+        pages: PageMemo[_ResultsPage] | None = None,
+    ) -> tuple[list[ListingCard], str]:
+        """Return (listing cards, origin). Each card is tagged with the watch's own term.
+
+        With `pages`, results pages are shared with every other watch that needs the same
+        (term, city, radius, days listed, sort) page this tick; otherwise they are fetched here.
+        """
+        cards: list[ListingCard] = []
+        stored = search.location_name or await self.snoop.searches.get_location_name(search.city_code)
         origin: str | None = None
+        if stored and self._is_plausible_location(stored.strip()):
+            origin = stored.strip()
         for term in search.terms:
-            url = f'https://www.facebook.com/marketplace/{search.city_code}/search?query={term}&sortBy={sort}&daysSinceListed={search.days_listed}&exact=false&radius_in_km={search.radius}'
-            await asyncio.to_thread(self.browser.get, url)
-            await asyncio.sleep(3)  # Allow JS to render (marketplace listings load dynamically)
-            html = await asyncio.to_thread(lambda: self.browser.page_source)
-            soup = await asyncio.to_thread(BeautifulSoup, html, "html.parser")
-            if origin is None:
-                stored = search.location_name or self.snoop.searches.get_location_name(
-                    search.city_code
+            query = page_query(search, term, sort)
+            page = await (pages.get(query) if pages is not None else self._fetch_results_page(query))
+            cards.extend(
+                card if card.search_term == term else replace(card, search_term=term)
+                for card in page.cards
+            )
+            if origin is None and page.html is not None:
+                soup = await asyncio.to_thread(BeautifulSoup, page.html, "html.parser")
+                origin = await self._extract_page_location(
+                    soup, search.city_code, fallback=stored, page_html=page.html
                 )
-                if stored and self._is_plausible_location(stored.strip()):
-                    origin = stored.strip()
-                else:
-                    origin = await self._extract_page_location(
-                        soup, search.city_code, fallback=stored, page_html=html
-                    )
-            for link in soup.find_all('a'):
-                listings.append((link, term))
-            await asyncio.sleep(1)
         if origin is None:
             raise LocationResolutionError(
                 f"Could not resolve location from Marketplace page for city code {search.city_code}"
             )
-        return (listings, origin)
+        return (cards, origin)
+
+    async def _fetch_results_page(self, query: PageQuery) -> _ResultsPage:
+        """Load one results page and extract its listing cards.
+
+        In "network" mode the cards are built from the search document and GraphQL responses
+        captured over CDP, with no render wait. In "script" mode the cards are collected in-page
+        and only a compact JSON array crosses the WebDriver wire. Otherwise cards come from the
+        page's embedded JSON payload, with the BeautifulSoup anchor scrape as fallback. The page
+        HTML is only kept when the city's origin location still has to be resolved from it.
+        """
+        term = query.term
+        label = f"{query.city_code}/{query.sort}"
+        stored = await self.snoop.searches.get_location_name(query.city_code)
+        need_origin = not (stored and self._is_plausible_location(stored.strip()))
+        url = f'https://www.facebook.com/marketplace/{query.city_code}/search?query={term}&sortBy={query.sort}&daysSinceListed={query.days_listed}&exact=false&radius_in_km={query.radius}'
+        term_cards: list[ListingCard] | None = None
+        html: str | None = None
+        async with self.browsers.lease() as browser:
+            started = time.monotonic()
+            if FB_EXTRACT_MODE == "network":
+                # Drop entries from earlier pages, load, then read the captured responses.
+                await asyncio.to_thread(browser.get_log, "performance")
+                await asyncio.to_thread(browser.get, url)
+                bodies = await asyncio.to_thread(
+                    collect_network_responses, browser, _GRAPHQL_URL_PATTERN
+                )
+                self._save_network_capture(query.city_code, term, bodies)
+                term_cards = await asyncio.to_thread(cards_from_network_responses, bodies, term)
+                if not term_cards:
+                    logger.info(f"$G${label}$W$: no listings captured for '{term}', reading page")
+                    term_cards = None
+            else:
+                await asyncio.to_thread(browser.get, url)
+            if term_cards is None:
+                ready_script = (
+                    _ANCHORS_READY_SCRIPT if FB_EXTRACT_MODE == "script" else _RESULTS_READY_SCRIPT
+                )
+                if not await self._wait_until(browser, ready_script, PAGE_READY_TIMEOUT):
+                    logger.warning(
+                        f"$G${label}$W$: results for '{term}' not ready after {PAGE_READY_TIMEOUT:g}s"
+                    )
+            observe_latency("search", time.monotonic() - started)
+            if FB_EXTRACT_MODE == "script":
+                raw = await asyncio.to_thread(browser.execute_script, _LISTING_CARDS_SCRIPT)
+                term_cards = cards_from_script_result(raw, term)
+            if need_origin:
+                await self._wait_until(browser, _LOCATION_READY_SCRIPT, PAGE_READY_TIMEOUT)
+            if term_cards is None or need_origin:
+                html = await asyncio.to_thread(lambda: browser.page_source)
+        if term_cards is None and html is not None:
+            term_cards = await asyncio.to_thread(extract_cards_from_payload, html, term)
+            if not term_cards:
+                logger.info(f"$G${label}$W$: no listing payload for '{term}', scraping anchors")
+                soup = await asyncio.to_thread(BeautifulSoup, html, "html.parser")
+                term_cards = await asyncio.to_thread(extract_cards_from_anchors, soup, term)
+        return _ResultsPage(term_cards or [], html if need_origin else None)
+
+    def _save_network_capture(self, city_code: str, term: str, bodies: list[str]) -> None:
+        """Record captured responses for offline replay when DEALSNOOP_DEBUG_SAVE_NETWORK is set."""
+        out_dir = os.environ.get("DEALSNOOP_DEBUG_SAVE_NETWORK")
+        if not out_dir or not bodies:
+            return
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        slug = re.sub(r"[^a-z0-9]+", "_", term.lower()).strip("_") or "term"
+        save_recorded_responses(out_dir, f"{city_code}_{slug}_{stamp}", bodies)
+        logger.info("Saved %d captured responses to %s", len(bodies), out_dir)
 
     async def get_location_for_city_code(self, city_code: str) -> str:
         """Resolve a human-readable location name from a Marketplace city code."""
@@ -262,34 +532,19 @@ Now extract the location from this text (return only the location, nothing else)
             f"https://www.facebook.com/marketplace/{city_code}/search"
             "?query=a&sortBy=creation_time_descend&daysSinceListed=1&exact=false&radius_in_km=30"
         )
-        await asyncio.to_thread(self.browser.get, url)
-        await asyncio.sleep(3)  # Allow JS to render before reading page source.
-        html = await asyncio.to_thread(lambda: self.browser.page_source)
+        async with self.browsers.lease() as browser:
+            started = time.monotonic()
+            await asyncio.to_thread(browser.get, url)
+            await self._wait_until(browser, _LOCATION_READY_SCRIPT, PAGE_READY_TIMEOUT)
+            observe_latency("location", time.monotonic() - started)
+            html = await asyncio.to_thread(lambda: browser.page_source)
         soup = await asyncio.to_thread(BeautifulSoup, html, "html.parser")
-        fallback = self.snoop.searches.get_location_name(city_code)
+        fallback = await self.snoop.searches.get_location_name(city_code)
         return await self._extract_page_location(
             soup, city_code, fallback=fallback, page_html=html
         )
     
 
-    def _title_from_link(self, link: Tag) -> str:
-        """Extract a minimal title from a link for logging."""
-        text = next(iter(link.stripped_strings), None)
-        if text:
-            return text[:80] + ("..." if len(text) > 80 else "")
-        href = link.get("href") or ""
-        return href[:80] + ("..." if len(href) > 80 else "") or "Unknown listing"
-
-    def _url_and_img_from_link(self, link: Tag) -> tuple[str | None, str | None]:
-        """Extract listing URL and thumbnail img from a link."""
-        href = link.get("href")
-        url = f"https://facebook.com{href}" if isinstance(href, str) and href else None
-        img_tag = link.find("img")
-        img = None
-        if img_tag and getattr(img_tag, "attrs", {}).get("src"):
-            img = img_tag["src"]
-        return (url, img)
-
     def _parse_quality_output(self, raw_output: str) -> tuple[str, str, bool, str | None]:
         """Parse `reasoning || strengths/weaknesses || true/false` output."""
         text = (raw_output or "").strip()
@@ -327,14 +582,20 @@ Now extract the location from this text (return only the location, nothing else)
         warning_text = "; ".join(warnings) if warnings else None
         return (reasoning, strengths, passed, warning_text)
 
-    async def perform_search(self, search: SearchConfig, sort: str) -> list[Product]:
+    async def perform_search(
+        self,
+        search: SearchConfig,
+        sorts: tuple[str, ...] = SEARCH_SORTS,
+        pages: PageMemo[_ResultsPage] | None = None,
+    ) -> list[Product]:
+        """Search every sort order of a watch and process the merged listings once."""
         # Re-fetch config from store to ensure any updated terms are used
-        latest = self.snoop.searches.get_config_by_id(search.id)
+        latest = await self.snoop.searches.get_config_by_id(search.id)
         if latest is not None:
             search = latest
 
-        products = []
-        feed_channel_id = self.snoop.searches.get_feed_channel_id()
+        products: list[Product] = []
+        feed_channel_id = await self.snoop.searches.get_feed_channel_id()
         collector = SearchLogCollector(
             search.id,
             bot=self.snoop.bot,
@@ -342,190 +603,346 @@ Now extract the location from this text (return only the location, nothing else)
         )
         collector.start()
 
-        link_term_pairs, origin = await self.gather_listings(search, sort)
-        self.snoop.searches.set_location_name(search.city_code, origin)
+        results = await asyncio.gather(*(self.gather_listings(search, sort, pages) for sort in sorts))
+        origin = results[0][1]
+        await self.snoop.searches.set_location_name(search.city_code, origin)
         if search.location_name != origin:
-            self.snoop.searches.add_object(replace(search, location_name=origin))
-        logger.info(f"$G${search.id}$W$: found {len(link_term_pairs)} links on page")
-        for link, search_term in link_term_pairs:
-            passed, skip_reason = self.validate_listing(link)
-            if not passed:
-                # Only log "Cache hit" - real listings we've seen. Skip logging "Invalid listing"
-                # (no img/alt/href) since those are page chrome (Terms, Help, Settings, etc.).
-                if skip_reason == "Cache hit":
-                    collector.add_grouped(
-                        self._title_from_link(link), skip_reason, search_term=search_term
-                    )
-                continue
+            await self.snoop.searches.add_object(replace(search, location_name=origin))
 
-            text = '\n'.join(link.stripped_strings)
-            lines = [ln.strip() for ln in text.split('\n') if ln.strip()]
-            if len(lines) < 2:
-                url, img = self._url_and_img_from_link(link)
-                collector.add_grouped(
-                    self._title_from_link(link),
-                    "Malformed listing",
-                    url=url,
-                    img=img,
-                    search_term=search_term,
-                )
+        cached = await self._cached_listing_ids(
+            search, [card for sort_cards, _ in results for card in sort_cards]
+        )
+        cards: list[ListingCard] = []
+        seen_ids: set[str] = set()
+        for sort, (sort_cards, _) in zip(sorts, results):
+            logger.info(f"$G${search.id}$W$: found {len(sort_cards)} listings on page ({sort})")
+            if INCREMENTAL_SCAN and sort == "creation_time_descend":
+                sort_cards = self._cut_at_seen(search, sort_cards, cached)
+            for card in sort_cards:
+                if card.listing_id not in seen_ids:
+                    seen_ids.add(card.listing_id)
+                    cards.append(card)
+
+        new_cards, hits = await self.validate_listings(search, cards, cached)
+        for card in hits:
+            collector.add_grouped(card.title, "Cache hit", search_term=card.search_term)
+        new_listings = len(new_cards)
+        logger.info(f"$G${search.id}$W$: {new_listings} new of {len(cards)} unique listing(s)")
+
+        prefilter = (
+            compile_prefilter(search, PREFILTER_EXCLUDE_TERMS, PREFILTER_MAX_PRICE_RATIO, PREFILTER_TERM_OVERLAP)
+            if PREFILTER
+            else None
+        )
+
+        async def check(card: ListingCard) -> _Candidate | None:
+            return await self._filter_stage(search, origin, card, collector, prefilter)
+
+        async def fetch(candidate: _Candidate) -> _Candidate:
+            candidate.date, candidate.description = await self.get_product_info(candidate.card.url)
+            return candidate
+
+        batcher: MicroBatcher[_Candidate, tuple[bool, str, str, str | None]] = MicroBatcher(
+            lambda batch: self.validate_quality_batch(search, batch), LLM_BATCH_SIZE, LLM_BATCH_WAIT
+        )
+
+        async def evaluate(candidate: _Candidate) -> _Candidate | None:
+            return await self._evaluate_stage(search, candidate, collector, batcher)
+
+        async def notify(candidate: _Candidate) -> None:
+            products.append(await self._notify_stage(search, candidate, collector))
+
+        await run_pipeline(
+            new_cards,
+            [
+                Stage("filter", check, PIPELINE_FILTER_CONCURRENCY),
+                Stage("detail", fetch, PIPELINE_DETAIL_CONCURRENCY),
+                Stage("evaluate", evaluate, PIPELINE_LLM_CONCURRENCY * LLM_BATCH_SIZE),
+                Stage("notify", notify, PIPELINE_NOTIFY_CONCURRENCY),
+            ],
+            queue_size=PIPELINE_QUEUE_SIZE,
+            label=search.id,
+        )
+
+        interval = self.scheduler.record(search.id, new_listings)
+        logger.info(
+            f"$G${search.id}$W$: {new_listings} new listing(s), next check in {interval / 60:.1f} min"
+        )
+
+        await collector.flush()
+        return products
+
+    def _cut_at_seen(
+        self,
+        search: SearchConfig,
+        cards: list[ListingCard],
+        cached: set[str],
+    ) -> list[ListingCard]:
+        """Drop each term's results after a run of INCREMENTAL_STOP_AFTER_HITS cached listings.
+
+        Only valid for newest-first results: anything below a listing we have already seen is
+        older still. The cached listings before the cut are kept so they are reported as hits.
+        """
+        kept: list[ListingCard] = []
+        run: dict[str, int] = {}
+        skipped: dict[str, int] = {}
+        for card in cards:
+            term = card.search_term
+            if run.get(term, 0) >= INCREMENTAL_STOP_AFTER_HITS:
+                skipped[term] = skipped.get(term, 0) + 1
                 continue
+            run[term] = run.get(term, 0) + 1 if card.listing_id in cached else 0
+            kept.append(card)
+        for term, count in skipped.items():
+            logger.info(
+                f"$G${search.id}$W$: '{term}' reached already-seen listings, "
+                f"skipped {count} older listing(s)"
+            )
+        return kept
 
-            # Vehicle listings have extra line: [price, title, location, mileage]
-            # Regular listings: [price, title, location]
-            mileage_pattern = re.compile(
-                r'\d[\d,.]*[Kk]?\s*(?:miles?|mi)\b', re.IGNORECASE
+    async def _filter_stage(
+        self,
+        search: SearchConfig,
+        origin: str,
+        card: ListingCard,
+        collector: SearchLogCollector,
+        prefilter: PreFilter | None = None,
+    ) -> _Candidate | None:
+        """Cheap checks on a new listing before any browser or LLM work: malformed card, pre-filter, radius."""
+        search_term = card.search_term
+        if card.malformed:
+            collector.add_grouped(
+                card.title,
+                "Malformed listing",
+                url=card.url,
+                img=card.img,
+                search_term=search_term,
             )
-            if len(lines) >= 4 and mileage_pattern.search(lines[-1]):
-                title = lines[-3]
-                location = lines[-2]
-            else:
-                title = lines[-2] if len(lines) >= 2 else (lines[-1] if lines else "")
-                location = lines[-1] if lines else ""
-
-            distance, duration = await get_distance_and_duration(origin, location)
-            if distance > search.radius:
-                url, img = self._url_and_img_from_link(link)
-                collector.add_grouped(
-                    title,
-                    f"Outside radius ({location} - {round(distance)} mi)",
-                    url=url,
-                    img=img,
-                    search_term=search_term,
-                )
-                continue
+            return None
 
-            numeric_pattern = re.compile(r'\d[\d,.]*')
-            price = 0
-            for line in lines:
-                match = numeric_pattern.search(line)
-                if match:
-                    price_str = match.group()
-                    price = float(price_str.replace(',',''))
-                    break
+        if prefilter is not None and (rule := prefilter.check(card)):
+            collector.add_grouped(
+                card.title,
+                f"Pre-filter: {rule}",
+                url=card.url,
+                img=card.img,
+                search_term=search_term,
+            )
+            return None
 
-            url = f"https://facebook.com{link.get('href')}"
-            img = link.find('img')['src']
-            date, description = await self.get_product_info(url)
+        distance, duration = await get_distance_and_duration(origin, card.location)
+        if distance > search.radius:
+            collector.add_grouped(
+                card.title,
+                f"Outside radius ({card.location} - {round(distance)} mi)",
+                url=card.url,
+                img=card.img,
+                search_term=search_term,
+            )
+            return None
+        return _Candidate(card, distance, duration)
 
+    async def _evaluate_stage(
+        self,
+        search: SearchConfig,
+        candidate: _Candidate,
+        collector: SearchLogCollector,
+        batcher: MicroBatcher[_Candidate, tuple[bool, str, str, str | None]] | None = None,
+    ) -> _Candidate | None:
+        card = candidate.card
+        if batcher is not None and LLM_BATCH_SIZE > 1:
+            passed, thought_trace, strengths_summary, format_warning = await batcher.submit(candidate)
+        else:
             passed, thought_trace, strengths_summary, format_warning = await self.validate_quality(
-                title, search.terms, search.target_price, price, description, search.context
+                card.title, search.terms, search.target_price, card.price, candidate.description, search.context
             )
-            if not passed:
-                thought_excerpt = f"{thought_trace[:200]}{'...' if len(thought_trace) > 200 else ''}"
-                reason_parts = [
-                    f"-# {_format_highlights(strengths_summary)}",
-                    f"{thought_excerpt}",
-                ]
-                if format_warning:
-                    reason_parts.insert(1, f"WARNING: {format_warning}")
-                collector.add_individual_skipped(
-                    title,
-                    "\n".join(reason_parts),
-                    url=re.sub(r'\?.*', '', url),
-                    price=price,
-                    img=img,
-                    search_term=search_term,
-                )
-                continue
+        candidate.thought_trace = thought_trace
+        candidate.strengths_summary = strengths_summary
+        candidate.format_warning = format_warning
+        if passed:
+            return candidate
 
-            product = Product(price, title, description, location, date, re.sub(r'\?.*', '', url), img)
-            products.append(product)
-            kept_reason_parts = [
-                _format_highlights(strengths_summary),
-                f"**Reasoning:** {thought_trace}",
-            ]
-            if format_warning:
-                kept_reason_parts.insert(1, f"WARNING: {format_warning}")
-            kept_reason_parts.append("Matched")
-            collector.add_individual_kept(
-                title,
-                "\n".join(kept_reason_parts),
-                url=product.url,
-                price=price,
-                img=img,
-                search_term=search_term,
-            )
+        thought_excerpt = f"{thought_trace[:200]}{'...' if len(thought_trace) > 200 else ''}"
+        reason_parts = [
+            f"-# {_format_highlights(strengths_summary)}",
+            f"{thought_excerpt}",
+        ]
+        if format_warning:
+            reason_parts.insert(1, f"WARNING: {format_warning}")
+        collector.add_individual_skipped(
+            card.title,
+            "\n".join(reason_parts),
+            url=re.sub(r'\?.*', '', card.url),
+            price=card.price,
+            img=card.img or "",
+            search_term=card.search_term,
+        )
+        return None
 
-            listing_id = re.search(r"/marketplace/item/(\d+)", product.url)
-            listing_id = listing_id.group(1) if listing_id else None
-            if listing_id:
-                from dealsnoop.bot.embeds import truncate_description, product_layout_view
-
-                watch_cmd = build_watch_command(search, search.channel)
-                trace = (thought_trace or "").strip() or None
-                self.snoop.searches.insert_listing(
-                    listing_id=listing_id,
-                    search_id=search.id,
-                    title=title,
-                    description=description,
-                    price=price,
-                    location=location,
-                    date=product.date,
-                    url=product.url,
-                    img=img,
-                    thought_trace=trace,
-                    ai_strengths=strengths_summary,
-                    watch_command=watch_cmd,
-                )
-                truncated_desc = truncate_description(description)
-                view = product_layout_view(
-                    product,
-                    distance,
-                    duration,
-                    truncated_desc,
-                    listing_id,
-                    expanded=False,
-                    strengths_summary=strengths_summary,
-                )
-                await self.snoop.bot.send_layout(
-                    view, search.channel, listing_id=listing_id
-                )
-            else:
-                embed = product_embed(product, distance, duration)
-                await self.snoop.bot.send_embed(
-                    embed, search.channel, thought_trace=thought_trace, search_id=search.id
-                )
+    async def _notify_stage(
+        self,
+        search: SearchConfig,
+        candidate: _Candidate,
+        collector: SearchLogCollector,
+    ) -> Product:
+        card = candidate.card
+        title = card.title
+        price = card.price
+        location = card.location
+        description = candidate.description
+        thought_trace = candidate.thought_trace
+        strengths_summary = candidate.strengths_summary
+        img = card.img or ""
 
-            self.cache.save_cache()
-            await asyncio.sleep(random.randint(1, 4))
+        product = Product(price, title, description, location, candidate.date, re.sub(r'\?.*', '', card.url), img)
+        kept_reason_parts = [
+            _format_highlights(strengths_summary),
+            f"**Reasoning:** {thought_trace}",
+        ]
+        if candidate.format_warning:
+            kept_reason_parts.insert(1, f"WARNING: {candidate.format_warning}")
+        kept_reason_parts.append("Matched")
+        collector.add_individual_kept(
+            title,
+            "\n".join(kept_reason_parts),
+            url=product.url,
+            price=price,
+            img=img,
+            search_term=card.search_term,
+        )
 
-        await collector.flush()
-        return products
+        listing_id = re.search(r"/marketplace/item/(\d+)", product.url)
+        listing_id = listing_id.group(1) if listing_id else None
+        if listing_id:
+            from dealsnoop.bot.embeds import truncate_description, product_layout_view
+
+            watch_cmd = build_watch_command(search, search.channel)
+            trace = (thought_trace or "").strip() or None
+            await self.snoop.searches.insert_listing(
+                listing_id=listing_id,
+                search_id=search.id,
+                title=title,
+                description=description,
+                price=price,
+                location=location,
+                date=product.date,
+                url=product.url,
+                img=img,
+                thought_trace=trace,
+                ai_strengths=strengths_summary,
+                watch_command=watch_cmd,
+            )
+            truncated_desc = truncate_description(description)
+            view = product_layout_view(
+                product,
+                candidate.distance,
+                candidate.duration,
+                truncated_desc,
+                listing_id,
+                expanded=False,
+                strengths_summary=strengths_summary,
+            )
+            await self.snoop.bot.send_layout(
+                view, search.channel, listing_id=listing_id
+            )
+        else:
+            embed = product_embed(product, candidate.distance, candidate.duration)
+            await self.snoop.bot.send_embed(
+                embed, search.channel, thought_trace=thought_trace, search_id=search.id
+            )
+        return product
     
-    @tasks.loop(minutes=5.0)
+    @tasks.loop(seconds=SCHEDULER_TICK_SECONDS)
     async def event_loop(self):
         await self._run_searches()
+        if time.monotonic() - self._last_report >= METRICS_REPORT_MINUTES * 60:
+            self._last_report = time.monotonic()
+            self._log_metrics()
+
+    async def close(self) -> None:
+        """Cancel running watches and quit the pooled browsers."""
+        tasks = list(self._watch_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.browsers.close()
+
+    def force_due(self) -> None:
+        """Make every watch due so the next loop iteration searches all of them."""
+        self.scheduler.force_due()
 
     async def _run_searches(self) -> None:
-        searches = self.snoop.searches.get_all_objects()
-        logger.info(f"$G$Checking sites ({len(searches)} search(es))")
+        """Start every due watch as its own task; a slow watch never holds up the next tick."""
+        watches = await self.snoop.searches.get_all_objects()
+        groups = list(plan_queries(watches, SEARCH_SORTS).values())
+        self.scheduler.sync({search.id for search in watches}, groups=groups)
+        due = self.scheduler.due()
+        if not due:
+            return
+        due = self.scheduler.align(due, groups)
+        searches = [search for search in watches if search.id in set(due)]
+        logger.info(
+            f"$G$Checking sites ({len(searches)} search(es), {self.scheduler.running} still running, "
+            f"{SEARCH_CONCURRENCY} concurrent, {self.browsers.size} browser(s))"
+        )
+        plan = plan_queries(searches, SEARCH_SORTS)
+        requested = sum(len(watch_ids) for watch_ids in plan.values())
+        logger.info(f"$G$Query plan: {len(plan)} unique results page(s) for {requested} watch request(s)")
+        # Watches started together share each results page they have in common.
+        pages: PageMemo[_ResultsPage] = PageMemo(self._fetch_results_page)
         for search in searches:
-            await self.perform_search(search, "creation_time_descend")
-            await asyncio.sleep(5)
-            await self.perform_search(search, "best_match")
-            await asyncio.sleep(5)
-        self.cache.flush_old_entries()
-
-    def validate_listing(self, link: Tag) -> tuple[bool, str | None]:
-        """Returns (passed, skip_reason). skip_reason is None when passed."""
-        img_tag = link.find("img")
-        if img_tag is None:
-            return (False, "Invalid listing (no img)")
-        attrs = getattr(img_tag, "attrs", {})
-        if "alt" not in attrs:
-            return (False, "Invalid listing (no alt)")
-        href = link.get("href")
-        if not isinstance(href, str):
-            return (False, "Invalid listing (no href)")
-        listing_id = re.sub(r"/marketplace/item/(\d+)", r"\1", href)
-        listing_id = re.sub(r"/.*", "", listing_id)
-        if not listing_id or not listing_id.isdigit():
-            return (False, "Invalid listing (not marketplace item)")
-        if self.cache.contains(listing_id):
-            return (False, "Cache hit")
-        self.cache.add_url(listing_id)
-        return (True, None)
+            self.scheduler.start(search.id)
+            task = asyncio.create_task(self._run_watch(search, pages))
+            self._watch_tasks.add(task)
+            task.add_done_callback(self._watch_tasks.discard)
+
+    async def _run_watch(self, search: SearchConfig, pages: PageMemo[_ResultsPage]) -> None:
+        try:
+            async with self._search_limit:
+                await self.perform_search(search, pages=pages)
+        except Exception:
+            logger.exception(f"$R$Search $G${search.id}$R$ failed")
+            # Count a failed run as a quiet one so it is not retried every tick.
+            self.scheduler.record(search.id, 0)
+        finally:
+            self.scheduler.finish(search.id)
+
+    def _log_metrics(self) -> None:
+        """Log cache and cascade counters and the page latencies of the window since the last call."""
+        if cache_stats := self.cache.stats_summary():
+            logger.info(f"Listing cache {cache_stats}")
+        if self.verdicts is not None:
+            logger.info(f"Verdict cache {self.verdicts.stats.summary()}")
+        if self.cascade is not None:
+            logger.info(f"Model cascade {self.cascade.stats.summary()}")
+        for line in latency_report():
+            logger.info(f"Page latency {line}")
+
+    async def _cached_listing_ids(self, search: SearchConfig, cards: list[ListingCard]) -> set[str]:
+        """Listing ids this watch has already seen, resolved for the whole page in one query.
+
+        Entries are scoped per watch so watches sharing a results page each evaluate it. Entries
+        written before that are keyed by listing id alone and still count until they expire.
+        """
+        scoped = {f"{search.id}:{card.listing_id}": card.listing_id for card in cards}
+        hits = await self.cache.contains_many([*scoped, *scoped.values()])
+        return {scoped.get(key, key) for key in hits}
+
+    async def validate_listings(
+        self, search: SearchConfig, cards: list[ListingCard], cached: set[str]
+    ) -> tuple[list[ListingCard], list[ListingCard]]:
+        """Split cards into (new, cache hits), claiming the new ones for this watch atomically.
+
+        `cached` only prefilters. A listing counts as new when this call's insert wins its
+        cache row, so concurrent searches, processes or hosts sharing listing_cache never
+        both evaluate and notify it.
+        """
+        keys = {f"{search.id}:{card.listing_id}": card for card in cards if card.listing_id not in cached}
+        won = await self.cache.claim_many(list(keys))
+        new_cards = [card for key, card in keys.items() if key in won]
+        claimed = {card.listing_id for card in new_cards}
+        hits = [card for card in cards if card.listing_id not in claimed]
+        return (new_cards, hits)
 
     async def validate_quality(
         self,
@@ -536,21 +953,104 @@ Now extract the location from this text (return only the location, nothing else)
         description: str,
         context: str | None,
     ) -> tuple[bool, str, str, str | None]:
-        """Returns (passed, thought_trace, strengths_summary, format_warning)."""
+        """Returns (passed, thought_trace, strengths_summary, format_warning).
+
+        Verdicts are cached per listing content and watch criteria; a response that did not
+        follow the output format is not cached. With the cascade on, the screening model
+        answers first and the quality model only sees listings it is unsure about.
+        """
+        key = None
+        if self.verdicts is not None:
+            key = self.verdicts.key(title, description, price, terms, target_price, context)
+            cached = await self.verdicts.get(key)
+            if cached is not None:
+                logger.info("Listing quality verdict served from cache")
+                return (cached.passed, cached.thought_trace, cached.strengths_summary, None)
+        if self.cascade is None:
+            return await self._ask_quality(key, title, terms, target_price, price, description, context)
+        screening = await self._screen_quality(title, terms, target_price, price, description, context)
+        decision = self.cascade.decide(screening)
+        if screening is not None and not self.cascade.escalate(decision):
+            return await self._screened_verdict(key, screening)
+        result = await self._ask_quality(key, title, terms, target_price, price, description, context)
+        self.cascade.record(decision, screening, result[0])
+        return result
+
+    async def _screen_quality(
+        self,
+        title: str,
+        terms: tuple[str, ...],
+        target_price: str | None,
+        price: float,
+        description: str,
+        context: str | None,
+    ) -> Screening | None:
+        """Ask the screening model; None if it failed or its answer was unusable."""
+        if not target_price:
+            target_price = "(no max price)"
+        try:
+            async with self.llm_limit:
+                response = await self.chatgpt.chat.completions.create(
+                    model=LLM_CASCADE_MODEL,
+                    messages=[
+                        {"role": "user", "content": f"""
+The user searched Facebook Marketplace for '{terms}' and reveived this result. Decide whether it is what the user is looking for, and how sure you are.
+
+{_quality_criteria(terms, target_price, context)}
+
+Listing:
+Title: `{title}`
+Description: ```{description}```
+Price: `${price}`
+
+Respond in exactly this format (single line, if the listing isn't what the user is looking for, make bullet points section just "NA"; confidence is 0-100, use 90 or more only when the answer is obvious, e.g. an ISO/WTB post, parts only, or a price far over the max):
+<Short reasoning> || <3 bullet points of listing, i.e. "Oak · Small chip in corner · Just repainted" (Keep in one line like example, don't include the price or title)> || <True or False> || <Confidence>
+    """},
+                    ],
+                    max_tokens=200,
+                )
+        except OpenAIError as e:
+            logger.warning(f"Screening model failed, escalating: {e}")
+            return None
+        return parse_screening(response.choices[0].message.content or "")
+
+    async def _screened_verdict(
+        self,
+        key: str | None,
+        screening: Screening,
+    ) -> tuple[bool, str, str, str | None]:
+        """Accept a confident screening verdict as final, caching it like any other."""
+        await self._store_verdict(
+            key, Verdict(screening.passed, screening.thought_trace, screening.strengths_summary)
+        )
+        return (screening.passed, screening.thought_trace, screening.strengths_summary, None)
+
+    async def _store_verdict(self, key: str | None, verdict: Verdict) -> None:
+        """Cache a verdict under `key`; a no-op when the verdict cache is off."""
+        if key is not None and self.verdicts is not None:
+            await self.verdicts.put(key, verdict)
+
+    async def _ask_quality(
+        self,
+        key: str | None,
+        title: str,
+        terms: tuple[str, ...],
+        target_price: str | None,
+        price: float,
+        description: str,
+        context: str | None,
+    ) -> tuple[bool, str, str, str | None]:
+        """Single-listing LLM call behind validate_quality; caches the verdict under `key`."""
         logger.info("Validating listing quality")
         if not target_price:
             target_price = "(no max price)"
-        response = await asyncio.to_thread(self.chatgpt.responses.create,
-        model="gpt-5.1",
-        input=f"""
+        async with self.llm_limit:
+            response = await self.chatgpt.responses.create(
+            model=QUALITY_MODEL,
+            input=f"""
 The user searched Facebook Marketplace for '{terms}' and reveived this result. Evaluate it and decide whether it is what the user is looking for, and if it should be shown to them.
 
-Criteria:
-- The listing must actually be selling '{terms}', not an ISO/WTB post, parts-only, or unrelated item.
-- The listing must appear to be a real, usable item — not a scam or broken/for-parts (unless '{context}' says otherwise).
-- Price must be at or below ${target_price}. Only allow higher if the item is a genuinely strong deal. 
-
-The user defined this context, please use it in your evaluation: '{context}'
+{_quality_criteria(terms, target_price, context)}
 
 Listing:
 Title: `{title}`
@@ -562,5 +1062,159 @@ Respond in exactly this format (single line, if the listing isn't what the user
     """)
         text = (response.output_text or "").strip()
         thought_trace, strengths_summary, passed, format_warning = self._parse_quality_output(text)
+        if format_warning is None:
+            await self._store_verdict(key, Verdict(passed, thought_trace, strengths_summary))
         return (passed, thought_trace, strengths_summary, format_warning)
 
+    async def validate_quality_batch(
+        self,
+        search: SearchConfig,
+        candidates: list[_Candidate],
+    ) -> list[tuple[bool, str, str, str | None] | BaseException]:
+        """validate_quality for several listings of one watch, sharing a single LLM call.
+
+        Cached verdicts are served first; the rest go out in one prompt that asks for a
+        verdict line per listing number. Listings whose line is missing or malformed are
+        re-checked on their own. Returns one entry per candidate, in order; a listing whose
+        LLM call failed gets the exception, without affecting the others.
+        """
+        results: list[tuple[bool, str, str, str | None] | BaseException | None] = [None] * len(candidates)
+        keys: list[str | None] = [None] * len(candidates)
+        misses: list[int] = []
+        for i, candidate in enumerate(candidates):
+            card = candidate.card
+            if self.verdicts is not None:
+                key = self.verdicts.key(
+                    card.title, candidate.description, card.price, search.terms, search.target_price, search.context
+                )
+                keys[i] = key
+                cached = await self.verdicts.get(key)
+                if cached is not None:
+                    results[i] = (cached.passed, cached.thought_trace, cached.strengths_summary, None)
+                    continue
+            misses.append(i)
+
+        cascade = self.cascade
+        screenings: dict[int, tuple[Screening | None, str]] = {}
+        if cascade is not None and misses:
+            answers = await asyncio.gather(
+                *(
+                    self._screen_quality(
+                        candidates[i].card.title,
+                        search.terms,
+                        search.target_price,
+                        candidates[i].card.price,
+                        candidates[i].description,
+                        search.context,
+                    )
+                    for i in misses
+                )
+            )
+            escalated: list[int] = []
+            for i, screening in zip(misses, answers):
+                decision = cascade.decide(screening)
+                if screening is None or cascade.escalate(decision):
+                    screenings[i] = (screening, decision)
+                    escalated.append(i)
+                else:
+                    results[i] = await self._screened_verdict(keys[i], screening)
+            misses = escalated
+
+        retry = misses
+        if len(misses) > 1:
+            try:
+                parsed = await self._ask_quality_batch(search, [candidates[i] for i in misses])
+            except OpenAIError as e:
+                logger.warning(f"$G${search.id}$W$: batched quality check failed: {e}")
+                parsed = []
+                for i in misses:
+                    results[i] = e
+            retry = []
+            for i, verdict in zip(misses, parsed):
+                if verdict is None:
+                    retry.append(i)
+                    continue
+                results[i] = verdict
+                await self._store_verdict(keys[i], Verdict(verdict[0], verdict[1], verdict[2]))
+            if retry:
+                logger.warning(
+                    f"$G${search.id}$W$: {len(retry)} of {len(misses)} batched verdict(s) malformed, "
+                    "re-checking individually"
+                )
+
+        singles = await asyncio.gather(
+            *(
+                self._ask_quality(
+                    keys[i],
+                    candidates[i].card.title,
+                    search.terms,
+                    search.target_price,
+                    candidates[i].card.price,
+                    candidates[i].description,
+                    search.context,
+                )
+                for i in retry
+            ),
+            return_exceptions=True,
+        )
+        for i, verdict in zip(retry, singles):
+            if isinstance(verdict, BaseException):
+                logger.warning(f"$G${search.id}$W$: quality check for '{candidates[i].card.title}' failed: {verdict}")
+            results[i] = verdict
+        if cascade is not None:
+            for i, (screening, decision) in screenings.items():
+                if isinstance(verdict := results[i], tuple):
+                    cascade.record(decision, screening, verdict[0])
+        verdicts: list[tuple[bool, str, str, str | None] | BaseException] = []
+        for i, result in enumerate(results):
+            assert result is not None, f"no quality verdict for listing {i} of the batch"
+            verdicts.append(result)
+        return verdicts
+
+    async def _ask_quality_batch(
+        self,
+        search: SearchConfig,
+        candidates: list[_Candidate],
+    ) -> list[tuple[bool, str, str, str | None] | None]:
+        """One LLM call for several listings; None where the response had no well-formed line."""
+        logger.info(f"Validating quality of {len(candidates)} listings in one request")
+        terms = search.terms
+        target_price = search.target_price or "(no max price)"
+        listings = "\n\n".join(
+            f"""[{n}]
+Title: `{c.card.title}`
+Description: ```{c.description}```
+Price: `${c.card.price}`"""
+            for n, c in enumerate(candidates, start=1)
+        )
+        async with self.llm_limit:
+            started = time.monotonic()
+            response = await self.chatgpt.responses.create(
+            model=QUALITY_MODEL,
+            input=f"""
+The user searched Facebook Marketplace for '{terms}' and reveived these {len(candidates)} results. Evaluate each one on its own and decide whether it is what the user is looking for, and if it should be shown to them.
+
+{_quality_criteria(terms, target_price, search.context)}
+
+Listings:
+{listings}
+
+Respond with exactly one line per listing, in listing order, in exactly this format (if a listing isn't what the user is looking for, make its bullet points section just "NA".):
+<Listing number> || <Short reasoning> || <3 bullet points of listing, i.e. "Oak · Small chip in corner · Just repainted" (Keep in one line like example, don't include the price or title)> || <True or False>
+    """)
+        observe_latency("llm_batch", time.monotonic() - started)
+        verdicts: list[tuple[bool, str, str, str | None] | None] = [None] * len(candidates)
+        for line in (response.output_text or "").splitlines():
+            match = re.match(r"^\s*\[?(\d+)\]?\s*\|\|\s*(.+)$", line)
+            if not match:
+                continue
+            n = int(match.group(1))
+            if not 1 <= n <= len(candidates) or verdicts[n - 1] is not None:
+                continue
+            thought_trace, strengths_summary, passed, format_warning = self._parse_quality_output(match.group(2))
+            if format_warning is None:
+                verdicts[n - 1] = (passed, thought_trace, strengths_summary, None)
+        logger.info(
+            f"$G${search.id}$W$: batch of {len(candidates)} evaluated in {time.monotonic() - started:.1f}s"
+        )
+        return verdicts
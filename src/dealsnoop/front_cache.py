@@ -0,0 +1,137 @@
+"""In-process front layer for the listing cache: a Bloom filter plus an LRU of confirmed hits."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings: no false negatives, tunable false-positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.clear()
+
+    def clear(self) -> None:
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> list[int]:
+        # Double hashing (Kirsch-Mitzenmacher): k positions from two 64-bit halves of one digest.
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def saturated(self) -> bool:
+        """More keys were added than it was sized for; its false-positive rate is climbing."""
+        return self.count >= self.capacity
+
+
+@dataclass
+class FrontCacheStats:
+    """Lookup counters. A false positive is a Bloom hit the database did not confirm."""
+
+    hits: int = 0
+    misses: int = 0
+    false_positives: int = 0
+    db_lookups: int = 0
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (
+            f"hits={self.hits} misses={self.misses} false_positives={self.false_positives} "
+            f"db_lookups={self.db_lookups} hit_rate={rate:.0%}"
+        )
+
+
+class FrontCache:
+    """Memory-bounded view of one engine's listing_cache rows.
+
+    `lookup` splits ids into known hits (in the LRU), known misses (not in the Bloom filter)
+    and ids that must be confirmed against the database. The filter only answers "no" for ids
+    that were never added, so a miss is exact for everything this process has written or
+    loaded; writes from other processes are settled by the atomic claim in the database.
+    """
+
+    def __init__(self, bloom_capacity: int, lru_size: int, error_rate: float = 0.01) -> None:
+        self.bloom = BloomFilter(bloom_capacity, error_rate)
+        self.lru_size = max(1, lru_size)
+        self._lru: OrderedDict[str, datetime] = OrderedDict()
+        self.stats = FrontCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def add(self, listing_id: str, created_at: datetime | None = None) -> None:
+        """Record a row known to exist (created now unless created_at is given)."""
+        self.bloom.add(listing_id)
+        self._lru[listing_id] = created_at or datetime.now(timezone.utc)
+        self._lru.move_to_end(listing_id)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def lookup(self, listing_ids: list[str]) -> tuple[set[str], list[str]]:
+        """Return (hits, ids to confirm); every other id is a definite miss."""
+        hits: set[str] = set()
+        unsure: list[str] = []
+        for listing_id in listing_ids:
+            if listing_id in self._lru:
+                self._lru.move_to_end(listing_id)
+                hits.add(listing_id)
+            elif listing_id in self.bloom:
+                unsure.append(listing_id)
+            else:
+                self.stats.misses += 1
+        self.stats.hits += len(hits)
+        return hits, unsure
+
+    def confirm(self, unsure: list[str], found: set[str]) -> None:
+        """Apply the database's answer for ids `lookup` could not decide."""
+        if unsure:
+            self.stats.db_lookups += 1
+        for listing_id in unsure:
+            if listing_id in found:
+                self.stats.hits += 1
+                self.add(listing_id)
+            else:
+                self.stats.false_positives += 1
+                self.stats.misses += 1
+
+    def load(self, rows: list[tuple[str, datetime]]) -> None:
+        """Replace the contents with the table's (listing_id, created_at) rows, oldest first.
+
+        The filter is rebuilt, grown to twice the row count if it was sized smaller.
+        """
+        capacity = max(self.bloom.capacity, 2 * len(rows))
+        self.bloom = BloomFilter(capacity, self.bloom.error_rate)
+        self._lru.clear()
+        for listing_id, created_at in rows:
+            self.add(listing_id, created_at)
+
+    def expire(self, max_age_days: int) -> None:
+        """Drop LRU entries the database flushed; the filter keeps them until the next reload."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+        for listing_id in [k for k, created in self._lru.items() if created < cutoff]:
+            del self._lru[listing_id]
+
+    def clear(self) -> None:
+        self.bloom.clear()
+        self._lru.clear()
@@ -1,165 +1,137 @@
-"""URL cache for avoiding duplicate listing notifications."""
+"""Listing cache for avoiding duplicate listing notifications."""
 
-import os
-from typing import TYPE_CHECKING, Set
+import asyncio
+from typing import TYPE_CHECKING
 
+from discord.ext import tasks  # type: ignore[import-untyped]
+
+from dealsnoop.config import LISTING_CACHE_FLUSH_HOURS
+from dealsnoop.front_cache import FrontCache
 from dealsnoop.logger import logger
+from dealsnoop.store import unique_ids
 
 if TYPE_CHECKING:
-    from dealsnoop.store import SearchStore
-
-
-class Cache:
-    """File-based cache (legacy)."""
-
-    def __init__(self, cache_file_path: str):
-        """
-        Initializes the Cache.
-
-        Args:
-            cache_file_path (str): The path to the text cache file.
-        """
-        self.cache_file_path = cache_file_path
-        self.urls: Set[str] = set()
-        self._load_cache()  # Try to load existing cache on startup
-        logger.info(f"Cache initialized with file: $B${self.cache_file_path}")
-
-    def _load_cache(self):
-        """
-        Tries to load URLs from the text cache file (one URL per line).
-        If the file doesn't exist, initializes an empty set.
-        """
-        if os.path.exists(self.cache_file_path):
-            try:
-                with open(self.cache_file_path, "r", encoding="utf-8") as f:
-                    self.urls = {line.strip() for line in f if line.strip()}
-                logger.info(
-                    f"Cache loaded successfully from {self.cache_file_path}. "
-                    f"{len(self.urls)} URLs found."
-                )
-            except IOError as e:
-                logger.info(
-                    f"Error loading cache from {self.cache_file_path}: {e}. "
-                    f"Starting with an empty cache."
-                )
-                self.urls = set()
-        else:
-            logger.info(
-                f"Cache file not found at {self.cache_file_path}. "
-                "Starting with empty cache."
-            )
-            self.urls = set()
-
-    def save_cache(self):
-        """
-        Saves the current URL set to the cache file, one URL per line.
-        You must call this explicitly to save changes.
-        """
-        try:
-            with open(self.cache_file_path, "w", encoding="utf-8") as f:
-                for url in self.urls:
-                    f.write(url + "\n")
-            logger.info(f"Cache saved to $M${self.cache_file_path}$W$. {len(self.urls)} URLs.")
-        except IOError as e:
-            logger.info(f"Error saving cache to $M${self.cache_file_path}$W$: $B${e}")
-
-    def add_url(self, url: str):
-        """
-        Adds a URL to the cache.
-        """
-        self.urls.add(url.strip())
-
-    def contains(self, url: str) -> bool:
-        """Check if a URL is already in the cache."""
-        return url.strip() in self.urls
-
-    def clear(self):
-        """Clears all URLs from the cache (in-memory and on disk)."""
-        self.urls.clear()
-        self.save_cache()
-        logger.info(f"Cache cleared: $M${self.cache_file_path}$W$")
-
-    def flush_old_entries(self) -> int:
-        """No-op for file-based cache; age-based flush is DB-only."""
-        return 0
-
-    def flush(self, x: int):
-        """
-        Removes the first x lines (URLs) from the cache file
-        and updates the in-memory cache set.
-
-        Args:
-            x (int): Number of lines to remove from the beginning of the file.
-        """
-        if x <= 0:
-            logger.warning("$Y$Flush amount must be greater than 0.")
-            return
-
-        if not os.path.exists(self.cache_file_path):
-            logger.error("$R$Cache file does not exist. Nothing to flush.")
-            return
-
-        try:
-            with open(self.cache_file_path, "r", encoding="utf-8") as f:
-                lines = [line.strip() for line in f if line.strip()]
-
-            if not lines:
-                logger.info("Cache file is empty. Nothing to flush.")
-                return
-
-            # Drop the first x lines
-            remaining = lines[x:]
-
-            # Rewrite the file with remaining URLs
-            with open(self.cache_file_path, "w", encoding="utf-8") as f:
-                for url in remaining:
-                    f.write(url + "\n")
-
-            # Update the in-memory set
-            self.urls = set(remaining)
-
-            logger.info(
-                f"Flushed {min(x, len(lines))} lines from cache. "
-                f"{len(self.urls)} URLs remain."
-            )
-        except IOError as e:
-            logger.error(f"Error flushing cache: {e}")
+    from dealsnoop.async_store import AsyncSearchStore
 
 
 class DbCache:
-    """Database-backed cache that persists across restarts and flushes entries older than 2 days."""
-
-    def __init__(self, store: "SearchStore", engine: str, max_age_days: int = 2):
+    """Database-backed cache that persists across restarts and flushes entries older than 2 days.
+
+    Lookups and writes are coroutines (AsyncSearchStore). With a FrontCache, confirmed hits
+    and Bloom-filter misses are answered in process. It is loaded from the table on first use
+    and then only sees this process's adds, claims, flushes and clears, so a miss is exact
+    only for this process: another process may have added the id since. That is fine for
+    `contains_many`, which only narrows the candidates; `claim_many` always asks the database,
+    and its atomic claim is what settles races between processes.
+    """
+
+    def __init__(
+        self,
+        store: "AsyncSearchStore",
+        engine: str,
+        max_age_days: int = 2,
+        front: FrontCache | None = None,
+    ):
         self._store = store
         self._engine = engine
         self._max_age_days = max_age_days
+        self._front = front
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
         logger.info(f"DbCache initialized for engine: $B${engine}")
 
-    def add_url(self, url: str) -> None:
+    async def _front_cache(self) -> FrontCache | None:
+        """The front cache, loaded from the table the first time it is needed."""
+        if self._front is None or self._loaded:
+            return self._front
+        async with self._load_lock:
+            if not self._loaded:
+                await self._load_front()
+        return self._front
+
+    async def _load_front(self) -> None:
+        assert self._front is not None
+        rows = await self._store.listing_cache_rows(self._engine)
+        self._front.load(rows)
+        self._loaded = True
+        logger.info(
+            f"Front cache for $M${self._engine}$W$ loaded {len(rows)} entries "
+            f"({len(self._front)} in LRU)"
+        )
+
+    async def add_url(self, url: str) -> None:
         """Add a listing ID to the cache."""
-        self._store.listing_cache_add(self._engine, url)
+        await self._store.listing_cache_add(self._engine, url)
+        if front := await self._front_cache():
+            front.add(url.strip())
 
-    def contains(self, url: str) -> bool:
+    async def contains(self, url: str) -> bool:
         """Check if a listing ID is already in the cache."""
-        return self._store.listing_cache_contains(self._engine, url)
-
-    def save_cache(self) -> None:
-        """No-op for DB cache; each add is persisted immediately."""
-        pass
-
-    def clear(self) -> None:
+        if self._front is None:
+            return await self._store.listing_cache_contains(self._engine, url)
+        return url.strip() in await self.contains_many([url])
+
+    async def contains_many(self, urls: list[str]) -> set[str]:
+        """Return the subset of listing IDs already in the cache, in at most one query."""
+        front = await self._front_cache()
+        if front is None:
+            return await self._store.listing_cache_contains_many(self._engine, urls)
+        hits, unsure = front.lookup(unique_ids(urls))
+        if unsure:
+            found = await self._store.listing_cache_contains_many(self._engine, unsure)
+            front.confirm(unsure, found)
+            hits |= found
+        return hits
+
+    async def claim_many(self, urls: list[str]) -> set[str]:
+        """Atomically add listing IDs; return only those no other caller had already added."""
+        won = await self._store.listing_cache_claim_many(self._engine, urls)
+        if front := await self._front_cache():
+            # Lost ids have an older row whose age we don't know: keep them out of the LRU
+            # (flush expiry needs created_at) and let the database confirm them next time.
+            for url in unique_ids(urls):
+                if url in won:
+                    front.add(url)
+                else:
+                    front.bloom.add(url)
+        return won
+
+    def stats_summary(self) -> str | None:
+        """Front cache hit/miss/false-positive counters, or None without a front cache."""
+        return self._front.stats.summary() if self._front is not None else None
+
+    async def clear(self) -> None:
         """Clear all entries from the cache for this engine."""
-        count = self._store.listing_cache_clear(self._engine)
+        count = await self._store.listing_cache_clear(self._engine)
+        if self._front is not None:
+            self._front.clear()
         logger.info(f"Cache cleared for engine $M${self._engine}$W$: {count} entries removed.")
 
-    def flush_old_entries(self) -> int:
-        """Remove entries older than max_age_days. Returns number removed."""
-        removed = self._store.listing_cache_flush_older_than_days(
-            self._engine, self._max_age_days
-        )
+    async def flush_old_entries(self) -> int:
+        """Drop cache days older than max_age_days, for every engine (partitions are shared by day).
+
+        Returns the number of day partitions dropped.
+        """
+        removed = await self._store.listing_cache_flush_older_than_days(self._max_age_days)
         if removed:
-            logger.info(
-                f"Flushed {removed} cache entries older than {self._max_age_days} days "
-                f"for engine $M${self._engine}$W$"
-            )
+            logger.info(f"Dropped {removed} listing cache day(s) older than {self._max_age_days} days")
+        if front := await self._front_cache():
+            front.expire(self._max_age_days)
+            if front.bloom.saturated:
+                # Flushed ids stay set in the filter; reload it from the table before they pile up.
+                await self._load_front()
         return removed
+
+
+class CacheFlushJob:
+    """Drops expired listing cache days on a schedule of its own, not on every search tick."""
+
+    def __init__(self, cache: DbCache) -> None:
+        self.cache = cache
+
+    @tasks.loop(hours=LISTING_CACHE_FLUSH_HOURS)
+    async def event_loop(self):
+        try:
+            await self.cache.flush_old_entries()
+        except Exception:
+            logger.exception("$R$Listing cache flush failed")
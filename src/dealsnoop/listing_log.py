@@ -137,7 +137,7 @@ class SearchLogCollector:
                 msg = await channel.send(view=view)
                 record = getattr(self._bot, "record_listing_metadata", None)
                 if record is not None:
-                    record(msg.id, channel.id, entry.search_id, None)
+                    await record(msg.id, channel.id, entry.search_id, None)
             except Exception:
                 pass
 
@@ -183,7 +183,7 @@ class SearchLogCollector:
                             msg = await channel.send(view=view)
                             record = getattr(self._bot, "record_listing_metadata", None)
                             if record is not None:
-                                record(msg.id, channel.id, self.search_id, None)
+                                await record(msg.id, channel.id, self.search_id, None)
                         except Exception:
                             pass
 
@@ -5,8 +5,10 @@ import os
 from dealsnoop.bot.client import Client
 from dealsnoop.bot.commands import Commands
 from dealsnoop.engines import FacebookEngine
+from dealsnoop.listing_cache import CacheFlushJob
+from dealsnoop.retention import RetentionJob
 from dealsnoop.snoop import Snoop
-from dealsnoop.store import SearchStore
+from dealsnoop.async_store import AsyncSearchStore
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 DB_URL = os.getenv("DB_URL")
@@ -16,13 +18,17 @@ if not BOT_TOKEN:
 if not DB_URL:
     raise SystemExit("DB_URL environment variable is required.")
 
-searches = SearchStore()
+# Opened (and the schema created) in Client.setup_hook, once the event loop is running.
+searches = AsyncSearchStore()
 
 bot = Client(searches)
 snoop = Snoop(bot, searches)
 bot._snoop = snoop
 
 bot.register_cog(Commands(snoop))
-snoop.register_engine(FacebookEngine(snoop))
+engine = FacebookEngine(snoop)
+snoop.register_engine(engine)
+snoop.register_job(CacheFlushJob(engine.cache))
+snoop.register_job(RetentionJob(searches))
 
 bot.run(token=BOT_TOKEN)
\ No newline at end of file
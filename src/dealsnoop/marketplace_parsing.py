@@ -0,0 +1,293 @@
+"""Extract listing cards from Facebook Marketplace search result pages (no browser required)."""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from bs4 import BeautifulSoup, Tag  # type: ignore[import-untyped]
+
+from dealsnoop.product import ListingCard
+
+# Relay payloads are embedded as <script type="application/json" ... data-sjs>{...}</script>.
+_SJS_SCRIPT_PATTERN = re.compile(r"<script[^>]*\bdata-sjs\b[^>]*>(.*?)</script>", re.DOTALL)
+_LISTING_TITLE_KEY = "marketplace_listing_title"
+_ITEM_HREF_PATTERN = re.compile(r"/marketplace/item/(\d+)")
+_MILEAGE_PATTERN = re.compile(r"\d[\d,.]*[Kk]?\s*(?:miles?|mi)\b", re.IGNORECASE)
+_NUMERIC_PATTERN = re.compile(r"\d[\d,.]*")
+
+
+def listing_url(listing_id: str) -> str:
+    return f"https://facebook.com/marketplace/item/{listing_id}/"
+
+
+def _iter_listing_nodes(data: Any) -> Iterator[dict]:
+    """Yield every dict carrying a listing title, in document order."""
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            if _LISTING_TITLE_KEY in obj:
+                yield obj
+                continue
+            stack.extend(reversed(list(obj.values())))
+        elif isinstance(obj, list):
+            stack.extend(reversed(obj))
+
+
+def _location_from_node(node: dict) -> str:
+    geocode = (node.get("location") or {}).get("reverse_geocode") or {}
+    city = geocode.get("city")
+    state = geocode.get("state")
+    if city and state:
+        return f"{city}, {state}"
+    city_page = geocode.get("city_page") or {}
+    return city_page.get("display_name") or city or ""
+
+
+def _price_from_node(node: dict) -> float:
+    price = node.get("listing_price") or {}
+    amount = price.get("amount")
+    if amount is not None:
+        try:
+            return float(amount)
+        except (TypeError, ValueError):
+            pass
+    match = _NUMERIC_PATTERN.search(price.get("formatted_amount") or "")
+    return float(match.group().replace(",", "")) if match else 0.0
+
+
+def card_from_listing_node(node: dict, search_term: str) -> ListingCard | None:
+    """Build a card from a GraphQL listing node (GroupCommerceProductItem). Returns None without an id."""
+    listing_id = str(node.get("id") or "")
+    if not listing_id.isdigit():
+        return None
+    photo = node.get("primary_listing_photo") or {}
+    img = (photo.get("image") or {}).get("uri")
+    return ListingCard(
+        listing_id=listing_id,
+        url=listing_url(listing_id),
+        title=(node.get(_LISTING_TITLE_KEY) or "").strip(),
+        price=_price_from_node(node),
+        location=_location_from_node(node),
+        img=img,
+        search_term=search_term,
+    )
+
+
+def cards_from_json(data: Any, search_term: str) -> list[ListingCard]:
+    """Return the unique listing cards found anywhere in a decoded JSON document, in order."""
+    cards: list[ListingCard] = []
+    seen: set[str] = set()
+    for node in _iter_listing_nodes(data):
+        card = card_from_listing_node(node, search_term)
+        if card is None or card.listing_id in seen:
+            continue
+        seen.add(card.listing_id)
+        cards.append(card)
+    return cards
+
+
+def extract_cards_from_payload(html: str, search_term: str) -> list[ListingCard]:
+    """Pull listing cards from the data-sjs JSON blobs embedded in a search page.
+
+    Only blobs that mention a listing title are decoded, so the rest of the page is
+    never parsed. Returns an empty list when the payload is absent.
+    """
+    cards: list[ListingCard] = []
+    seen: set[str] = set()
+    for match in _SJS_SCRIPT_PATTERN.finditer(html):
+        blob = match.group(1)
+        if _LISTING_TITLE_KEY not in blob:
+            continue
+        try:
+            data = json.loads(blob)
+        except json.JSONDecodeError:
+            continue
+        for card in cards_from_json(data, search_term):
+            if card.listing_id not in seen:
+                seen.add(card.listing_id)
+                cards.append(card)
+    return cards
+
+
+def _iter_json_documents(body: str) -> Iterator[Any]:
+    """Decode a GraphQL response body: one JSON document, or several separated by newlines."""
+    text = body.strip()
+    if text.startswith("for (;;);"):
+        text = text[len("for (;;);"):]
+    try:
+        yield json.loads(text)
+        return
+    except json.JSONDecodeError:
+        pass
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+
+def cards_from_network_responses(bodies: Iterable[str], search_term: str) -> list[ListingCard]:
+    """Build cards from captured response bodies, in capture order.
+
+    HTML bodies (the search document) go through the embedded payload extractor; everything
+    else is treated as GraphQL JSON. Works the same on live captures and recorded files.
+    """
+    cards: list[ListingCard] = []
+    seen: set[str] = set()
+    for body in bodies:
+        if _LISTING_TITLE_KEY not in body:
+            continue
+        if body.lstrip().startswith("<"):
+            found = extract_cards_from_payload(body, search_term)
+        else:
+            found = [
+                card
+                for document in _iter_json_documents(body)
+                for card in cards_from_json(document, search_term)
+            ]
+        for card in found:
+            if card.listing_id not in seen:
+                seen.add(card.listing_id)
+                cards.append(card)
+    return cards
+
+
+def load_recorded_responses(directory: str | Path) -> list[str]:
+    """Read recorded response bodies (*.json, *.html) from a directory, sorted by file name."""
+    paths = sorted(
+        p for p in Path(directory).iterdir() if p.suffix in (".json", ".html") and p.is_file()
+    )
+    return [p.read_text(encoding="utf-8") for p in paths]
+
+
+def save_recorded_responses(directory: str | Path, prefix: str, bodies: Iterable[str]) -> None:
+    """Write captured response bodies so they can be replayed with load_recorded_responses."""
+    out_dir = Path(directory)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for index, body in enumerate(bodies):
+        suffix = ".html" if body.lstrip().startswith("<") else ".json"
+        (out_dir / f"{prefix}_{index:03d}{suffix}").write_text(body, encoding="utf-8")
+
+
+def card_from_anchor_parts(
+    href: str,
+    img: str | None,
+    lines: list[str],
+    search_term: str,
+) -> ListingCard | None:
+    """Build a card from a rendered listing anchor. Returns None for non-listing anchors."""
+    match = _ITEM_HREF_PATTERN.search(href)
+    if not match or not href.startswith("/marketplace/item/"):
+        return None
+    listing_id = match.group(1)
+    url = f"https://facebook.com{href}"
+    if len(lines) < 2:
+        title = lines[0] if lines else href
+        return ListingCard(
+            listing_id=listing_id,
+            url=url,
+            title=title[:80] + ("..." if len(title) > 80 else ""),
+            price=0.0,
+            location="",
+            img=img,
+            search_term=search_term,
+            malformed=True,
+        )
+
+    # Vehicle listings have extra line: [price, title, location, mileage]
+    # Regular listings: [price, title, location]
+    if len(lines) >= 4 and _MILEAGE_PATTERN.search(lines[-1]):
+        title = lines[-3]
+        location = lines[-2]
+    else:
+        title = lines[-2]
+        location = lines[-1]
+
+    price = 0.0
+    for line in lines:
+        numeric = _NUMERIC_PATTERN.search(line)
+        if numeric:
+            price = float(numeric.group().replace(",", ""))
+            break
+
+    return ListingCard(
+        listing_id=listing_id,
+        url=url,
+        title=title,
+        price=price,
+        location=location,
+        img=img,
+        search_term=search_term,
+    )
+
+
+def cards_from_script_result(raw: object, search_term: str) -> list[ListingCard] | None:
+    """Build cards from the in-page collector's JSON array of [href, src, alt, lines].
+
+    Returns None when the script result is not a JSON array, so callers can fall back
+    to reading the page source.
+    """
+    try:
+        rows = json.loads(raw) if isinstance(raw, str) else None
+    except json.JSONDecodeError:
+        rows = None
+    if not isinstance(rows, list):
+        return None
+    cards: list[ListingCard] = []
+    for row in rows:
+        if not isinstance(row, list) or len(row) < 4 or not isinstance(row[0], str):
+            continue
+        href, src, _alt, lines = row[:4]
+        card = card_from_anchor_parts(
+            href,
+            src if isinstance(src, str) else None,
+            [str(line) for line in lines or []],
+            search_term,
+        )
+        if card is not None:
+            cards.append(card)
+    return cards
+
+
+def parse_detail_script_result(raw: object) -> tuple[str | None, str | None]:
+    """Return (date, description) from the detail-page collector's JSON pair."""
+    try:
+        pair = json.loads(raw) if isinstance(raw, str) else None
+    except json.JSONDecodeError:
+        pair = None
+    if not isinstance(pair, list) or len(pair) != 2:
+        return (None, None)
+    date, description = pair
+    return (
+        date if isinstance(date, str) and date else None,
+        description if isinstance(description, str) and description else None,
+    )
+
+
+def _card_from_anchor(link: Tag, search_term: str) -> ListingCard | None:
+    img_tag = link.find("img")
+    if img_tag is None or "alt" not in getattr(img_tag, "attrs", {}):
+        return None
+    href = link.get("href")
+    if not isinstance(href, str):
+        return None
+    src = img_tag.get("src")
+    lines = [ln.strip() for ln in link.stripped_strings if ln.strip()]
+    return card_from_anchor_parts(href, src if isinstance(src, str) else None, lines, search_term)
+
+
+def extract_cards_from_anchors(soup: BeautifulSoup, search_term: str) -> list[ListingCard]:
+    """Fallback: scrape listing cards from the rendered <a> elements of a parsed page."""
+    cards: list[ListingCard] = []
+    for link in soup.find_all("a"):
+        card = _card_from_anchor(link, search_term)
+        if card is not None:
+            cards.append(card)
+    return cards
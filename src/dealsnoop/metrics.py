@@ -0,0 +1,79 @@
+"""In-process latency histograms, reported to the log (and reset) every METRICS_REPORT_MINUTES."""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is open-ended.
+LATENCY_BUCKETS: tuple[float, ...] = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, math.inf)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    def __init__(self, name: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.buckets = buckets
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (max for the open bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return self.max if math.isinf(bound) else bound
+        return self.max
+
+    def summary(self) -> str:
+        if not self.count:
+            return f"{self.name}: no samples"
+        buckets = " ".join(
+            f"{'>' + _fmt(self.buckets[i - 1]) if math.isinf(bound) else '<=' + _fmt(bound)}:{n}"
+            for i, (bound, n) in enumerate(zip(self.buckets, self.counts))
+            if n
+        )
+        return (
+            f"{self.name}: n={self.count} avg={self.total / self.count:.2f}s "
+            f"p50<={self.quantile(0.5):.2f}s p95<={self.quantile(0.95):.2f}s max={self.max:.2f}s | {buckets}"
+        )
+
+
+def _fmt(seconds: float) -> str:
+    return f"{seconds:g}s"
+
+
+_latencies: dict[str, LatencyHistogram] = {}
+
+
+def observe_latency(name: str, seconds: float) -> None:
+    """Record a duration under `name` (e.g. a page type)."""
+    histogram = _latencies.get(name)
+    if histogram is None:
+        histogram = _latencies[name] = LatencyHistogram(name)
+    histogram.observe(seconds)
+
+
+def latency_report(reset: bool = True) -> list[str]:
+    """Return one summary line per histogram, optionally starting a fresh window."""
+    lines = [h.summary() for _, h in sorted(_latencies.items()) if h.count]
+    if reset:
+        for histogram in _latencies.values():
+            histogram.reset()
+    return lines
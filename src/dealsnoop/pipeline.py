@@ -0,0 +1,177 @@
+"""Staged asyncio pipeline with bounded queues between stages."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Awaitable, Callable, Generic, Iterable, Sequence, TypeVar
+
+from dealsnoop.logger import logger
+
+_DONE = object()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline stage.
+
+    `handler` receives an item from the previous stage and returns the item to pass on,
+    or None to drop it. Up to `concurrency` items are handled at once.
+    """
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+
+
+async def _feed(
+    source: Iterable[Any] | AsyncIterable[Any],
+    queue: asyncio.Queue[Any],
+    consumers: int,
+) -> None:
+    if isinstance(source, AsyncIterable):
+        async for item in source:
+            await queue.put(item)
+    else:
+        for item in source:
+            await queue.put(item)
+    for _ in range(consumers):
+        await queue.put(_DONE)
+
+
+async def _work(
+    stage: Stage,
+    inbox: asyncio.Queue[Any],
+    outbox: asyncio.Queue[Any] | None,
+    label: str,
+) -> None:
+    while True:
+        item = await inbox.get()
+        if item is _DONE:
+            return
+        try:
+            result = await stage.handler(item)
+        except Exception:
+            logger.exception(f"$R${label}: stage '{stage.name}' failed; dropping item")
+            continue
+        if result is not None and outbox is not None:
+            await outbox.put(result)
+
+
+async def _run_stage(
+    stage: Stage,
+    inbox: asyncio.Queue[Any],
+    outbox: asyncio.Queue[Any] | None,
+    next_consumers: int,
+    label: str,
+) -> None:
+    await asyncio.gather(
+        *(_work(stage, inbox, outbox, label) for _ in range(max(1, stage.concurrency)))
+    )
+    if outbox is not None:
+        for _ in range(next_consumers):
+            await outbox.put(_DONE)
+
+
+async def run_pipeline(
+    source: Iterable[Any] | AsyncIterable[Any],
+    stages: Sequence[Stage],
+    queue_size: int = 8,
+    label: str = "pipeline",
+) -> None:
+    """Push every item from `source` through `stages` and wait until all are done.
+
+    Stages are connected by queues of at most `queue_size` items, so a slow stage blocks
+    the ones before it (backpressure) instead of letting work pile up in memory. A handler
+    that raises drops only the item it was processing.
+    """
+    if not stages:
+        return
+    queues: list[asyncio.Queue[Any]] = [asyncio.Queue(maxsize=max(1, queue_size)) for _ in stages]
+    workers = [max(1, stage.concurrency) for stage in stages]
+    tasks = [asyncio.create_task(_feed(source, queues[0], workers[0]))]
+    for i, stage in enumerate(stages):
+        last = i == len(stages) - 1
+        tasks.append(
+            asyncio.create_task(
+                _run_stage(
+                    stage,
+                    queues[i],
+                    None if last else queues[i + 1],
+                    0 if last else workers[i + 1],
+                    label,
+                )
+            )
+        )
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class MicroBatcher(Generic[T, R]):
+    """Groups items submitted concurrently into one `handler(items) -> results` call.
+
+    A batch is sent once `max_size` items are waiting or `max_wait` seconds after its first
+    item arrived, whichever comes first. `handler` must return one result per item, in order;
+    a result that is an exception is raised to that item's caller only. If the handler raises,
+    or returns the wrong number of results, every caller in that batch gets an exception.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[T]], Awaitable[Sequence[R | BaseException]]],
+        max_size: int,
+        max_wait: float,
+    ) -> None:
+        self._handler = handler
+        self._max_size = max(1, max_size)
+        self._max_wait = max_wait
+        self._pending: list[tuple[T, asyncio.Future[R]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task[None]] = set()
+
+    async def submit(self, item: T) -> R:
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future[R]]]) -> None:
+        try:
+            results = await self._handler([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        if len(results) != len(batch):
+            error = RuntimeError(f"batch handler returned {len(results)} result(s) for {len(batch)} item(s)")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,64 @@
+"""Rule-based rejection of listing cards, decided without a browser or a model."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from dealsnoop.product import ListingCard
+from dealsnoop.search_config import SearchConfig
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> set[str]:
+    """Lowercase words with a plural 's' dropped, so "chairs" overlaps "chair"."""
+    return {w[:-1] if len(w) > 3 and w.endswith("s") else w for w in _WORD.findall(text.lower())}
+
+
+def parse_price(text: str | None) -> float | None:
+    """First number in a free-text price such as "$1,200" or "under 300"; None if there is none."""
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", text or "")
+    return float(match.group(0).replace(",", "")) if match else None
+
+
+@dataclass(frozen=True)
+class PreFilter:
+    """One watch's rules, compiled once per search. `check` returns the rule that fired, or None."""
+
+    exclude: re.Pattern[str] | None
+    term_words: frozenset[str] | None
+    max_price: float | None
+    max_price_ratio: float
+
+    def check(self, card: ListingCard) -> str | None:
+        if self.exclude is not None and (match := self.exclude.search(card.title)):
+            return f"Title contains '{match.group(0)}'"
+        if self.max_price is not None and card.price > self.max_price:
+            return f"Price ${card.price:g} over {self.max_price_ratio:g}x target"
+        if self.term_words is not None and not self.term_words & _words(card.title):
+            return "Title shares no words with the search terms"
+        return None
+
+
+def compile_prefilter(
+    search: SearchConfig,
+    exclude_terms: tuple[str, ...] = (),
+    max_price_ratio: float = 0.0,
+    term_overlap: bool = False,
+) -> PreFilter:
+    """Combine the global defaults with the watch's own exclude_terms and max_price_ratio."""
+    keywords = [t.strip() for t in (*exclude_terms, *search.exclude_terms) if t.strip()]
+    # Longest first so "parts only" wins over a shorter keyword it contains.
+    alternatives = "|".join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True))
+    exclude = re.compile(rf"(?<!\w)(?:{alternatives})(?![\w-])", re.IGNORECASE) if keywords else None
+    ratio = search.max_price_ratio if search.max_price_ratio is not None else max_price_ratio
+    target = parse_price(search.target_price)
+    max_price = target * ratio if target and ratio > 0 else None
+    words = frozenset(w for term in search.terms for w in _words(term))
+    return PreFilter(
+        exclude=exclude,
+        term_words=words if term_overlap and words else None,
+        max_price=max_price,
+        max_price_ratio=ratio,
+    )
@@ -11,4 +11,17 @@ class Product:
     location: str
     date: str
     url: str
-    img: str
\ No newline at end of file
+    img: str
+
+@dataclass(frozen=True)
+class ListingCard:
+    """A search-result card, i.e. what is known about a listing before its detail page is loaded."""
+
+    listing_id: str
+    url: str
+    title: str
+    price: float
+    location: str
+    img: str | None
+    search_term: str
+    malformed: bool = False
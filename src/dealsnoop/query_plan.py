@@ -0,0 +1,66 @@
+"""Per-tick query planning: fetch each unique Marketplace results page once for the watches due."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Iterable, NamedTuple, TypeVar
+
+from dealsnoop.search_config import SearchConfig
+
+T = TypeVar("T")
+
+
+class PageQuery(NamedTuple):
+    """Everything that determines the contents of one Marketplace results page."""
+
+    term: str
+    city_code: str
+    radius: int
+    days_listed: int
+    sort: str
+
+
+def normalize_term(term: str) -> str:
+    """Marketplace search is case- and whitespace-insensitive, so "PS5 " and "ps5" share a page."""
+    return " ".join(term.split()).casefold()
+
+
+def page_query(search: SearchConfig, term: str, sort: str) -> PageQuery:
+    return PageQuery(normalize_term(term), search.city_code, search.radius, search.days_listed, sort)
+
+
+def plan_queries(
+    searches: Iterable[SearchConfig], sorts: tuple[str, ...]
+) -> dict[PageQuery, list[str]]:
+    """Group watches by the results pages they need. Returns {query: [watch ids]}."""
+    plan: dict[PageQuery, list[str]] = {}
+    for search in searches:
+        for sort in sorts:
+            for term in search.terms:
+                watch_ids = plan.setdefault(page_query(search, term, sort), [])
+                if search.id not in watch_ids:
+                    watch_ids.append(search.id)
+    return plan
+
+
+class PageMemo(Generic[T]):
+    """Shares one fetch per query between every watch started in the same scheduler tick.
+
+    The first caller starts the fetch; later callers await the same task. A failed fetch
+    raises for every caller of that query.
+    """
+
+    def __init__(self, fetch: Callable[[PageQuery], Awaitable[T]]) -> None:
+        self._fetch = fetch
+        self._tasks: dict[PageQuery, asyncio.Future[T]] = {}
+
+    async def get(self, query: PageQuery) -> T:
+        task = self._tasks.get(query)
+        if task is None:
+            task = self._tasks[query] = asyncio.ensure_future(self._fetch(query))
+        # Shield so one watch being cancelled does not cancel the fetch for the others.
+        return await asyncio.shield(task)
+
+    @property
+    def fetched(self) -> int:
+        return len(self._tasks)
@@ -0,0 +1,120 @@
+"""Background retention for listings, listing_messages, listing_metadata and llm_verdicts."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from discord.ext import tasks  # type: ignore[import-untyped]
+
+from dealsnoop.config import (
+    LLM_CACHE_TTL_DAYS,
+    RETENTION_ARCHIVE_DIR,
+    RETENTION_BATCH_PAUSE,
+    RETENTION_BATCH_SIZE,
+    RETENTION_INTERVAL_HOURS,
+    RETENTION_LISTING_MESSAGES_DAYS,
+    RETENTION_LISTING_METADATA_DAYS,
+    RETENTION_LISTINGS_DAYS,
+)
+from dealsnoop.logger import logger
+from dealsnoop.store import (
+    DELETE_EXPIRED_LISTING_MESSAGES_SQL,
+    DELETE_EXPIRED_LISTING_METADATA_SQL,
+    DELETE_EXPIRED_LISTINGS_SQL,
+    DELETE_EXPIRED_LLM_VERDICTS_SQL,
+)
+
+if TYPE_CHECKING:
+    from dealsnoop.async_store import AsyncSearchStore
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Delete rows of `table` older than `max_age_days` (0 disables) using `delete_sql`."""
+
+    table: str
+    max_age_days: int
+    delete_sql: str
+    archive: bool = True
+
+
+# Messages go before listings: a listing is only deleted once no message references it.
+RETENTION_POLICIES: tuple[RetentionPolicy, ...] = (
+    RetentionPolicy("listing_messages", RETENTION_LISTING_MESSAGES_DAYS, DELETE_EXPIRED_LISTING_MESSAGES_SQL),
+    RetentionPolicy("listing_metadata", RETENTION_LISTING_METADATA_DAYS, DELETE_EXPIRED_LISTING_METADATA_SQL),
+    RetentionPolicy("listings", RETENTION_LISTINGS_DAYS, DELETE_EXPIRED_LISTINGS_SQL),
+    RetentionPolicy("llm_verdicts", LLM_CACHE_TTL_DAYS, DELETE_EXPIRED_LLM_VERDICTS_SQL, archive=False),
+)
+
+
+class JsonlArchive:
+    """Appends rows to <directory>/<table>-<YYYYMMDD>.jsonl.gz (one gzip member per batch).
+
+    Rows are written and fsynced before their delete commits, so a crash in between archives
+    them twice rather than losing them.
+    """
+
+    def __init__(self, directory: str, table: str) -> None:
+        self.directory = directory
+        self.table = table
+
+    def __call__(self, rows: list[dict]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        path = os.path.join(self.directory, f"{self.table}-{day}.jsonl.gz")
+        with open(path, "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                for row in rows:
+                    f.write(json.dumps(row, default=str).encode("utf-8") + b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+
+
+class RetentionJob:
+    """Periodically deletes expired rows table by table, in bounded batches."""
+
+    def __init__(
+        self,
+        store: AsyncSearchStore,
+        policies: tuple[RetentionPolicy, ...] = RETENTION_POLICIES,
+        archive_dir: str = RETENTION_ARCHIVE_DIR,
+    ) -> None:
+        self.store = store
+        self.policies = tuple(p for p in policies if p.max_age_days > 0)
+        self.archive_dir = archive_dir
+
+    async def run_once(self) -> dict[str, int]:
+        """Apply every policy until no expired rows are left. Returns rows deleted per table."""
+        deleted: dict[str, int] = {}
+        for policy in self.policies:
+            archive = JsonlArchive(self.archive_dir, policy.table) if self.archive_dir and policy.archive else None
+            total = 0
+            while True:
+                count = await self.store.delete_expired_batch(
+                    policy.delete_sql, policy.max_age_days, RETENTION_BATCH_SIZE, archive
+                )
+                total += count
+                if count < RETENTION_BATCH_SIZE:
+                    break
+                await asyncio.sleep(RETENTION_BATCH_PAUSE)
+            deleted[policy.table] = total
+            if total:
+                archived = f", archived to $M${self.archive_dir}$W$" if archive else ""
+                logger.info(
+                    f"Retention: deleted {total} {policy.table} row(s) older than "
+                    f"{policy.max_age_days} days{archived}"
+                )
+        return deleted
+
+    @tasks.loop(hours=RETENTION_INTERVAL_HOURS)
+    async def event_loop(self):
+        try:
+            await self.run_once()
+        except Exception:
+            logger.exception("$R$Retention run failed")
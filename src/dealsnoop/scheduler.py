@@ -0,0 +1,168 @@
+"""Adaptive per-watch polling schedule driven by how often a watch sees new listings."""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+# Weight of the latest run in the smoothed new-listing rate.
+RATE_SMOOTHING = 0.3
+
+# Largest factor an interval may grow by after a single run.
+MAX_BACKOFF = 2.0
+
+# Random spread applied to each interval so watches do not drift back into lockstep.
+INTERVAL_JITTER = 0.1
+
+
+@dataclass
+class _WatchState:
+    next_due: float
+    interval: float
+    last_run: float | None = None
+    rate: float | None = None  # smoothed new listings per second
+    running: bool = False
+
+
+class WatchScheduler:
+    """Keeps a next-due time per watch and adapts each interval to its listing velocity.
+
+    A watch that keeps finding new listings is polled more often (down to `min_interval`);
+    a quiet one backs off (up to `max_interval`). The interval aims for about `target_new`
+    new listings per run. Newly added watches are phased evenly across `base_interval`,
+    so runs are spread out instead of all firing at once. A watch between `start` and
+    `finish` is never reported due again. Times are time.monotonic() seconds.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        base_interval: float,
+        target_new: float,
+        align_fraction: float = 0.0,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.base_interval = min(max(base_interval, self.min_interval), self.max_interval)
+        self.target_new = max(target_new, 0.1)
+        self.align_fraction = max(align_fraction, 0.0)
+        self._watches: dict[str, _WatchState] = {}
+
+    def sync(
+        self, watch_ids: set[str], now: float | None = None, groups: Iterable[list[str]] = ()
+    ) -> None:
+        """Track exactly these watches; new ones are staggered over the base interval.
+
+        A new watch that shares a group (see `align`) with a tracked watch takes that watch's
+        next-due time instead, and new watches sharing a group get the same slot.
+        """
+        now = time.monotonic() if now is None else now
+        for watch_id in set(self._watches) - watch_ids:
+            del self._watches[watch_id]
+        added = sorted(watch_ids - set(self._watches))
+        if not added:
+            return
+        peers: dict[str, set[str]] = {}
+        for group in groups:
+            for watch_id in group:
+                peers.setdefault(watch_id, set()).update(group)
+        slots: list[list[str]] = []
+        for watch_id in added:
+            own_peers = peers.get(watch_id, set())
+            tracked = next((self._watches[p] for p in sorted(own_peers) if p in self._watches), None)
+            if tracked is not None:
+                self._watches[watch_id] = _WatchState(next_due=tracked.next_due, interval=self.base_interval)
+                continue
+            slot = next((s for s in slots if own_peers & set(s)), None)
+            if slot is None:
+                slots.append([watch_id])
+            else:
+                slot.append(watch_id)
+        for i, slot in enumerate(slots):
+            offset = self.base_interval * i / len(slots)
+            for watch_id in slot:
+                self._watches[watch_id] = _WatchState(next_due=now + offset, interval=self.base_interval)
+
+    def due(self, now: float | None = None) -> list[str]:
+        """Watch ids whose next run is due, most overdue first."""
+        now = time.monotonic() if now is None else now
+        ready = [
+            (state.next_due, watch_id)
+            for watch_id, state in self._watches.items()
+            if state.next_due <= now and not state.running
+        ]
+        return [watch_id for _, watch_id in sorted(ready)]
+
+    def align(self, due: list[str], groups: Iterable[list[str]], now: float | None = None) -> list[str]:
+        """Add idle watches that share a group with a due watch and are nearly due themselves.
+
+        `groups` are watch ids that fetch the same results page (see plan_queries). A watch
+        joins early when its remaining wait is at most `align_fraction` of its interval, so
+        watches on one query converge on the same ticks and can share that page.
+        """
+        if self.align_fraction <= 0:
+            return due
+        now = time.monotonic() if now is None else now
+        selected = set(due)
+        joined: list[str] = []
+        for group in groups:
+            if selected.isdisjoint(group):
+                continue
+            for watch_id in group:
+                state = self._watches.get(watch_id)
+                if (
+                    watch_id not in selected
+                    and state is not None
+                    and not state.running
+                    and state.next_due - now <= self.align_fraction * state.interval
+                ):
+                    selected.add(watch_id)
+                    joined.append(watch_id)
+        return due + joined
+
+    def start(self, watch_id: str) -> None:
+        """Mark a watch as running so `due` skips it until `finish`."""
+        if state := self._watches.get(watch_id):
+            state.running = True
+
+    def finish(self, watch_id: str) -> None:
+        if state := self._watches.get(watch_id):
+            state.running = False
+
+    @property
+    def running(self) -> int:
+        return sum(state.running for state in self._watches.values())
+
+    def force_due(self) -> None:
+        """Make every watch due on the next tick."""
+        now = time.monotonic()
+        for state in self._watches.values():
+            state.next_due = now
+
+    def record(self, watch_id: str, new_listings: int, now: float | None = None) -> float:
+        """Update a watch's rate after a run and schedule its next one. Returns the interval."""
+        now = time.monotonic() if now is None else now
+        state = self._watches.get(watch_id)
+        if state is None:
+            state = self._watches[watch_id] = _WatchState(next_due=now, interval=self.base_interval)
+        if state.last_run is not None:
+            observed = new_listings / max(now - state.last_run, 1.0)
+            state.rate = (
+                observed if state.rate is None
+                else RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * state.rate
+            )
+            interval = self.target_new / state.rate if state.rate > 0 else self.max_interval
+            # Speed up right away, but back off at most 2x per run so one quiet run is not decisive.
+            interval = min(interval, state.interval * MAX_BACKOFF)
+            state.interval = min(max(interval, self.min_interval), self.max_interval)
+        state.last_run = now
+        jitter = random.uniform(-INTERVAL_JITTER, INTERVAL_JITTER) * state.interval
+        state.next_due = now + state.interval + jitter
+        return state.interval
+
+    def rate_per_hour(self, watch_id: str) -> float | None:
+        state = self._watches.get(watch_id)
+        return None if state is None or state.rate is None else state.rate * 3600
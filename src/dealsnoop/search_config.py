@@ -16,6 +16,10 @@ def build_watch_command(config: SearchConfig, channel_id: int) -> str:
         parts.append(f"target_price:{config.target_price}")
     if config.context:
         parts.append(f"context:{config.context}")
+    if config.exclude_terms:
+        parts.append(f"exclude_terms:{', '.join(config.exclude_terms)}")
+    if config.max_price_ratio:
+        parts.append(f"max_price_ratio:{config.max_price_ratio:g}")
     parts.extend([
         f"city_code:{config.city_code}",
         f"days_listed:{config.days_listed}",
@@ -35,4 +39,8 @@ class SearchConfig:
     days_listed: int = 1
     radius: int = 30
     context: str | None = None
-    owner_id: int | None = None
\ No newline at end of file
+    owner_id: int | None = None
+    # Pre-filter rules: title keywords that reject a listing (on top of the global ones), and
+    # the price multiple of target_price above which it is rejected (None = global default).
+    exclude_terms: tuple[str, ...] = ()
+    max_price_ratio: float | None = None
\ No newline at end of file
@@ -7,7 +7,7 @@ from typing import Protocol
 import discord  # type: ignore[import-untyped]
 from dealsnoop.logger import logger
 from dealsnoop.bot.client import Client
-from dealsnoop.store import SearchStore
+from dealsnoop.async_store import AsyncSearchStore
 from discord.ext.tasks import Loop  # type: ignore[import-untyped]
 
 
@@ -16,27 +16,51 @@ class Engine(Protocol):
     event_loop: Loop
 
 
+class Job(Protocol):
+    event_loop: Loop
+
+
 class Snoop:
     bot: Client
-    searches: SearchStore
+    searches: AsyncSearchStore
     engines: set[Engine]
+    jobs: list[Job]
 
-    def __init__(self, bot: Client, searches: SearchStore):
+    def __init__(self, bot: Client, searches: AsyncSearchStore):
         self.bot = bot
         self.bot.on_ready = self.on_ready
+        self.bot.register_shutdown_hook(self.close)
 
         self.searches = searches
         self.engines = set()
+        self.jobs = []
 
     def register_engine(self, engine: Engine):
         self.engines.add(engine)
         engine.snoop = self
 
+    def register_job(self, job: Job):
+        """Register a background job (e.g. retention) whose loop starts with the engines."""
+        self.jobs.append(job)
+
     def trigger_search_and_reset_timer(self) -> None:
-        """Trigger a search now and reset the 5-minute loop timer for each engine."""
+        """Make every watch due and restart each engine's loop so the search starts now."""
         for engine in self.engines:
+            force_due = getattr(engine, "force_due", None)
+            if force_due is not None:
+                force_due()
             engine.event_loop.restart()
 
+    async def close(self) -> None:
+        """Stop every loop and let engines release what they hold (e.g. browsers)."""
+        for job in self.jobs:
+            job.event_loop.cancel()
+        for engine in self.engines:
+            engine.event_loop.cancel()
+            close = getattr(engine, "close", None)
+            if close is not None:
+                await close()
+
     def _is_plausible_location(self, text: str) -> bool:
         """Reject product titles etc. Real locations have short city part (e.g. City, ST)."""
         if not text or "," not in text:
@@ -46,7 +70,7 @@ class Snoop:
 
     async def get_location_for_city_code(self, city_code: str) -> str:
         """Resolve and cache human-readable location name for a city code."""
-        cached = self.searches.get_location_name(city_code)
+        cached = await self.searches.get_location_name(city_code)
         if cached and self._is_plausible_location(cached):
             return cached
         if cached and not self._is_plausible_location(cached):
@@ -61,19 +85,19 @@ class Snoop:
             if resolver is None:
                 continue
             location_name = await resolver(city_code)
-            self.searches.set_location_name(city_code, location_name)
+            await self.searches.set_location_name(city_code, location_name)
             return location_name
 
         logger.warning("No engine available to resolve city code %s; using city code as fallback.", city_code)
-        self.searches.set_location_name(city_code, city_code)
+        await self.searches.set_location_name(city_code, city_code)
         return city_code
 
     async def run_cleanup_async(
         self, guild: discord.Guild
     ) -> tuple[int, int, list[str]]:
         """Delete bot-owned channels with no active watches and empty categories. Returns (deleted_channels, deleted_categories, errors)."""
-        bot_owned = self.searches.get_bot_owned_channels()
-        with_watches = self.searches.get_channels_with_active_watches()
+        bot_owned = await self.searches.get_bot_owned_channels()
+        with_watches = await self.searches.get_channels_with_active_watches()
         to_delete = bot_owned - with_watches
 
         deleted_channels = 0
@@ -83,31 +107,31 @@ class Snoop:
         for channel_id in to_delete:
             channel = guild.get_channel(channel_id)
             if channel is None:
-                self.searches.remove_bot_owned_channel(channel_id)
+                await self.searches.remove_bot_owned_channel(channel_id)
                 continue
             if not isinstance(channel, discord.TextChannel):
                 continue
             try:
                 await channel.delete()
-                self.searches.remove_bot_owned_channel(channel_id)
+                await self.searches.remove_bot_owned_channel(channel_id)
                 deleted_channels += 1
             except discord.Forbidden:
                 errors.append(f"Cannot delete <#{channel_id}>: missing permissions")
             except discord.HTTPException as e:
                 errors.append(f"Cannot delete <#{channel_id}>: {e}")
 
-        bot_owned_cats = self.searches.get_bot_owned_categories()
+        bot_owned_cats = await self.searches.get_bot_owned_categories()
         for category_id in bot_owned_cats:
             category = guild.get_channel(category_id)
             if category is None:
-                self.searches.remove_bot_owned_category(category_id)
+                await self.searches.remove_bot_owned_category(category_id)
                 continue
             if not isinstance(category, discord.CategoryChannel):
                 continue
             if len(category.channels) == 0:
                 try:
                     await category.delete()
-                    self.searches.remove_bot_owned_category(category_id)
+                    await self.searches.remove_bot_owned_category(category_id)
                     deleted_categories += 1
                 except discord.Forbidden:
                     errors.append(f"Cannot delete category {category.name}: missing permissions")
@@ -119,9 +143,12 @@ class Snoop:
     async def on_ready(self):
         for engine in self.engines:
             engine.event_loop.start()
+        for job in self.jobs:
+            if not job.event_loop.is_running():
+                job.event_loop.start()
         logger.info("$G$Bot started successfully.")
 
-        feed_channel_id = self.searches.get_feed_channel_id()
+        feed_channel_id = await self.searches.get_feed_channel_id()
         if feed_channel_id:
             channel = self.bot.get_channel(feed_channel_id)
             if channel is not None:
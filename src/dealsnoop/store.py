@@ -1,15 +1,14 @@
-"""PostgreSQL-backed storage for search configurations."""
+"""PostgreSQL schema, migrations, SQL and row helpers for search configurations and listings.
+
+AsyncSearchStore (async_store.py) runs these statements; this module holds no connections.
+"""
 
 from __future__ import annotations
 
 import json
-import os
+from dataclasses import dataclass
 from typing import TypedDict
 
-import psycopg
-from psycopg.rows import dict_row
-
-from dealsnoop.logger import logger
 from dealsnoop.search_config import SearchConfig
 from dealsnoop.user_location import UserLocation
 
@@ -111,6 +110,107 @@ CREATE TABLE IF NOT EXISTS listing_messages (
 );
 """
 
+# listing_cache is range-partitioned by UTC day (created_day) so expiring old entries is a
+# partition drop. The primary key has to include the partition key, so one id may have a row
+# in several days' partitions; lookups match any of them and claims check all of them.
+LISTING_CACHE_PARTITIONED_TABLE_SQL = """
+CREATE TABLE listing_cache (
+    engine VARCHAR(50) NOT NULL,
+    listing_id VARCHAR(255) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    created_day DATE NOT NULL DEFAULT (NOW() AT TIME ZONE 'UTC')::date,
+    PRIMARY KEY (engine, listing_id, created_day)
+) PARTITION BY RANGE (created_day);
+"""
+
+# Creates the daily partitions first_day..last_day that do not exist yet (named
+# listing_cache_pYYYYMMDD); a partition created concurrently by another process is skipped.
+LISTING_CACHE_ENSURE_PARTITIONS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION listing_cache_ensure_partitions(first_day DATE, last_day DATE)
+RETURNS void AS $$
+DECLARE
+    d DATE := first_day;
+BEGIN
+    WHILE d <= last_day LOOP
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF listing_cache FOR VALUES FROM (%L) TO (%L)',
+                'listing_cache_p' || to_char(d, 'YYYYMMDD'), d, d + 1
+            );
+        EXCEPTION WHEN duplicate_table THEN
+            NULL;
+        END;
+        d := d + 1;
+    END LOOP;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Drops the daily partitions for days before cutoff and returns how many were dropped.
+LISTING_CACHE_DROP_PARTITIONS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION listing_cache_drop_partitions_before(cutoff DATE)
+RETURNS INT AS $$
+DECLARE
+    part RECORD;
+    dropped INT := 0;
+BEGIN
+    FOR part IN
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'listing_cache'::regclass
+          AND c.relname ~ '^listing_cache_p[0-9]{8}$'
+          AND to_date(substring(c.relname FROM 16), 'YYYYMMDD') < cutoff
+    LOOP
+        EXECUTE format('DROP TABLE IF EXISTS %I', part.relname);
+        dropped := dropped + 1;
+    END LOOP;
+    RETURN dropped;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Moves the existing cache (last 7 days; older rows were due for flushing anyway) into
+# partitions, creating one per day from the oldest kept row through a week ahead.
+MIGRATE_LISTING_CACHE_PARTITIONS_SQL: tuple[str, ...] = (
+    "ALTER TABLE listing_cache RENAME TO listing_cache_unpartitioned",
+    "ALTER TABLE listing_cache_unpartitioned RENAME CONSTRAINT listing_cache_pkey "
+    "TO listing_cache_unpartitioned_pkey",
+    LISTING_CACHE_PARTITIONED_TABLE_SQL,
+    LISTING_CACHE_ENSURE_PARTITIONS_FUNCTION_SQL,
+    LISTING_CACHE_DROP_PARTITIONS_FUNCTION_SQL,
+    """
+    SELECT listing_cache_ensure_partitions(
+        LEAST(
+            GREATEST(
+                COALESCE(
+                    (SELECT MIN(created_at AT TIME ZONE 'UTC')::date FROM listing_cache_unpartitioned),
+                    (NOW() AT TIME ZONE 'UTC')::date
+                ),
+                (NOW() AT TIME ZONE 'UTC')::date - 7
+            ),
+            (NOW() AT TIME ZONE 'UTC')::date
+        ),
+        (NOW() AT TIME ZONE 'UTC')::date + 7
+    )
+    """,
+    """
+    INSERT INTO listing_cache (engine, listing_id, created_at, created_day)
+    SELECT engine, listing_id, COALESCE(created_at, NOW()), (COALESCE(created_at, NOW()) AT TIME ZONE 'UTC')::date
+    FROM listing_cache_unpartitioned
+    WHERE created_at IS NULL OR created_at >= NOW() - INTERVAL '7 days'
+    """,
+    "DROP TABLE listing_cache_unpartitioned",
+)
+
+LLM_VERDICTS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS llm_verdicts (
+    key CHAR(64) PRIMARY KEY,
+    passed BOOLEAN NOT NULL,
+    thought_trace TEXT NOT NULL,
+    strengths_summary TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
 BOT_OWNED_CHANNELS_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS bot_owned_channels (
     channel_id BIGINT PRIMARY KEY
@@ -123,14 +223,360 @@ CREATE TABLE IF NOT EXISTS bot_owned_categories (
 );
 """
 
+@dataclass(frozen=True)
+class Migration:
+    """One schema step; applied once, in version order, and recorded in schema_version."""
+
+    version: int
+    name: str
+    statements: tuple[str, ...]
+
+
+# Append new steps with the next version number; never edit or reorder applied ones.
+# Version 1 is the schema that used to be re-created on every startup, so its statements stay
+# idempotent for databases created before schema_version existed.
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        1,
+        "baseline",
+        (
+            CREATE_TABLE_SQL,
+            BOT_CONFIG_TABLE_SQL,
+            USER_LOCATIONS_TABLE_SQL,
+            LOCATION_CACHE_TABLE_SQL,
+            LISTING_CACHE_TABLE_SQL,
+            LISTING_METADATA_TABLE_SQL,
+            LISTINGS_TABLE_SQL,
+            LISTING_MESSAGES_TABLE_SQL,
+            BOT_OWNED_CHANNELS_TABLE_SQL,
+            BOT_OWNED_CATEGORIES_TABLE_SQL,
+            "ALTER TABLE searches DROP COLUMN IF EXISTS city",
+            "ALTER TABLE searches ADD COLUMN IF NOT EXISTS location_name TEXT",
+            "ALTER TABLE searches ADD COLUMN IF NOT EXISTS owner_id BIGINT",
+            "ALTER TABLE listings ADD COLUMN IF NOT EXISTS ai_strengths TEXT",
+        ),
+    ),
+    Migration(
+        2,
+        "hot query indexes",
+        (
+            "CREATE INDEX IF NOT EXISTS listings_search_id_idx ON listings (search_id)",
+            "CREATE INDEX IF NOT EXISTS listing_messages_listing_id_idx ON listing_messages (listing_id)",
+            "CREATE INDEX IF NOT EXISTS listing_metadata_search_id_idx ON listing_metadata (search_id)",
+        ),
+    ),
+    # No (engine, created_at) index on listing_cache: expiry drops whole day partitions instead
+    # of deleting rows by age, and the only created_at ordering is the front-cache load at startup.
+    Migration(3, "partition listing_cache by day", MIGRATE_LISTING_CACHE_PARTITIONS_SQL),
+    Migration(
+        4,
+        "retention timestamps",
+        (
+            # Existing rows get the migration time, so they age out one retention period later.
+            "ALTER TABLE listing_messages ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ DEFAULT NOW()",
+            "ALTER TABLE listing_metadata ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ DEFAULT NOW()",
+            "CREATE INDEX IF NOT EXISTS listings_created_at_idx ON listings (created_at)",
+            "CREATE INDEX IF NOT EXISTS listing_messages_created_at_idx ON listing_messages (created_at)",
+            "CREATE INDEX IF NOT EXISTS listing_metadata_created_at_idx ON listing_metadata (created_at)",
+        ),
+    ),
+    Migration(
+        5,
+        "llm verdict cache",
+        (
+            LLM_VERDICTS_TABLE_SQL,
+            "CREATE INDEX IF NOT EXISTS llm_verdicts_created_at_idx ON llm_verdicts (created_at)",
+        ),
+    ),
+    Migration(
+        6,
+        "watch pre-filter rules",
+        (
+            "ALTER TABLE searches ADD COLUMN IF NOT EXISTS exclude_terms JSONB NOT NULL DEFAULT '[]'::jsonb",
+            "ALTER TABLE searches ADD COLUMN IF NOT EXISTS max_price_ratio REAL",
+        ),
+    ),
+)
+
+SCHEMA_VERSION_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+SELECT_SCHEMA_VERSION_SQL = "SELECT COALESCE(MAX(version), 0) AS version FROM schema_version"
+INSERT_SCHEMA_VERSION_SQL = "INSERT INTO schema_version (version, name) VALUES (%s, %s)"
+
+# Serializes migrations between processes starting at the same time (released at commit).
+MIGRATION_LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext('dealsnoop_schema_migrations'))"
+
+
+def pending_migrations(current_version: int) -> list[Migration]:
+    """Migrations newer than current_version, in order."""
+    return [m for m in MIGRATIONS if m.version > current_version]
+
+# Queries run by AsyncSearchStore (dealsnoop.async_store) and the retention job.
+
+UPSERT_SEARCH_SQL = """
+INSERT INTO searches (
+    id, terms, channel, city_code, location_name, target_price, days_listed, radius, context, owner_id,
+    exclude_terms, max_price_ratio
+)
+VALUES (%s, %s::jsonb, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s)
+ON CONFLICT (id) DO UPDATE SET
+    terms = EXCLUDED.terms,
+    channel = EXCLUDED.channel,
+    city_code = EXCLUDED.city_code,
+    location_name = EXCLUDED.location_name,
+    target_price = EXCLUDED.target_price,
+    days_listed = EXCLUDED.days_listed,
+    radius = EXCLUDED.radius,
+    context = EXCLUDED.context,
+    owner_id = COALESCE(EXCLUDED.owner_id, searches.owner_id),
+    exclude_terms = EXCLUDED.exclude_terms,
+    max_price_ratio = EXCLUDED.max_price_ratio
+"""
+
+DELETE_SEARCH_SQL = "DELETE FROM searches WHERE id = %s"
+SELECT_SEARCHES_SQL = "SELECT * FROM searches"
+SELECT_SEARCH_SQL = "SELECT * FROM searches WHERE id = %s"
+TRUNCATE_SEARCHES_SQL = "TRUNCATE TABLE searches"
+SELECT_WATCH_CHANNELS_SQL = "SELECT DISTINCT channel FROM searches"
+
+UPSERT_LISTING_METADATA_SQL = """
+INSERT INTO listing_metadata (message_id, channel_id, search_id, thought_trace)
+VALUES (%s, %s, %s, %s)
+ON CONFLICT (message_id) DO UPDATE SET
+    channel_id = EXCLUDED.channel_id,
+    search_id = EXCLUDED.search_id,
+    thought_trace = EXCLUDED.thought_trace
+"""
+
+SELECT_LISTING_METADATA_SQL = "SELECT search_id, thought_trace FROM listing_metadata WHERE message_id = %s"
+
+UPSERT_LISTING_SQL = """
+INSERT INTO listings (
+    id, search_id, title, description, price, location,
+    date, url, img, thought_trace, ai_strengths, watch_command
+)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (id) DO UPDATE SET
+    search_id = EXCLUDED.search_id,
+    title = EXCLUDED.title,
+    description = EXCLUDED.description,
+    price = EXCLUDED.price,
+    location = EXCLUDED.location,
+    date = EXCLUDED.date,
+    url = EXCLUDED.url,
+    img = EXCLUDED.img,
+    thought_trace = EXCLUDED.thought_trace,
+    ai_strengths = EXCLUDED.ai_strengths,
+    watch_command = EXCLUDED.watch_command
+"""
+
+SELECT_LISTING_SQL = "SELECT * FROM listings WHERE id = %s"
+
+UPSERT_LISTING_MESSAGE_SQL = """
+INSERT INTO listing_messages (message_id, listing_id, channel_id)
+VALUES (%s, %s, %s)
+ON CONFLICT (message_id) DO UPDATE SET
+    listing_id = EXCLUDED.listing_id,
+    channel_id = EXCLUDED.channel_id
+"""
+
+SELECT_LISTING_BY_MESSAGE_SQL = """
+SELECT l.* FROM listings l
+JOIN listing_messages lm ON lm.listing_id = l.id
+WHERE lm.message_id = %s
+"""
+
+SELECT_BOT_CONFIG_SQL = "SELECT value FROM bot_config WHERE key = %s"
+DELETE_BOT_CONFIG_SQL = "DELETE FROM bot_config WHERE key = %s"
+
+UPSERT_BOT_CONFIG_SQL = """
+INSERT INTO bot_config (key, value)
+VALUES (%s, %s)
+ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+"""
+
+SELECT_ALL_BOT_CONFIG_SQL = "SELECT key, value FROM bot_config"
+
+# Writers to searches / bot_config notify this channel (payload: the table name) in the same
+# transaction, so every process caching them drops its copy as soon as the change commits.
+CONFIG_NOTIFY_CHANNEL = "dealsnoop_config"
+NOTIFY_CONFIG_SQL = f"SELECT pg_notify('{CONFIG_NOTIFY_CHANNEL}', %s)"
+LISTEN_CONFIG_SQL = f"LISTEN {CONFIG_NOTIFY_CHANNEL}"
+
+INSERT_BOT_OWNED_CHANNEL_SQL = (
+    "INSERT INTO bot_owned_channels (channel_id) VALUES (%s) ON CONFLICT (channel_id) DO NOTHING"
+)
+INSERT_BOT_OWNED_CATEGORY_SQL = (
+    "INSERT INTO bot_owned_categories (category_id) VALUES (%s) ON CONFLICT (category_id) DO NOTHING"
+)
+SELECT_BOT_OWNED_CHANNELS_SQL = "SELECT channel_id FROM bot_owned_channels"
+SELECT_BOT_OWNED_CATEGORIES_SQL = "SELECT category_id FROM bot_owned_categories"
+DELETE_BOT_OWNED_CHANNEL_SQL = "DELETE FROM bot_owned_channels WHERE channel_id = %s"
+DELETE_BOT_OWNED_CATEGORY_SQL = "DELETE FROM bot_owned_categories WHERE category_id = %s"
+
+SELECT_USER_LOCATION_SQL = "SELECT user_id, city_code FROM user_locations WHERE user_id = %s"
+
+UPSERT_USER_LOCATION_SQL = """
+INSERT INTO user_locations (user_id, city_code)
+VALUES (%s, %s)
+ON CONFLICT (user_id) DO UPDATE SET
+    city_code = EXCLUDED.city_code,
+    updated_at = NOW()
+"""
+
+DELETE_USER_LOCATION_SQL = "DELETE FROM user_locations WHERE user_id = %s"
+
+SELECT_LOCATION_NAME_SQL = "SELECT location_name FROM location_cache WHERE city_code = %s"
+
+UPSERT_LOCATION_NAME_SQL = """
+INSERT INTO location_cache (city_code, location_name)
+VALUES (%s, %s)
+ON CONFLICT (city_code) DO UPDATE SET
+    location_name = EXCLUDED.location_name
+"""
+
+DELETE_LOCATION_CACHE_SQL = "DELETE FROM location_cache"
+
+SELECT_LISTING_CACHE_SQL = "SELECT 1 FROM listing_cache WHERE engine = %s AND listing_id = %s"
+
+# Refreshing an entry writes it into today's partition; a copy in an older partition is left
+# to expire with that partition.
+UPSERT_LISTING_CACHE_SQL = """
+INSERT INTO listing_cache (engine, listing_id, created_at)
+VALUES (%s, %s, NOW())
+ON CONFLICT (engine, listing_id, created_day) DO UPDATE SET created_at = NOW()
+"""
+
+SELECT_LISTING_CACHE_ROWS_SQL = (
+    "SELECT listing_id, created_at FROM listing_cache WHERE engine = %s ORDER BY created_at"
+)
 
-def _row_to_config(row: dict) -> SearchConfig:
+SELECT_LISTING_CACHE_MANY_SQL = "SELECT listing_id FROM listing_cache WHERE engine = %s AND listing_id = ANY(%s)"
+
+# Claims run in one transaction: lock every id (sorted, so overlapping claims cannot
+# deadlock), then insert the ids no partition has yet and return them. The locks make this
+# atomic across partitions, where the primary key alone (per day) would not.
+LOCK_LISTING_CACHE_IDS_SQL = """
+SELECT pg_advisory_xact_lock(hashtextextended(%s || ':' || listing_id, 0))
+FROM (SELECT DISTINCT listing_id FROM unnest(%s::varchar[]) AS listing_id ORDER BY listing_id) AS ids
+"""
+
+CLAIM_LISTING_CACHE_MANY_SQL = """
+INSERT INTO listing_cache (engine, listing_id, created_at)
+SELECT %s, new.listing_id, NOW() FROM unnest(%s::varchar[]) AS new(listing_id)
+WHERE NOT EXISTS (
+    SELECT 1 FROM listing_cache c WHERE c.engine = %s AND c.listing_id = new.listing_id
+)
+ON CONFLICT (engine, listing_id, created_day) DO NOTHING
+RETURNING listing_id
+"""
+
+DELETE_LISTING_CACHE_SQL = "DELETE FROM listing_cache WHERE engine = %s"
+
+# Expiry drops whole days (for every engine): entries live between `days` and `days + 1` days.
+DROP_OLD_LISTING_CACHE_PARTITIONS_SQL = (
+    "SELECT listing_cache_drop_partitions_before((NOW() AT TIME ZONE 'UTC')::date - %s) AS dropped"
+)
+
+ENSURE_LISTING_CACHE_PARTITIONS_SQL = """
+SELECT listing_cache_ensure_partitions(
+    (NOW() AT TIME ZONE 'UTC')::date, (NOW() AT TIME ZONE 'UTC')::date + %s
+)
+"""
+
+# Retention: each statement deletes at most %s rows older than %s days and returns them for
+# archiving (params: days, limit). SKIP LOCKED keeps a batch from waiting on rows in use.
+DELETE_EXPIRED_LISTING_MESSAGES_SQL = """
+DELETE FROM listing_messages WHERE message_id IN (
+    SELECT message_id FROM listing_messages
+    WHERE created_at < NOW() - make_interval(days => %s)
+    ORDER BY created_at LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING *
+"""
+
+DELETE_EXPIRED_LISTING_METADATA_SQL = """
+DELETE FROM listing_metadata WHERE message_id IN (
+    SELECT message_id FROM listing_metadata
+    WHERE created_at < NOW() - make_interval(days => %s)
+    ORDER BY created_at LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING *
+"""
+
+# Listings still referenced by a message are kept until that message expires.
+DELETE_EXPIRED_LISTINGS_SQL = """
+DELETE FROM listings WHERE id IN (
+    SELECT l.id FROM listings l
+    WHERE l.created_at < NOW() - make_interval(days => %s)
+      AND NOT EXISTS (SELECT 1 FROM listing_messages m WHERE m.listing_id = l.id)
+    ORDER BY l.created_at LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING *
+"""
+
+DELETE_EXPIRED_LLM_VERDICTS_SQL = """
+DELETE FROM llm_verdicts WHERE key IN (
+    SELECT key FROM llm_verdicts
+    WHERE created_at < NOW() - make_interval(days => %s)
+    ORDER BY created_at LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING *
+"""
+
+SELECT_LLM_VERDICT_SQL = """
+SELECT passed, thought_trace, strengths_summary FROM llm_verdicts
+WHERE key = %s AND created_at >= NOW() - make_interval(days => %s)
+"""
+
+UPSERT_LLM_VERDICT_SQL = """
+INSERT INTO llm_verdicts (key, passed, thought_trace, strengths_summary, created_at)
+VALUES (%s, %s, %s, %s, NOW())
+ON CONFLICT (key) DO UPDATE SET
+    passed = EXCLUDED.passed,
+    thought_trace = EXCLUDED.thought_trace,
+    strengths_summary = EXCLUDED.strengths_summary,
+    created_at = EXCLUDED.created_at
+"""
+
+# Warming keeps the listing's own timestamp so the entry expires with the same TTL.
+INSERT_LLM_VERDICT_IF_ABSENT_SQL = """
+INSERT INTO llm_verdicts (key, passed, thought_trace, strengths_summary, created_at)
+VALUES (%s, %s, %s, %s, %s)
+ON CONFLICT (key) DO NOTHING
+"""
+
+# Kept listings with the criteria of the watch that kept them (as the watch is configured now).
+SELECT_VERDICT_WARM_ROWS_SQL = """
+SELECT l.title, l.description, l.price, l.thought_trace, l.ai_strengths, l.created_at,
+       s.terms, s.target_price, s.context
+FROM listings l JOIN searches s ON s.id = l.search_id
+WHERE l.created_at >= NOW() - make_interval(days => %s) AND l.thought_trace IS NOT NULL
+"""
+
+FEED_CHANNEL_KEY = "feed_channel_id"
+CLEANUP_AUTO_KEY = "cleanup_auto"
+
+
+def row_to_config(row: dict) -> SearchConfig:
     """Convert a database row to SearchConfig."""
     raw = row["terms"]
     terms = tuple(json.loads(raw) if isinstance(raw, str) else raw)
     owner_id = row.get("owner_id")
     if owner_id is not None:
         owner_id = int(owner_id)
+    raw_exclude = row.get("exclude_terms") or []
+    exclude_terms = tuple(json.loads(raw_exclude) if isinstance(raw_exclude, str) else raw_exclude)
     return SearchConfig(
         id=row["id"],
         terms=terms,
@@ -142,471 +588,56 @@ def _row_to_config(row: dict) -> SearchConfig:
         radius=row["radius"],
         context=row["context"],
         owner_id=owner_id,
+        exclude_terms=exclude_terms,
+        max_price_ratio=row.get("max_price_ratio"),
     )
 
 
-class SearchStore:
-    """
-    PostgreSQL-backed store for SearchConfig objects.
-    Uses DB_URL environment variable for connection.
-    """
+def search_params(obj: SearchConfig) -> tuple:
+    """Parameters for UPSERT_SEARCH_SQL."""
+    return (
+        obj.id,
+        json.dumps(list(obj.terms)),
+        obj.channel,
+        obj.city_code,
+        obj.location_name,
+        obj.target_price,
+        obj.days_listed,
+        obj.radius,
+        obj.context,
+        obj.owner_id,
+        json.dumps(list(obj.exclude_terms)),
+        obj.max_price_ratio,
+    )
 
-    def __init__(self) -> None:
-        db_url = os.getenv("DB_URL")
-        if not db_url:
-            raise SystemExit("DB_URL environment variable is required.")
-        self._db_url = db_url
-        self._init_schema()
-
-    def _get_conn(self) -> psycopg.Connection:
-        """Get a new connection to the database."""
-        return psycopg.connect(self._db_url, row_factory=dict_row)
-
-    def _init_schema(self) -> None:
-        """Create the searches and bot_config tables if they do not exist."""
-        with self._get_conn() as conn:
-            conn.execute(CREATE_TABLE_SQL)
-            conn.execute(BOT_CONFIG_TABLE_SQL)
-            conn.execute(USER_LOCATIONS_TABLE_SQL)
-            conn.execute(LOCATION_CACHE_TABLE_SQL)
-            conn.execute(LISTING_CACHE_TABLE_SQL)
-            conn.execute(LISTING_METADATA_TABLE_SQL)
-            conn.execute(LISTINGS_TABLE_SQL)
-            conn.execute(LISTING_MESSAGES_TABLE_SQL)
-            conn.execute(BOT_OWNED_CHANNELS_TABLE_SQL)
-            conn.execute(BOT_OWNED_CATEGORIES_TABLE_SQL)
-            conn.execute("ALTER TABLE searches DROP COLUMN IF EXISTS city")
-            conn.execute("ALTER TABLE searches ADD COLUMN IF NOT EXISTS location_name TEXT")
-            conn.execute("ALTER TABLE searches ADD COLUMN IF NOT EXISTS owner_id BIGINT")
-            conn.execute("ALTER TABLE listings ADD COLUMN IF NOT EXISTS ai_strengths TEXT")
-            conn.commit()
-        logger.info("Database schema initialized.")
-
-    def add_object(self, obj: SearchConfig) -> None:
-        """Add a SearchConfig to the store."""
-        terms_json = json.dumps(list(obj.terms))
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO searches (
-                    id, terms, channel, city_code, location_name, target_price, days_listed, radius, context, owner_id
-                )
-                VALUES (%s, %s::jsonb, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (id) DO UPDATE SET
-                    terms = EXCLUDED.terms,
-                    channel = EXCLUDED.channel,
-                    city_code = EXCLUDED.city_code,
-                    location_name = EXCLUDED.location_name,
-                    target_price = EXCLUDED.target_price,
-                    days_listed = EXCLUDED.days_listed,
-                    radius = EXCLUDED.radius,
-                    context = EXCLUDED.context,
-                    owner_id = COALESCE(EXCLUDED.owner_id, searches.owner_id)
-                """,
-                (
-                    obj.id,
-                    terms_json,
-                    obj.channel,
-                    obj.city_code,
-                    obj.location_name,
-                    obj.target_price,
-                    obj.days_listed,
-                    obj.radius,
-                    obj.context,
-                    obj.owner_id,
-                ),
-            )
-            conn.commit()
-        logger.info(f"Search config '{obj.id}' saved to database.")
-
-    def remove_object(self, obj: SearchConfig) -> None:
-        """Remove a SearchConfig from the store by id."""
-        self.remove_by_id(obj.id)
-
-    def remove_by_id(self, search_id: str) -> bool:
-        """Remove a search from the store by id. Returns True if a row was deleted."""
-        with self._get_conn() as conn:
-            cur = conn.execute("DELETE FROM searches WHERE id = %s", (search_id,))
-            conn.commit()
-            if cur.rowcount == 0:
-                logger.warning(f"Search config '{search_id}' not found in store.")
-                return False
-            logger.info(f"Search config '{search_id}' removed from store.")
-            return True
-
-    def get_all_objects(self) -> set[SearchConfig]:
-        """Retrieve all SearchConfig objects from the store."""
-        with self._get_conn() as conn:
-            cur = conn.execute("SELECT * FROM searches")
-            rows = cur.fetchall()
-        return {_row_to_config(row) for row in rows}
-
-    def get_config_by_id(self, search_id: str) -> SearchConfig | None:
-        """Return SearchConfig for given id, or None."""
-        with self._get_conn() as conn:
-            cur = conn.execute("SELECT * FROM searches WHERE id = %s", (search_id,))
-            row = cur.fetchone()
-        return _row_to_config(row) if row else None
-
-    def record_listing_metadata(
-        self,
-        message_id: int,
-        channel_id: int,
-        search_id: str,
-        thought_trace: str | None = None,
-    ) -> None:
-        """Store or update listing metadata for a Discord message."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO listing_metadata (message_id, channel_id, search_id, thought_trace)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (message_id) DO UPDATE SET
-                    channel_id = EXCLUDED.channel_id,
-                    search_id = EXCLUDED.search_id,
-                    thought_trace = EXCLUDED.thought_trace
-                """,
-                (message_id, channel_id, search_id, thought_trace),
-            )
-            conn.commit()
-
-    def get_listing_metadata(
-        self, message_id: int
-    ) -> dict[str, str | None] | None:
-        """Return listing metadata for a message, or None if not found."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                "SELECT search_id, thought_trace FROM listing_metadata WHERE message_id = %s",
-                (message_id,),
-            )
-            row = cur.fetchone()
-        if not row:
+
+def channel_id_from_row(row: dict | None) -> int | None:
+    """Parse the feed channel id stored in bot_config."""
+    if row and row.get("value"):
+        try:
+            return int(row["value"])
+        except (ValueError, TypeError):
             return None
-        return {"search_id": row["search_id"], "thought_trace": row.get("thought_trace")}
-
-    def insert_listing(
-        self,
-        listing_id: str,
-        search_id: str,
-        title: str,
-        description: str,
-        price: float,
-        location: str,
-        date: str,
-        url: str,
-        img: str,
-        thought_trace: str | None,
-        ai_strengths: str | None,
-        watch_command: str,
-    ) -> None:
-        """Insert or upsert a listing into the listings table."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO listings (
-                    id, search_id, title, description, price, location,
-                    date, url, img, thought_trace, ai_strengths, watch_command
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (id) DO UPDATE SET
-                    search_id = EXCLUDED.search_id,
-                    title = EXCLUDED.title,
-                    description = EXCLUDED.description,
-                    price = EXCLUDED.price,
-                    location = EXCLUDED.location,
-                    date = EXCLUDED.date,
-                    url = EXCLUDED.url,
-                    img = EXCLUDED.img,
-                    thought_trace = EXCLUDED.thought_trace,
-                    ai_strengths = EXCLUDED.ai_strengths,
-                    watch_command = EXCLUDED.watch_command
-                """,
-                (
-                    listing_id,
-                    search_id,
-                    title,
-                    description,
-                    price,
-                    location,
-                    date,
-                    url,
-                    img,
-                    thought_trace,
-                    ai_strengths,
-                    watch_command,
-                ),
-            )
-            conn.commit()
-
-    def get_listing(self, listing_id: str) -> ListingRow | None:
-        """Return a listing by id, or None if not found."""
-        with self._get_conn() as conn:
-            cur = conn.execute("SELECT * FROM listings WHERE id = %s", (listing_id,))
-            row = cur.fetchone()
-        return dict(row) if row else None
-
-    def record_listing_message(
-        self,
-        message_id: int,
-        listing_id: str,
-        channel_id: int,
-    ) -> None:
-        """Store message_id -> listing_id mapping."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO listing_messages (message_id, listing_id, channel_id)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (message_id) DO UPDATE SET
-                    listing_id = EXCLUDED.listing_id,
-                    channel_id = EXCLUDED.channel_id
-                """,
-                (message_id, listing_id, channel_id),
-            )
-            conn.commit()
-
-    def get_listing_by_message_id(
-        self, message_id: int
-    ) -> ListingRow | None:
-        """Return listing for a Discord message, or None if not found."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                """
-                SELECT l.* FROM listings l
-                JOIN listing_messages lm ON lm.listing_id = l.id
-                WHERE lm.message_id = %s
-                """,
-                (message_id,),
-            )
-            row = cur.fetchone()
-        return dict(row) if row else None
-
-    def clear_store(self) -> None:
-        """Clear all SearchConfig objects from the store."""
-        with self._get_conn() as conn:
-            conn.execute("TRUNCATE TABLE searches")
-            conn.commit()
-        logger.info("Store cleared.")
-
-    def get_feed_channel_id(self) -> int | None:
-        """Get the feed channel ID from bot_config, or None if not set."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                "SELECT value FROM bot_config WHERE key = %s",
-                ("feed_channel_id",),
-            )
-            row = cur.fetchone()
-        if row and row.get("value"):
-            try:
-                return int(row["value"])
-            except (ValueError, TypeError):
-                return None
+    return None
+
+
+def flag_from_row(row: dict | None) -> bool:
+    return row is not None and str(row.get("value", "")).lower() == "true"
+
+
+def metadata_from_row(row: dict | None) -> dict[str, str | None] | None:
+    if not row:
         return None
+    return {"search_id": row["search_id"], "thought_trace": row.get("thought_trace")}
+
+
+def user_location_from_row(row: dict | None) -> UserLocation | None:
+    if not row:
+        return None
+    return UserLocation(user_id=int(row["user_id"]), city_code=row["city_code"])
+
+
+def unique_ids(listing_ids: list[str]) -> list[str]:
+    """Strip ids and drop blanks and duplicates, keeping order."""
+    return list(dict.fromkeys(i.strip() for i in listing_ids if i and i.strip()))
 
-    def set_feed_channel_id(self, channel_id: int | None) -> None:
-        """Set or clear the feed channel ID in bot_config."""
-        with self._get_conn() as conn:
-            if channel_id is None:
-                conn.execute(
-                    "DELETE FROM bot_config WHERE key = %s",
-                    ("feed_channel_id",),
-                )
-            else:
-                conn.execute(
-                    """
-                    INSERT INTO bot_config (key, value)
-                    VALUES (%s, %s)
-                    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
-                    """,
-                    ("feed_channel_id", str(channel_id)),
-                )
-            conn.commit()
-
-    def get_cleanup_auto(self) -> bool:
-        """Return whether auto-cleanup is enabled (delete bot-owned channels when watches removed)."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                "SELECT value FROM bot_config WHERE key = %s",
-                ("cleanup_auto",),
-            )
-            row = cur.fetchone()
-        return row is not None and str(row.get("value", "")).lower() == "true"
-
-    def set_cleanup_auto(self, enabled: bool) -> None:
-        """Enable or disable auto-cleanup."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO bot_config (key, value)
-                VALUES (%s, %s)
-                ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
-                """,
-                ("cleanup_auto", "true" if enabled else "false"),
-            )
-            conn.commit()
-
-    def record_bot_owned_channel(self, channel_id: int) -> None:
-        """Record a channel as bot-owned (created by the bot)."""
-        with self._get_conn() as conn:
-            conn.execute(
-                "INSERT INTO bot_owned_channels (channel_id) VALUES (%s) ON CONFLICT (channel_id) DO NOTHING",
-                (channel_id,),
-            )
-            conn.commit()
-
-    def record_bot_owned_category(self, category_id: int) -> None:
-        """Record a category as bot-owned (created by the bot)."""
-        with self._get_conn() as conn:
-            conn.execute(
-                "INSERT INTO bot_owned_categories (category_id) VALUES (%s) ON CONFLICT (category_id) DO NOTHING",
-                (category_id,),
-            )
-            conn.commit()
-
-    def get_bot_owned_channels(self) -> set[int]:
-        """Return all channel IDs that the bot created."""
-        with self._get_conn() as conn:
-            cur = conn.execute("SELECT channel_id FROM bot_owned_channels")
-            rows = cur.fetchall()
-        return {row["channel_id"] for row in rows}
-
-    def get_bot_owned_categories(self) -> set[int]:
-        """Return all category IDs that the bot created."""
-        with self._get_conn() as conn:
-            cur = conn.execute("SELECT category_id FROM bot_owned_categories")
-            rows = cur.fetchall()
-        return {row["category_id"] for row in rows}
-
-    def remove_bot_owned_channel(self, channel_id: int) -> None:
-        """Remove a channel from bot-owned tracking (e.g. after deletion)."""
-        with self._get_conn() as conn:
-            conn.execute("DELETE FROM bot_owned_channels WHERE channel_id = %s", (channel_id,))
-            conn.commit()
-
-    def remove_bot_owned_category(self, category_id: int) -> None:
-        """Remove a category from bot-owned tracking (e.g. after deletion)."""
-        with self._get_conn() as conn:
-            conn.execute("DELETE FROM bot_owned_categories WHERE category_id = %s", (category_id,))
-            conn.commit()
-
-    def get_channels_with_active_watches(self) -> set[int]:
-        """Return channel IDs that have at least one active watch (SearchConfig)."""
-        with self._get_conn() as conn:
-            cur = conn.execute("SELECT DISTINCT channel FROM searches")
-            rows = cur.fetchall()
-        return {row["channel"] for row in rows}
-
-    def get_user_location(self, user_id: int) -> UserLocation | None:
-        """Get marketplace location settings for a user."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                "SELECT user_id, city_code FROM user_locations WHERE user_id = %s",
-                (user_id,),
-            )
-            row = cur.fetchone()
-        if not row:
-            return None
-        return UserLocation(user_id=int(row["user_id"]), city_code=row["city_code"])
-
-    def set_user_location(self, user_id: int, city_code: str) -> None:
-        """Set or update a user's marketplace location settings."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO user_locations (user_id, city_code)
-                VALUES (%s, %s)
-                ON CONFLICT (user_id) DO UPDATE SET
-                    city_code = EXCLUDED.city_code,
-                    updated_at = NOW()
-                """,
-                (user_id, city_code),
-            )
-            conn.commit()
-
-    def remove_user_location(self, user_id: int) -> bool:
-        """Remove marketplace location settings for a user."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                "DELETE FROM user_locations WHERE user_id = %s",
-                (user_id,),
-            )
-            conn.commit()
-        return cur.rowcount > 0
-
-    def get_location_name(self, city_code: str) -> str | None:
-        """Get cached human-readable location name for a city code."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                "SELECT location_name FROM location_cache WHERE city_code = %s",
-                (city_code,),
-            )
-            row = cur.fetchone()
-        if not row:
-            return None
-        return row.get("location_name")
-
-    def set_location_name(self, city_code: str, location_name: str) -> None:
-        """Cache human-readable location name for a city code."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO location_cache (city_code, location_name)
-                VALUES (%s, %s)
-                ON CONFLICT (city_code) DO UPDATE SET
-                    location_name = EXCLUDED.location_name
-                """,
-                (city_code, location_name),
-            )
-            conn.commit()
-
-    def clear_location_cache(self) -> int:
-        """Clear all cached location names. Returns number of rows deleted."""
-        with self._get_conn() as conn:
-            cur = conn.execute("DELETE FROM location_cache")
-            conn.commit()
-        return cur.rowcount
-
-    def listing_cache_contains(self, engine: str, listing_id: str) -> bool:
-        """Check if a listing is in the cache for the given engine."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                "SELECT 1 FROM listing_cache WHERE engine = %s AND listing_id = %s",
-                (engine, listing_id.strip()),
-            )
-            return cur.fetchone() is not None
-
-    def listing_cache_add(self, engine: str, listing_id: str) -> None:
-        """Add a listing to the cache, refreshing created_at if already present."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO listing_cache (engine, listing_id, created_at)
-                VALUES (%s, %s, NOW())
-                ON CONFLICT (engine, listing_id) DO UPDATE SET created_at = NOW()
-                """,
-                (engine, listing_id.strip()),
-            )
-            conn.commit()
-
-    def listing_cache_clear(self, engine: str) -> int:
-        """Clear all listings from the cache for the given engine."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                "DELETE FROM listing_cache WHERE engine = %s",
-                (engine,),
-            )
-            conn.commit()
-        return cur.rowcount
-
-    def listing_cache_flush_older_than_days(self, engine: str, days: int = 2) -> int:
-        """Remove cache entries older than the given number of days."""
-        with self._get_conn() as conn:
-            cur = conn.execute(
-                """
-                DELETE FROM listing_cache
-                WHERE engine = %s AND created_at < NOW() - make_interval(days => %s)
-                """,
-                (engine, days),
-            )
-            conn.commit()
-        return cur.rowcount
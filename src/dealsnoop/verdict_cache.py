@@ -0,0 +1,135 @@
+"""Persistent cache of LLM quality verdicts, keyed on listing content and watch criteria."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from dealsnoop.logger import logger
+
+if TYPE_CHECKING:
+    from dealsnoop.async_store import AsyncSearchStore
+
+
+def verdict_key(
+    title: str,
+    description: str,
+    price: float,
+    terms: tuple[str, ...] | list[str],
+    target_price: str | None,
+    context: str | None,
+    model: str,
+    prompt_version: int,
+) -> str:
+    """SHA-256 over everything the verdict depends on.
+
+    Price is rounded to cents (listings.price is a REAL) and empty criteria count as missing,
+    so a listing read back from the database hashes like the card it came from.
+    """
+    payload = [
+        title.strip(),
+        (description or "").strip(),
+        f"{float(price):.2f}",
+        list(terms),
+        target_price or None,
+        context or None,
+        model,
+        prompt_version,
+    ]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class Verdict:
+    passed: bool
+    thought_trace: str
+    strengths_summary: str
+
+
+@dataclass
+class VerdictCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"hits={self.hits} misses={self.misses} stored={self.stores} hit_rate={rate:.0%}"
+
+
+class VerdictCache:
+    """Verdicts in llm_verdicts, valid for ttl_days; optionally seeded from kept listings."""
+
+    def __init__(
+        self,
+        store: AsyncSearchStore,
+        ttl_days: int,
+        model: str,
+        prompt_version: int,
+        warm: bool = False,
+    ) -> None:
+        self._store = store
+        self.ttl_days = ttl_days
+        self.model = model
+        self.prompt_version = prompt_version
+        self._warm = warm
+        self._warm_lock = asyncio.Lock()
+        self.stats = VerdictCacheStats()
+
+    def key(
+        self,
+        title: str,
+        description: str,
+        price: float,
+        terms: tuple[str, ...],
+        target_price: str | None,
+        context: str | None,
+    ) -> str:
+        return verdict_key(
+            title, description, price, terms, target_price, context, self.model, self.prompt_version
+        )
+
+    async def get(self, key: str) -> Verdict | None:
+        await self._warm_once()
+        row = await self._store.get_llm_verdict(key, self.ttl_days)
+        if row is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return Verdict(row["passed"], row["thought_trace"], row["strengths_summary"])
+
+    async def put(self, key: str, verdict: Verdict) -> None:
+        await self._store.put_llm_verdict(key, verdict.passed, verdict.thought_trace, verdict.strengths_summary)
+        self.stats.stores += 1
+
+    async def _warm_once(self) -> None:
+        if not self._warm:
+            return
+        async with self._warm_lock:
+            if not self._warm:
+                return
+            self._warm = False
+            await self.warm_from_listings()
+
+    async def warm_from_listings(self) -> int:
+        """Seed verdicts from kept listings (listings.thought_trace / ai_strengths).
+
+        Listings are only stored when they passed, and are assumed to have been evaluated by
+        the current model and prompt version against their watch's current criteria.
+        """
+        rows = await self._store.get_verdict_warm_rows(self.ttl_days)
+        verdicts = []
+        for row in rows:
+            raw = row["terms"]
+            terms = tuple(json.loads(raw) if isinstance(raw, str) else raw)
+            key = self.key(
+                row["title"], row["description"], row["price"], terms, row["target_price"], row["context"]
+            )
+            verdicts.append((key, True, row["thought_trace"], row["ai_strengths"] or "", row["created_at"]))
+        await self._store.add_llm_verdicts(verdicts)
+        logger.info(f"Verdict cache warmed from {len(verdicts)} kept listing(s)")
+        return len(verdicts)